@@ -0,0 +1,167 @@
+import numbers
+import threading
+from backends import Error
+from config import AppConfig
+from database import TrafficViolationRepository
+from cache import ResultCache
+
+
+BLANK = "(blank)"
+
+
+class AggregateTable:
+    # A finished result ready for display: headers plus rows of plain values
+    
+    def __init__(self, headers, rows, source):
+        self.headers = tuple(headers)
+        self.rows = rows
+        self.source = source  # "rollup", "sql" or "pandas", shown in the dashboard
+    
+    def __len__(self):
+        return len(self.rows)
+
+
+class AnalyticsService:
+    # Group-by statistics over the violations table. Plain group-bys are pushed down to
+    # MySQL (or read from the rollup table when it covers them); cross-tabs use a columnar pandas snapshot when pandas is installed and are
+    # otherwise pivoted from a two-column GROUP BY. Results are cached for
+    # analytics_cache_ttl seconds since they are read far more often than they change.
+    _cache = None
+    _cache_lock = threading.Lock()
+    
+    METRICS = ("count", "total_penalty", "average_penalty")
+    
+    def __init__(self, repository=None):
+        self.config = AppConfig()
+        self.repository = repository or TrafficViolationRepository()
+        with AnalyticsService._cache_lock:
+            if AnalyticsService._cache is None:
+                AnalyticsService._cache = ResultCache(self.config.analytics_cache_entries,
+                                                      self.config.analytics_cache_ttl)
+        self.cache = AnalyticsService._cache
+    
+    def summarize(self, group_by, filters=None, refresh=False):
+        group_by = tuple(group_by)
+        self._check_dimensions(group_by)
+        key = ("summary", group_by, self._filters_key(filters))
+        if refresh:
+            self.cache.invalidate(keys=[key])
+        return self.cache.get_or_load(key, lambda: self._summarize(group_by, filters),
+                                      cache_if=lambda result: result is not None)
+    
+    def crosstab(self, row_label, column_label, metric="count", refresh=False):
+        self._check_dimensions((row_label, column_label))
+        if metric not in self.METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        key = ("crosstab", row_label, column_label, metric)
+        if refresh:
+            self.cache.invalidate(keys=[key, ("snapshot",)])
+        return self.cache.get_or_load(key, lambda: self._crosstab(row_label, column_label, metric),
+                                      cache_if=lambda result: result is not None)
+    
+    def _summarize(self, group_by, filters):
+        aggregated, source = self._aggregate(group_by, filters)
+        rows = []
+        for row in aggregated:
+            keys, (count, total, average) = row[:-3], row[-3:]
+            rows.append(tuple(BLANK if key is None else key for key in keys)
+                        + (int(count), self._round(total), self._round(average)))
+        headers = group_by + ("Count", "Total Penalty", "Average Penalty")
+        return AggregateTable(headers, rows, source)
+    
+    def _aggregate(self, group_by, filters=None):
+        # Unfiltered group-bys over the rollup's dimensions read the rollup table; a database
+        # without migration 005 falls back to grouping the violations themselves
+        if (self.config.analytics_use_rollups and not filters
+                and set(group_by) <= set(self.repository.ROLLUP_DIMENSIONS)):
+            try:
+                return self.repository.rollup_aggregate(group_by), "rollup"
+            except Error as e:
+                if e.errno != 1146:
+                    raise
+        return self.repository.aggregate(group_by, filters), "sql"
+    
+    def _crosstab(self, row_label, column_label, metric):
+        try:
+            import pandas as pd
+        except ImportError:
+            return self._crosstab_sql(row_label, column_label, metric)
+        if {row_label, column_label} <= set(self.repository.ROLLUP_DIMENSIONS):
+            # Already pre-aggregated; no need for a snapshot
+            return self._crosstab_sql(row_label, column_label, metric)
+        
+        frame = self.cache.get_or_load(("snapshot",), self._load_snapshot,
+                                       cache_if=lambda result: result is not None)
+        aggfunc = {"count": "count", "total_penalty": "sum", "average_penalty": "mean"}[metric]
+        if metric == "count":
+            table = pd.crosstab(frame[row_label], frame[column_label], margins=True,
+                                margins_name="Total")
+        else:
+            table = pd.crosstab(frame[row_label], frame[column_label], values=frame["Penalty Amount"],
+                                aggfunc=aggfunc, margins=True, margins_name="Total").fillna(0)
+        headers = (row_label,) + tuple(str(column) for column in table.columns)
+        rows = [(str(index),) + tuple(self._round(value) for value in values)
+                for index, values in zip(table.index, table.itertuples(index=False))]
+        return AggregateTable(headers, rows, "pandas")
+    
+    def _load_snapshot(self):
+        # Only the dimension columns and the penalty are read, one list per column, then
+        # turned into categoricals so group-bys work on small integer codes
+        import pandas as pd
+        labels = self.config.analytics_dimensions + ("Penalty Amount",)
+        columns = {label: [] for label in labels}
+        for rows in self.repository.iter_rows(batch_size=self.config.export_batch_size,
+                                              columns=labels):
+            for label, values in zip(labels, zip(*(row[1:] for row in rows))):
+                columns[label].extend(values)
+        
+        frame = pd.DataFrame(columns)
+        for label in self.config.analytics_dimensions:
+            frame[label] = frame[label].map(lambda value: BLANK if value is None else str(value))
+            frame[label] = frame[label].astype("category")
+        frame["Penalty Amount"] = pd.to_numeric(frame["Penalty Amount"], errors="coerce")
+        return frame
+    
+    def _crosstab_sql(self, row_label, column_label, metric):
+        # Pivot of a two-column GROUP BY, with the same Total row and column as pandas gives
+        aggregated, source = self._aggregate((row_label, column_label))
+        cells, row_keys, column_keys = {}, set(), set()
+        for row in aggregated:
+            row_key, column_key = (BLANK if key is None else str(key) for key in row[:2])
+            cells[row_key, column_key] = (int(row[2]), float(row[3] or 0))
+            row_keys.add(row_key)
+            column_keys.add(column_key)
+        row_keys, column_keys = sorted(row_keys), sorted(column_keys)
+        
+        def cell(scope_rows, scope_columns):
+            parts = [cells[row_key, column_key] for row_key in scope_rows
+                     for column_key in scope_columns if (row_key, column_key) in cells]
+            count, penalty = sum(part[0] for part in parts), sum(part[1] for part in parts)
+            if metric == "count":
+                return count
+            if metric == "total_penalty":
+                return self._round(penalty)
+            return self._round(penalty / count) if count else 0
+        
+        rows = []
+        for row_key in row_keys + ["Total"]:
+            scope = row_keys if row_key == "Total" else [row_key]
+            rows.append((row_key,) + tuple(cell(scope, [column_key]) for column_key in column_keys)
+                        + (cell(scope, column_keys),))
+        headers = (row_label,) + tuple(column_keys) + ("Total",)
+        return AggregateTable(headers, rows, source)
+    
+    def _check_dimensions(self, labels):
+        for label in labels:
+            if label not in self.config.analytics_dimensions:
+                raise ValueError(f"Statistics can't be grouped by {label}")
+    
+    def _filters_key(self, filters):
+        return tuple(sorted(filters.items())) if filters else None
+    
+    def _round(self, value):
+        if value is None:
+            return 0
+        if isinstance(value, numbers.Integral):
+            return int(value)
+        return round(float(value), 2)
@@ -0,0 +1,156 @@
+import re
+import sqlite3
+from contextlib import contextmanager
+from functools import lru_cache
+
+class Error(Exception):
+    # Database errors from every backend, with the MySQL errno the rest of the code checks
+    # for. Each backend translates its driver's exceptions into this in translate_errors().
+    
+    def __init__(self, msg=None, errno=None, values=None, sqlstate=None):
+        super().__init__(msg)
+        self.msg = msg
+        self.errno = errno
+        self.sqlstate = sqlstate
+
+
+class MySQLBackend:
+    # The reference dialect: repository SQL is written for MySQL and passes through unchanged
+    name = "mysql"
+    supports_fulltext = True
+    supports_load_data = True
+    explain_prefix = "EXPLAIN "
+    seconds_ago = "NOW(6) - INTERVAL %s SECOND"   # a timestamp n seconds back, n as a parameter
+    
+    def __init__(self, config):
+        self.config = config
+        self._driver = None
+    
+    def connect(self):
+        driver = self._load_driver()
+        with self.translate_errors():
+            return driver.connect(
+                host=self.config.db_host,
+                user=self.config.db_user,
+                password=self.config.db_password,
+                database=self.config.db_name,
+                allow_local_infile=self.config.db_allow_local_infile
+            )
+    
+    def begin(self, connection):
+        # autocommit is off, so the first statement opens the transaction
+        pass
+    
+    def ping(self, connection):
+        with self.translate_errors():
+            connection.ping(reconnect=False)
+    
+    def prepare(self, query):
+        return query
+    
+    @contextmanager
+    def translate_errors(self):
+        try:
+            yield
+        except Exception as e:
+            if self._driver is None or not isinstance(e, self._driver.Error):
+                raise
+            raise Error(msg=str(e), errno=e.errno, sqlstate=getattr(e, "sqlstate", None)) from e
+    
+    def _load_driver(self):
+        # mysql.connector is a large package, so it is imported on the first connect rather
+        # than when the app starts (SQLite installs never import it at all)
+        if self._driver is None:
+            try:
+                import mysql.connector
+            except ImportError:
+                raise Error("The MySQL backend needs mysql-connector-python "
+                            "(pip install mysql-connector-python)")
+            self._driver = mysql.connector
+        return self._driver
+
+
+class SQLiteBackend:
+    # Embedded database in one file, for offline laptops, tests and benchmarks. WAL lets
+    # readers run alongside the single writer. sqlite3 keeps compiled statements in a
+    # per-connection cache keyed by SQL text, so repeated queries are prepared once.
+    name = "sqlite"
+    supports_fulltext = False
+    supports_load_data = False
+    explain_prefix = "EXPLAIN QUERY PLAN "
+    seconds_ago = "datetime('now', '-' || %s || ' seconds')"
+    
+    # sqlite3 messages mapped to the MySQL errno the rest of the code checks for
+    ERROR_CODES = (
+        (re.compile(r"no such table"), 1146),
+        (re.compile(r"no such column|has no column named"), 1054),
+        (re.compile(r"duplicate column name"), 1060),
+        (re.compile(r"index \S+ already exists"), 1061),
+        (re.compile(r"trigger \S+ already exists"), 1359),
+        (re.compile(r"table \S+ already exists"), 1050),
+        (re.compile(r"UNIQUE constraint failed"), 1062),
+        (re.compile(r"NOT NULL constraint failed"), 1048),
+        (re.compile(r"database is locked"), 1205),
+    )
+    
+    def __init__(self, config):
+        self.config = config
+    
+    def connect(self):
+        with self.translate_errors():
+            # The pool hands a connection to one thread at a time, never to two at once
+            connection = sqlite3.connect(self.config.db_sqlite_path,
+                                         timeout=self.config.db_sqlite_busy_timeout,
+                                         isolation_level=None, check_same_thread=False,
+                                         cached_statements=self.config.db_sqlite_statement_cache)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+        return connection
+    
+    def begin(self, connection):
+        # One explicit transaction per DatabaseConnection block, reads included, to match
+        # MySQL's behaviour; the connection itself is in autocommit mode
+        with self.translate_errors():
+            connection.execute("BEGIN")
+    
+    def ping(self, connection):
+        with self.translate_errors():
+            connection.execute("SELECT 1")
+    
+    def prepare(self, query):
+        return _sqlite_query(query)
+    
+    @contextmanager
+    def translate_errors(self):
+        try:
+            yield
+        except sqlite3.Error as e:
+            raise Error(msg=str(e), errno=self._errno(str(e))) from e
+    
+    def _errno(self, message):
+        for pattern, errno in self.ERROR_CODES:
+            if pattern.search(message):
+                return errno
+        return None
+
+
+@lru_cache(maxsize=512)
+def _sqlite_query(query):
+    # %s placeholders become ?; row locks are dropped since SQLite locks the whole
+    # database for the writing transaction anyway
+    return query.replace("%s", "?").replace(" FOR UPDATE", "")
+
+
+BACKENDS = {
+    "mysql": MySQLBackend,
+    "sqlite": SQLiteBackend,
+}
+
+
+def create_backend(config):
+    try:
+        return BACKENDS[config.db_backend](config)
+    except KeyError:
+        raise ValueError(f"Unknown database backend: {config.db_backend} "
+                         f"(expected one of {', '.join(BACKENDS)})")
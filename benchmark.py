@@ -0,0 +1,280 @@
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from config import AppConfig
+from models import EDITABLE_FIELDS
+
+
+STATES = ("MD", "VA", "DC", "PA", "DE", "WV", "NY", "NJ", "FL", "TX")
+MAKES = ("FORD", "TOYOTA", "HONDA", "CHEVROLET", "NISSAN", "DODGE", "BMW", "JEEP")
+MODELS = ("F150", "CAMRY", "CIVIC", "SILVERADO", "ALTIMA", "RAM", "X5", "WRANGLER")
+COLORS = ("BLACK", "WHITE", "SILVER", "RED", "BLUE", "GRAY", "GREEN")
+FIRST_NAMES = ("James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda",
+               "David", "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica")
+LAST_NAMES = ("Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+              "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson")
+CHARGES = ("21-801(a)", "21-801.1", "13-401(b)", "22-412.3(b)", "21-202(h)", "16-303(c)")
+YES_NO = ("Yes", "No")
+
+# Values per column label; anything not listed gets a short generated string
+CHOICES = {
+    "Belts": YES_NO, "Personal Injury": YES_NO, "Property Damage": YES_NO,
+    "Commercial License": YES_NO, "Commercial Vehicle": YES_NO,
+    "Contributed To Accident": YES_NO,
+    "State": STATES, "Driver State": STATES, "DL State": STATES,
+    "Vehicle Type": ("02 - Automobile", "05 - Light Duty Truck", "01 - Motorcycle"),
+    "Make": MAKES, "Model": MODELS, "Color": COLORS, "Charge": CHARGES,
+    "Race": ("WHITE", "BLACK", "ASIAN", "HISPANIC", "OTHER"),
+    "Gender": ("M", "F", "U"),
+    "Driver City": ("SILVER SPRING", "ROCKVILLE", "GAITHERSBURG", "BETHESDA", "GERMANTOWN"),
+    "Arrest Type": ("A - Marked Patrol", "B - Unmarked Patrol", "Q - Marked Laser"),
+    "Violation Type": ("Citation", "Warning", "ESERO", "SERO"),
+}
+
+
+def generate_rows(count, seed=0):
+    # Deterministic rows in INSERT_COLUMNS order (AppConfig.columns[1:]), so every run and
+    # every machine benchmarks the same data
+    rng = random.Random(seed)
+    for _ in range(count):
+        row = []
+        for field in EDITABLE_FIELDS:
+            if field.label == "Plate Number":
+                row.append(f"{rng.choice('ABCDEFGHJKLMNPRSTVWXYZ')}{rng.choice('ABCDEFGHJKLMNPRSTVWXYZ')}"
+                           f"{rng.randrange(10000):04d}")
+            elif field.label == "Driver Name":
+                row.append(f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}")
+            elif field.label == "Description":
+                row.append(f"DRIVING VEHICLE ON HIGHWAY WITH {rng.choice(('EXPIRED', 'SUSPENDED', 'NO'))} "
+                           f"REGISTRATION #{rng.randrange(100000)}")
+            elif field.kind is int:
+                row.append(rng.randrange(1990, 2025))
+            elif field.kind is float:
+                row.append(float(rng.choice((35, 70, 90, 140, 160, 280, 290, 500))))
+            elif field.label in CHOICES:
+                row.append(rng.choice(CHOICES[field.label]))
+            else:
+                row.append(f"{field.attribute.upper()}-{rng.randrange(100)}")
+        yield tuple(row)
+
+
+def start_virtual_display():
+    # Tk needs an X display; on a headless machine run one under Xvfb if it is installed.
+    # Returns the Xvfb process (or None) so the caller can stop it.
+    if os.environ.get("DISPLAY") or sys.platform in ("win32", "darwin"):
+        return None
+    xvfb = shutil.which("Xvfb")
+    if not xvfb:
+        return None
+    display = f":{100 + os.getpid() % 800}"
+    process = subprocess.Popen([xvfb, display, "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(1)
+    if process.poll() is not None:
+        return None
+    os.environ["DISPLAY"] = display
+    return process
+
+
+class ViolationBenchmark:
+    # Times repository operations and Treeview population over synthetic datasets of each
+    # size. Every operation runs `repeat` times untraced for timings, then once more under
+    # tracemalloc for its peak Python heap (tracing slows code down, so it is kept apart).
+    
+    SIZES = (10_000, 100_000, 1_000_000)
+    
+    def __init__(self, sizes=None, repeat=3, write_count=200, tk_rows=100_000, seed=0,
+                 workdir=None, progress=None):
+        self.config = AppConfig()
+        self.sizes = sizes or self.SIZES
+        self.repeat = repeat
+        self.write_count = write_count
+        self.tk_rows = tk_rows
+        self.seed = seed
+        self.workdir = workdir
+        self.progress = progress or (lambda message: None)
+        self.results = []
+        self.notes = []
+    
+    def run(self):
+        # Always the embedded backend: benchmarks create and delete their own databases
+        self.config.db_backend = "sqlite"
+        self.config.cache_enabled = False
+        xvfb = start_virtual_display()
+        root = self._start_tk()
+        workdir = self.workdir or tempfile.mkdtemp(prefix="tv-benchmark-")
+        try:
+            for size in self.sizes:
+                self._run_size(size, os.path.join(workdir, f"violations-{size}.db"), root)
+        finally:
+            if root is not None:
+                root.destroy()
+            if xvfb is not None:
+                xvfb.terminate()
+            if not self.workdir:
+                shutil.rmtree(workdir, ignore_errors=True)
+        return self.report()
+    
+    def report(self):
+        return {
+            "meta": {
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "backend": self.config.db_backend,
+                "repeat": self.repeat,
+                "write_count": self.write_count,
+                "seed": self.seed,
+                "notes": self.notes,
+            },
+            "results": self.results,
+        }
+    
+    def _run_size(self, size, path, root):
+        from database import ConnectionPool, TrafficViolationRepository
+        from schema import SchemaMigrator
+        
+        ConnectionPool().close_all()
+        self.config.db_sqlite_path = path
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+        SchemaMigrator().migrate()
+        repository = TrafficViolationRepository()
+        
+        self.progress(f"{size} rows: generating")
+        started = time.perf_counter()
+        batch = []
+        for row in generate_rows(size, self.seed):
+            batch.append(row)
+            if len(batch) >= self.config.import_batch_size:
+                repository.bulk_insert(batch)
+                batch = []
+        if batch:
+            repository.bulk_insert(batch)
+        self._record(size, "populate", [time.perf_counter() - started], None, size)
+        
+        rng = random.Random(self.seed + 1)
+        sample = next(generate_rows(1, self.seed))
+        grid_columns = self.config.grid_columns
+        records = {}
+        
+        def get_all_grid():
+            records["grid"] = repository.get_all(grid_columns)
+        
+        self._measure(size, "get_all", lambda: repository.get_all(), size)
+        self._measure(size, "get_all_grid_columns", get_all_grid, size)
+        self._measure(size, "get_page", lambda: repository.get_page(columns=grid_columns),
+                      self.config.page_size)
+        self._measure(size, "search_plate", lambda: repository.search(sample[0][:3], grid_columns), 1)
+        self._measure(size, "search_driver", lambda: repository.search(sample[1].split()[-1], grid_columns), 1)
+        
+        # Every run writes rows that aren't stored yet, since the content hash index
+        # (migration 006) rejects a record identical to an existing one
+        runs = self.repeat + 1
+        create_batches = iter([list(generate_rows(self.write_count, self.seed + size + run))
+                               for run in range(runs)])
+        self._measure(size, "create", lambda: [repository.create(row) for row in next(create_batches)],
+                      self.write_count)
+        ids = [rng.randrange(1, size + 1) for _ in range(self.write_count)]
+        update_batches = iter([list(generate_rows(self.write_count, self.seed + size + runs + run))
+                               for run in range(runs)])
+        self._measure(size, "update", lambda: [repository.update(record_id, row)
+                                               for record_id, row in zip(ids, next(update_batches))],
+                      self.write_count)
+        
+        if root is not None:
+            self._measure_table(size, root, records["grid"][:self.tk_rows])
+    
+    def _measure_table(self, size, root, records):
+        import tkinter as tk
+        from ui_management import TableFrame
+        
+        def load():
+            # A fresh, empty table each run, as on first load
+            parent = tk.Frame(root)
+            table = TableFrame(parent)
+            table.create()
+            table.load_data(records)
+            root.update_idletasks()
+            parent.destroy()
+        
+        self._measure(size, "table_load_data", load, len(records))
+    
+    def _measure(self, size, operation, func, items):
+        self.progress(f"{size} rows: {operation}")
+        runs = []
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            func()
+            runs.append(time.perf_counter() - started)
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self._record(size, operation, runs, peak, items)
+    
+    def _record(self, size, operation, runs, peak, items):
+        median = statistics.median(runs)
+        self.results.append({
+            "size": size,
+            "operation": operation,
+            "seconds": median,
+            "min_seconds": min(runs),
+            "runs": runs,
+            "items": items,
+            "seconds_per_item": median / items if items else None,
+            "peak_bytes": peak,
+        })
+    
+    def _start_tk(self):
+        try:
+            import tkinter as tk
+            root = tk.Tk()
+            root.withdraw()
+            return root
+        except Exception as e:
+            self.notes.append(f"Treeview benchmarks skipped: {e}")
+            return None
+
+
+# Differences smaller than this are timer and allocator noise, whatever the ratio
+NOISE_FLOOR = {"seconds": 0.005, "peak_bytes": 1 << 20}
+
+
+def compare(results, baseline, tolerance=0.2):
+    # Operations more than `tolerance` slower (median seconds) or heavier (peak bytes) than
+    # the baseline run. Returns (size, operation, metric, baseline value, current value).
+    previous = {(entry["size"], entry["operation"]): entry for entry in baseline["results"]}
+    regressions = []
+    for entry in results["results"]:
+        before = previous.get((entry["size"], entry["operation"]))
+        if before is None:
+            continue
+        for metric, floor in NOISE_FLOOR.items():
+            old, new = before.get(metric), entry.get(metric)
+            if old is None or new is None:
+                continue
+            if new > old * (1 + tolerance) and new - old > floor:
+                regressions.append((entry["size"], entry["operation"], metric, old, new))
+    return regressions
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as source:
+        return json.load(source)
+
+
+def save_results(results, path):
+    with open(path, "w", encoding="utf-8") as target:
+        json.dump(results, target, indent=2)
@@ -0,0 +1,65 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResultCache:
+    # LRU cache with a per-entry TTL. Keys are tuples whose first item names the kind of
+    # result ("all", "search", ...), so writes can drop just the kinds they affect.
+    
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0}
+    
+    def get_or_load(self, key, loader, cache_if=bool):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return value
+                del self._entries[key]
+                self._stats['expirations'] += 1
+            self._stats['misses'] += 1
+            generation = self._generation
+        
+        value = loader()
+        
+        with self._lock:
+            # An invalidation while we were loading means the value may predate that write
+            if cache_if(value) and generation == self._generation:
+                self._entries[key] = (time.monotonic() + self.ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._stats['evictions'] += 1
+        return value
+    
+    def invalidate(self, kinds=None, keys=()):
+        with self._lock:
+            self._generation += 1
+            if kinds is None:
+                stale = list(self._entries)
+            else:
+                stale = [key for key in self._entries if key[0] in kinds]
+            stale.extend(key for key in keys if key in self._entries and key not in stale)
+            for key in stale:
+                del self._entries[key]
+            self._stats['invalidations'] += len(stale)
+    
+    def clear(self):
+        self.invalidate()
+    
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
@@ -0,0 +1,209 @@
+import argparse
+import sys
+
+
+def cmd_migrate(args):
+    from schema import SchemaMigrator
+    migrator = SchemaMigrator()
+    if args.list:
+        pending = migrator.pending_migrations()
+        for name in pending:
+            print(f"pending  {name}")
+        if not pending:
+            print("Schema is up to date")
+        return 0
+    
+    applied = migrator.migrate()
+    for name in applied:
+        print(f"applied  {name}")
+    if not applied:
+        print("Schema is up to date")
+    return 0
+
+
+def cmd_import(args):
+    from importer import BulkImporter
+    
+    def show_progress(report):
+        print(f"\r{report.summary()}", end="", file=sys.stderr, flush=True)
+    
+    importer = BulkImporter(batch_size=args.batch_size, use_load_data=args.load_data,
+                            progress_callback=show_progress)
+    report = importer.import_file(args.path, error_path=args.errors, file_format=args.format)
+    print(file=sys.stderr)
+    print(report.summary())
+    if report.error_path:
+        print(f"Rejected rows written to {report.error_path}")
+    return 1 if report.rejected else 0
+
+
+def cmd_export(args):
+    from exporter import ViolationExporter
+    
+    def show_progress(report):
+        print(f"\r{report.rows_written} rows written", end="", file=sys.stderr, flush=True)
+    
+    exporter = ViolationExporter(batch_size=args.batch_size, progress_callback=show_progress)
+    try:
+        report = exporter.export(args.path, search_term=args.search, file_format=args.format)
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 2
+    print(file=sys.stderr)
+    print(report.summary())
+    return 0
+
+
+def cmd_rollup(args):
+    from database import TrafficViolationRepository
+    repository = TrafficViolationRepository()
+    if args.action == "rebuild":
+        groups = repository.rebuild_rollups()
+        print(f"Rebuilt rollup: {groups} groups")
+        return 0
+    
+    differences = repository.rollup_differences()
+    for state, violation_type, expected, actual in differences:
+        print(f"mismatch  {state or '(blank)'} / {violation_type or '(blank)'}: "
+              f"expected count={expected[0]} penalties={expected[1]} total={expected[2]:.2f}, "
+              f"rollup has count={actual[0]} penalties={actual[1]} total={actual[2]:.2f}")
+    if differences:
+        print(f"{len(differences)} groups differ; run `python cli.py rollup rebuild` to repair")
+        return 1
+    print("Rollup is consistent")
+    return 0
+
+
+def cmd_dedupe(args):
+    from database import TrafficViolationRepository
+    repository = TrafficViolationRepository()
+    if args.action == "backfill":
+        if not repository.hashing:
+            print("Content hashing is turned off (content_hash_enabled)", file=sys.stderr)
+            return 1
+        updated, duplicates = repository.backfill_content_hashes(args.batch_size)
+        print(f"Hashed {updated} records")
+        for record_id, existing_id in sorted(duplicates.items()):
+            print(f"duplicate  {record_id} is identical to {existing_id}")
+        if duplicates:
+            print(f"{len(duplicates)} exact duplicates left unhashed; remove them with "
+                  f"`python cli.py dedupe scan` or the Duplicates window, then backfill again")
+        return 0
+    
+    from dedupe import DuplicateFinder
+    finder = DuplicateFinder(repository, threshold=args.threshold)
+    groups = finder.find()
+    for group in groups:
+        print(f"{group.score:.2f}  " + ", ".join(str(record_id) for record_id in group.ids))
+    print(f"{len(groups)} groups of likely duplicates ({finder.compared} pairs compared)")
+    return 0
+
+
+def cmd_changes(args):
+    from database import TrafficViolationRepository
+    deleted = TrafficViolationRepository().prune_changes(args.days)
+    print(f"Deleted {deleted} change-log entries")
+    return 0
+
+
+def cmd_journal(args):
+    from journal import WriteBehindQueue
+    queue = WriteBehindQueue()
+    if args.action == "flush":
+        print(f"Applied {queue.flush()} queued changes")
+    status = queue.status()
+    print(f"{status['pending']} pending, {status['failed']} failed")
+    for write in queue.journal.failed():
+        print(f"failed  {write.describe()}: {' '.join(str(write.last_error).split())}")
+    return 0
+
+
+def cmd_benchmark(args):
+    import benchmark
+    
+    runner = benchmark.ViolationBenchmark(sizes=args.sizes, repeat=args.repeat,
+                                          write_count=args.writes, tk_rows=args.tk_rows,
+                                          progress=lambda message: print(message, file=sys.stderr))
+    results = runner.run()
+    for note in results["meta"]["notes"]:
+        print(note, file=sys.stderr)
+    for entry in results["results"]:
+        peak = f"{entry['peak_bytes'] / 1048576:9.1f} MiB" if entry["peak_bytes"] is not None else " " * 13
+        print(f"{entry['size']:>9}  {entry['operation']:<22} {entry['seconds']:10.4f}s  {peak}")
+    if args.output:
+        benchmark.save_results(results, args.output)
+        print(f"Results written to {args.output}")
+    
+    if args.baseline:
+        regressions = benchmark.compare(results, benchmark.load_results(args.baseline), args.tolerance)
+        for size, operation, metric, before, after in regressions:
+            print(f"REGRESSION  {size} {operation} {metric}: {before:.4g} -> {after:.4g}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} of {args.baseline}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Traffic Violation System command line tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    migrate = commands.add_parser("migrate", help="create the indexes and tables the application relies on")
+    migrate.add_argument("--list", action="store_true", help="only list migrations that have not been applied")
+    migrate.set_defaults(func=cmd_migrate)
+    
+    import_ = commands.add_parser("import", help="bulk-load violations from a CSV or JSONL file")
+    import_.add_argument("path")
+    import_.add_argument("--format", choices=("csv", "jsonl"), help="default: from the file extension")
+    import_.add_argument("--batch-size", type=int, help="rows per transaction (default: import_batch_size)")
+    import_.add_argument("--errors", help="where to write rejected rows (default: <file>.rejected.csv)")
+    import_.add_argument("--load-data", action="store_true",
+                         help="insert batches with LOAD DATA LOCAL INFILE instead of executemany")
+    import_.set_defaults(func=cmd_import)
+    
+    export = commands.add_parser("export", help="stream violations to a CSV or Parquet file")
+    export.add_argument("path")
+    export.add_argument("--format", choices=("csv", "parquet"), help="default: from the file extension")
+    export.add_argument("--search", help="only export rows matching this search term")
+    export.add_argument("--batch-size", type=int, help="rows per fetch/write (default: export_batch_size)")
+    export.set_defaults(func=cmd_export)
+    
+    rollup = commands.add_parser("rollup", help="rebuild or check the State/Violation Type rollup table")
+    rollup.add_argument("action", choices=("rebuild", "check"))
+    rollup.set_defaults(func=cmd_rollup)
+    
+    dedupe = commands.add_parser("dedupe", help="hash existing records or list likely duplicates")
+    dedupe.add_argument("action", choices=("backfill", "scan"))
+    dedupe.add_argument("--batch-size", type=int, help="rows hashed per transaction (default: batch_chunk_size)")
+    dedupe.add_argument("--threshold", type=float, help="similarity needed to group records (default: dedupe_threshold)")
+    dedupe.set_defaults(func=cmd_dedupe)
+    
+    changes = commands.add_parser("changes", help="prune the change log that stations poll for updates")
+    changes.add_argument("action", choices=("prune",))
+    changes.add_argument("--days", type=float, help="keep this many days of entries (default: change_log_retention_days)")
+    changes.set_defaults(func=cmd_changes)
+    
+    journal = commands.add_parser("journal", help="show or apply the write-behind journal")
+    journal.add_argument("action", choices=("status", "flush"))
+    journal.set_defaults(func=cmd_journal)
+    
+    bench = commands.add_parser("benchmark", help="time repository and grid operations on synthetic data")
+    bench.add_argument("--sizes", type=int, nargs="+", help="dataset sizes in rows (default: 10000 100000 1000000)")
+    bench.add_argument("--repeat", type=int, default=3, help="timed runs per operation; the median is reported")
+    bench.add_argument("--writes", type=int, default=200, help="records created/updated per write benchmark")
+    bench.add_argument("--tk-rows", type=int, default=100000, help="most rows loaded into the Treeview")
+    bench.add_argument("--output", help="write results as JSON to this file")
+    bench.add_argument("--baseline", help="compare against a previous --output file; exit 1 on regressions")
+    bench.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before a regression (0.2 = 20%%)")
+    bench.set_defaults(func=cmd_benchmark)
+    
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,41 +1,164 @@
-class AppConfig:
-    _instance = None
-    
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
-    
-    def __init__(self):
-        if self._initialized:
-            return
-        self._initialized = True
-        
-        # Database Configuration
-        self.db_host = "localhost"
-        self.db_user = "root"
-        self.db_password = ""
-        self.db_name = "traffic_violation"
-        
-        # Authentication
-        self.login_username = "admin"
-        self.login_password = "admin123"
-        
-        # Field Configuration
-        self.int_fields = ["Year"]
-        self.numeric_fields = ["Penalty Amount"]  
-        self.columns = ("ID","Plate Number","Driver Name","Description","Belts","Personal Injury","Property Damage",
-                       "Commercial License","Commercial Vehicle","State","Vehicle Type","Year","Make","Model","Color",
-                       "Charge","Penalty Amount","Contributed To Accident","Race","Gender","Driver City","Driver State",
-                       "DL State","Arrest Type","Violation Type")
-        
-        # UI Colors
-        self.colors = {
-            'dark': "#17252A",
-            'teal': "#2B7A78",
-            'light_teal': "#3AAFA9",
-            'light_cyan': "#DEF2F1",
-            'white': "#FEFFFF"
-        }
-
+from datetime import date
+from models import FIELDS, EDITABLE_FIELDS
+
+
+class AppConfig:
+    _instance = None
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+    
+    def __init__(self):
+        if self._initialized:
+            return
+        self._initialized = True
+        
+        # Database Configuration
+        self.db_backend = "mysql"        # "mysql", or "sqlite" for an embedded single-file database
+        self.db_host = "localhost"
+        self.db_user = "root"
+        self.db_password = ""
+        self.db_name = "traffic_violation"
+        self.db_allow_local_infile = False  # required for the LOAD DATA import fast path
+        self.db_sqlite_path = "traffic_violation.db"
+        self.db_sqlite_busy_timeout = 5          # seconds a writer waits for the database lock
+        self.db_sqlite_statement_cache = 256     # compiled statements kept per connection
+        
+        # Connection Pool
+        self.db_pool_size = 5
+        self.db_pool_timeout = 10                # seconds to wait for a free connection
+        self.db_pool_idle_timeout = 300          # idle connections older than this are closed
+        self.db_pool_health_check_interval = 30  # ping reused connections idle longer than this
+        
+        # Read Replicas: list, search and report queries can run on these; writes and
+        # edit-time reads always use the primary above. Each entry overrides only what
+        # differs, without the db_ prefix, e.g.
+        # {"name": "replica1", "host": "10.0.0.12"} or {"name": "local", "sqlite_path": "replica.db"}
+        self.db_replicas = []
+        self.db_replica_selection = "round_robin"   # or "least_busy" (fewest connections in use)
+        self.db_replica_retry_interval = 30         # seconds an unreachable replica is left out
+        self.db_replica_read_your_writes = 5        # seconds after a write that reads stay on the primary
+        
+        # Authentication
+        self.login_username = "admin"
+        self.login_password = "admin123"
+        
+        # Field Configuration (derived from the record schema in models.FIELDS)
+        self.int_fields = [field.label for field in EDITABLE_FIELDS if field.kind is int]
+        self.numeric_fields = [field.label for field in EDITABLE_FIELDS if field.kind is float]
+        self.columns = tuple(field.label for field in FIELDS)
+        self.grid_columns = tuple(field.label for field in FIELDS if field.in_grid)
+        self.filter_columns = ("State", "Violation Type", "Year", "Penalty Amount")
+        
+        # Validation: domain rules by label, on top of "required" and the types above.
+        # pattern is a case-insensitive regex for the whole value; choices ignore case.
+        yes_no = {"choices": ("Yes", "No")}
+        state = {"pattern": r"[A-Z]{2}"}
+        self.validation_rules = {
+            "Plate Number": {"pattern": r"[A-Z0-9][A-Z0-9 -]{0,9}"},
+            "Belts": yes_no,
+            "Personal Injury": yes_no,
+            "Property Damage": yes_no,
+            "Commercial License": yes_no,
+            "Commercial Vehicle": yes_no,
+            "State": state,
+            "Year": {"min": 1900, "max": date.today().year + 1},
+            "Penalty Amount": {"min": 0},
+            "Contributed To Accident": yes_no,
+            "Driver State": state,
+            "DL State": state,
+        }
+        
+        # Editing
+        self.optimistic_locking = True   # version-checked updates (needs `python cli.py migrate`)
+        self.batch_chunk_size = 500      # ids per IN (...) list in multi-row deletes and edits
+        
+        # Search
+        self.search_mode = "indexed"     # "indexed" (needs `python cli.py migrate`) or "like"
+        self.search_result_limit = 500
+        self.fulltext_min_token = 2      # MySQL ngram_token_size; shorter terms only match plates
+        self.live_search = True          # search as the user types
+        self.search_debounce_ms = 300    # wait this long after the last keystroke
+        self.live_search_min_chars = 2   # shorter terms wait for Enter or the Search button
+        self.suggestion_limit = 8
+        
+        # Result Cache
+        self.cache_enabled = True
+        self.cache_max_entries = 128
+        self.cache_ttl = 30              # seconds; bounds staleness from other stations' writes
+        
+        # Bulk Import
+        self.import_batch_size = 1000    # rows per executemany / transaction
+        
+        # Export
+        self.export_batch_size = 5000    # rows per fetchmany / written batch
+        
+        # Change Tracking
+        self.auto_refresh = True            # poll the change log (needs `python cli.py migrate`)
+        self.change_poll_interval_ms = 5000
+        self.change_batch_limit = 500
+        self.change_log_retention_days = 7  # `python cli.py changes prune` drops older entries
+        
+        # Duplicates
+        self.content_hash_enabled = False   # content_hash column; turn on after `python cli.py migrate`
+        self.dedupe_threshold = 0.9         # similarity (0..1) at which two records are near-duplicates
+        self.dedupe_max_block = 200         # larger blocks (e.g. a blank plate) are skipped
+        
+        # Write-behind: saves go to a local journal and are written to the database in the
+        # background, so a slow or unreachable server doesn't lose what was typed
+        self.write_behind_enabled = False   # needs `python cli.py migrate` (applied_writes)
+        self.write_behind_journal_path = "pending_writes.db"
+        self.write_behind_batch_size = 50   # journal entries applied per transaction
+        self.write_behind_retry_ms = 1000   # first retry after a failure, doubled each time
+        self.write_behind_max_retry_ms = 60000
+        self.write_behind_poll_ms = 1000    # how often the UI refreshes the pending count
+        
+        # Analytics
+        self.analytics_dimensions = ("State", "Violation Type", "Make", "Year", "Gender",
+                                     "Arrest Type", "Contributed To Accident")
+        self.analytics_cache_entries = 32
+        self.analytics_cache_ttl = 300   # seconds; statistics tolerate a few minutes of lag
+        self.analytics_use_rollups = True  # read State/Violation Type totals from the rollup table
+        
+        # Query Instrumentation
+        self.query_metrics_enabled = True
+        self.query_log_size = 200                 # recent and slow queries kept in memory
+        self.slow_query_ms = 500
+        self.slow_query_log_path = None           # absolute path for a JSON-lines file; None keeps them in memory
+        self.slow_query_explain = False           # EXPLAIN slow SELECTs (one extra query each)
+        
+        # Background Work
+        self.worker_threads = 2
+        self.task_poll_interval_ms = 50
+        
+        # Startup
+        self.startup_prewarm = True        # connect and load the first page while the login window is up
+        self.startup_report = False        # print startup and import timings (or TV_STARTUP_REPORT=1)
+        self.startup_report_top = 20       # slowest imports listed in the report
+        
+        # Notifications
+        self.notification_display_ms = 5000        # how long a message stays in the status bar
+        self.notification_error_display_ms = 10000
+        self.notification_poll_ms = 200
+        self.notification_history = 200            # messages kept for the History window
+        
+        # Table Paging
+        self.virtual_table = True         # page the full listing in as the user scrolls
+        self.page_size = 200              # rows fetched per keyset page
+        self.virtual_prefetch_rows = 100  # fetch the next page when this close to the loaded edge
+        self.virtual_max_rows = 1000      # rows kept in the Treeview; the far end is trimmed
+        
+        # UI Colors
+        self.colors = {
+            'dark': "#17252A",
+            'teal': "#2B7A78",
+            'light_teal': "#3AAFA9",
+            'light_cyan': "#DEF2F1",
+            'white': "#FEFFFF",
+            'error': "#B23A48",
+            'invalid': "#F8D7DA"
+        }
+
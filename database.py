@@ -1,165 +1,1131 @@
-import mysql.connector
-from mysql.connector import Error
-from tkinter import messagebox
-from config import AppConfig
-from abc import ABC, abstractmethod
-
-
-class DatabaseConnection:
-    
-    def __init__(self):
-        self.config = AppConfig()
-        self.connection = None
-        self.cursor = None
-    
-    def __enter__(self):
-        try:
-            self.connection = mysql.connector.connect(
-                host=self.config.db_host,
-                user=self.config.db_user,
-                password=self.config.db_password,
-                database=self.config.db_name
-            )
-            self.cursor = self.connection.cursor()
-            return self
-        except Error as e:
-            messagebox.showerror("Database Error", f"Failed to connect to database:\n{e}")
-            raise
-    
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.cursor:
-            self.cursor.close()
-        if self.connection:
-            if exc_type is None:
-                self.connection.commit()
-            else:
-                self.connection.rollback()
-            self.connection.close()
-        return False
-    
-    def execute(self, query, params=None):
-        if params:
-            self.cursor.execute(query, params)
-        else:
-            self.cursor.execute(query)
-        return self.cursor
-    
-    def fetchall(self):
-        return self.cursor.fetchall()
-    
-    def fetchone(self):
-        return self.cursor.fetchone()
-
-
-class DatabaseRepository(ABC):
-    def __init__(self):
-        self.config = AppConfig()
-    
-    @abstractmethod
-    def get_all(self):
-        pass
-    
-    @abstractmethod
-    def get_by_id(self, record_id):
-        pass
-    
-    @abstractmethod
-    def create(self, data):
-        pass
-    
-    @abstractmethod
-    def update(self, record_id, data):
-        pass
-    
-    @abstractmethod
-    def delete(self, record_id):
-        pass
-
-
-class TrafficViolationRepository(DatabaseRepository):
-    def get_all(self):
-        try:
-            with DatabaseConnection() as db:
-                db.execute("SELECT * FROM traffic_violations")
-                return db.fetchall()
-        except Error as e:
-            messagebox.showerror("Database Error", f"Failed to fetch records:\n{e}")
-            return []
-        except Exception as e:
-            messagebox.showerror("Error", f"An unexpected error occurred:\n{e}")
-            return []
-    
-    def get_by_id(self, record_id):
-        try:
-            with DatabaseConnection() as db:
-                db.execute("SELECT * FROM traffic_violations WHERE id=%s", (record_id,))
-                return db.fetchone()
-        except Error as e:
-            messagebox.showerror("Database Error", f"Failed to fetch record:\n{e}")
-            return None
-        except Exception as e:
-            messagebox.showerror("Error", f"An unexpected error occurred:\n{e}")
-            return None
-    
-    def search(self, search_term):
-        try:
-            with DatabaseConnection() as db:
-                query = """SELECT * FROM traffic_violations 
-                           WHERE PlateNumber LIKE %s OR DriverName LIKE %s OR Charge LIKE %s"""
-                value = f"%{search_term}%"
-                db.execute(query, (value, value, value))
-                return db.fetchall()
-        except Error as e:
-            messagebox.showerror("Search Error", f"Failed to search records:\n{e}")
-            return []
-        except Exception as e:
-            messagebox.showerror("Error", f"An unexpected error occurred:\n{e}")
-            return []
-    
-    def create(self, data):
-        try:
-            with DatabaseConnection() as db:
-                query = """INSERT INTO traffic_violations 
-                (PlateNumber, DriverName, Description, Belts, Personal_Injury, Property_Damage, 
-                Commercial_License, Commercial_Vehicle, State, VehicleType, Year, Make, Model, Color, 
-                Charge, PenaltyAmount, Contributed_To_Accident, Race, Gender, Driver_City, Driver_State, 
-                DL_State, Arrest_Type, Violation_Type)
-                VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)"""
-                db.execute(query, data)
-                return True
-        except Error as e:
-            messagebox.showerror("Database Error", f"Failed to add record:\n{e}")
-            return False
-        except Exception as e:
-            messagebox.showerror("Error", f"An unexpected error occurred:\n{e}")
-            return False
-    
-    def update(self, record_id, data):
-        try:
-            with DatabaseConnection() as db:
-                query = """UPDATE traffic_violations SET PlateNumber=%s, DriverName=%s, Description=%s, Belts=%s,
-                Personal_Injury=%s, Property_Damage=%s, Commercial_License=%s, Commercial_Vehicle=%s,
-                State=%s, VehicleType=%s, Year=%s, Make=%s, Model=%s, Color=%s, Charge=%s, PenaltyAmount=%s,
-                Contributed_To_Accident=%s, Race=%s, Gender=%s, Driver_City=%s, Driver_State=%s, DL_State=%s,
-                Arrest_Type=%s, Violation_Type=%s WHERE id=%s"""
-                vals = data + (record_id,)
-                db.execute(query, vals)
-                return True
-        except Error as e:
-            messagebox.showerror("Database Error", f"Failed to update record:\n{e}")
-            return False
-        except Exception as e:
-            messagebox.showerror("Error", f"An unexpected error occurred:\n{e}")
-            return False
-    
-    def delete(self, record_id):
-        try:
-            with DatabaseConnection() as db:
-                db.execute("DELETE FROM traffic_violations WHERE id=%s", (record_id,))
-                return True
-        except Error as e:
-            messagebox.showerror("Database Error", f"Failed to delete record:\n{e}")
-            return False
-        except Exception as e:
-            messagebox.showerror("Error", f"An unexpected error occurred:\n{e}")
-            return False
+import threading
+import time
+from collections import deque
+from backends import Error, create_backend
+from config import AppConfig
+from errors import (DataAccessError, FilterError, RecordNotFoundError, ConcurrencyConflictError,
+                    DuplicateRecordError)
+from instrumentation import QueryMetrics, QueryRecord, fingerprint, redact
+from models import EDITABLE_FIELDS, FIELDS_BY_LABEL, select_list, make_rows, make_row, content_hash
+from query_builder import ViolationQuery, escape_like, LIKE_ESCAPE
+from abc import ABC, abstractmethod
+
+
+class PoolTimeoutError(Error):
+    pass
+
+
+class EndpointConfig:
+    # A read replica's settings: its own entries from AppConfig.db_replicas, named without
+    # the db_ prefix ({"host": ...} or {"sqlite_path": ...}), over the primary's
+    
+    def __init__(self, config, overrides):
+        self._config = config
+        self._overrides = {f"db_{key}": value for key, value in overrides.items() if key != "name"}
+    
+    def __getattr__(self, name):
+        if name in self._overrides:
+            return self._overrides[name]
+        return getattr(self._config, name)
+
+
+class ConnectionPool:
+    # ConnectionPool() is the primary's pool, shared process-wide; replicas get their own
+    # instances from for_endpoint()
+    _instance = None
+    _instance_lock = threading.Lock()
+    
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance._initialized = False
+        return cls._instance
+    
+    def __init__(self):
+        if self._initialized:
+            return
+        self._initialized = True
+        self._setup(AppConfig(), "primary")
+    
+    @classmethod
+    def for_endpoint(cls, config, name):
+        pool = object.__new__(cls)
+        pool._initialized = True
+        pool._setup(config, name)
+        return pool
+    
+    def _setup(self, config, name):
+        self.config = config
+        self.name = name
+        self.backend = create_backend(self.config)
+        self._condition = threading.Condition()
+        self._idle = deque()  # (connection, released_at), most recently used on the right
+        self._in_use = 0
+        self._stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'wait_time': 0.0,
+            'timeouts': 0,
+            'created': 0,
+            'reconnects': 0,
+            'evicted': 0,
+            'discarded': 0
+        }
+    
+    def acquire(self):
+        deadline = time.monotonic() + self.config.db_pool_timeout
+        with self._condition:
+            self._evict_idle()
+            if not self._idle and self._in_use >= self.config.db_pool_size:
+                self._stats['waits'] += 1
+                wait_started = time.monotonic()
+                while not self._idle and self._in_use >= self.config.db_pool_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolTimeoutError(
+                            f"No database connection available after {self.config.db_pool_timeout}s "
+                            f"(pool size {self.config.db_pool_size})")
+                    self._condition.wait(remaining)
+                self._stats['wait_time'] += time.monotonic() - wait_started
+            
+            connection, released_at = self._idle.pop() if self._idle else (None, None)
+            self._in_use += 1
+            self._stats['checkouts'] += 1
+        
+        # Connecting and pinging happen outside the lock so slow servers don't serialize the pool
+        try:
+            if connection is None:
+                return self._connect()
+            if time.monotonic() - released_at >= self.config.db_pool_health_check_interval:
+                return self._ensure_alive(connection)
+            return connection
+        except Exception:
+            with self._condition:
+                self._in_use -= 1
+                self._condition.notify()
+            raise
+    
+    def release(self, connection, discard=False):
+        with self._condition:
+            self._in_use -= 1
+            if discard:
+                self._stats['discarded'] += 1
+                self._close_quietly(connection)
+            else:
+                self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+    
+    def close_all(self):
+        with self._condition:
+            while self._idle:
+                connection, _ = self._idle.popleft()
+                self._close_quietly(connection)
+    
+    def prewarm(self, count=1):
+        # Opens connections ahead of the first query, e.g. while the login window is up
+        connections = []
+        try:
+            for _ in range(min(count, self.config.db_pool_size)):
+                connections.append(self.acquire())
+        finally:
+            for connection in connections:
+                self.release(connection)
+        return len(connections)
+    
+    def get_stats(self):
+        with self._condition:
+            stats = dict(self._stats)
+            stats['name'] = self.name
+            stats['size'] = self.config.db_pool_size
+            stats['idle'] = len(self._idle)
+            stats['in_use'] = self._in_use
+        return stats
+    
+    def in_use(self):
+        with self._condition:
+            return self._in_use
+    
+    def _connect(self):
+        connection = self.backend.connect()
+        with self._condition:
+            self._stats['created'] += 1
+        return connection
+    
+    def _ensure_alive(self, connection):
+        try:
+            self.backend.ping(connection)
+            return connection
+        except Error:
+            self._close_quietly(connection)
+            with self._condition:
+                self._stats['reconnects'] += 1
+            return self._connect()
+    
+    def _evict_idle(self):
+        cutoff = time.monotonic() - self.config.db_pool_idle_timeout
+        while self._idle and self._idle[0][1] < cutoff:
+            connection, _ = self._idle.popleft()
+            self._stats['evicted'] += 1
+            self._close_quietly(connection)
+    
+    def _close_quietly(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+class ReplicaRouter:
+    # Chooses where read-only DatabaseConnection blocks run: the replicas in
+    # AppConfig.db_replicas, round-robin or least busy (db_replica_selection). A replica that
+    # can't be reached is left out for db_replica_retry_interval seconds and the read fails
+    # over to the next one, then to the primary. Reads made within db_replica_read_your_writes
+    # seconds of this session's last write go to the primary, so replication lag never hides
+    # a change the user just saved.
+    _instance = None
+    _instance_lock = threading.Lock()
+    
+    # MySQL client errors for a server that can't be reached or went away mid-query
+    CONNECTION_ERRNOS = {2003, 2005, 2006, 2013, 2055}
+    
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance._initialized = False
+        return cls._instance
+    
+    def __init__(self):
+        if self._initialized:
+            return
+        self._initialized = True
+        
+        self.config = AppConfig()
+        self.replicas = [ConnectionPool.for_endpoint(EndpointConfig(self.config, endpoint),
+                                                     endpoint.get("name", f"replica{index + 1}"))
+                         for index, endpoint in enumerate(self.config.db_replicas)]
+        self._lock = threading.Lock()
+        self._next = 0
+        self._down_until = {}
+        self._errors = {}
+        self._last_write = None
+        self._stats = {'replica_reads': 0, 'primary_reads': 0, 'sticky_reads': 0, 'failovers': 0}
+    
+    def candidates(self):
+        # Replicas to try for one read, in order; empty means the primary
+        with self._lock:
+            if not self.replicas:
+                return []
+            if (self._last_write is not None and
+                    time.monotonic() - self._last_write < self.config.db_replica_read_your_writes):
+                self._stats['sticky_reads'] += 1
+                return []
+            now = time.monotonic()
+            healthy = [pool for pool in self.replicas if self._down_until.get(pool.name, 0) <= now]
+            if not healthy:
+                return []
+            start = self._next % len(healthy)
+            self._next += 1
+            ordered = healthy[start:] + healthy[:start]
+        if self.config.db_replica_selection == "least_busy":
+            # Stable sort: replicas equally busy keep their round-robin order
+            ordered.sort(key=lambda pool: pool.in_use())
+        return ordered
+    
+    def record_read(self, pool):
+        with self._lock:
+            self._stats['replica_reads' if pool.name != "primary" else 'primary_reads'] += 1
+    
+    def mark_down(self, pool, error):
+        with self._lock:
+            self._stats['failovers'] += 1
+            self._down_until[pool.name] = time.monotonic() + self.config.db_replica_retry_interval
+            self._errors[pool.name] = str(error)
+        pool.close_all()
+    
+    def note_write(self):
+        with self._lock:
+            self._last_write = time.monotonic()
+    
+    def is_connection_error(self, error):
+        return getattr(error, "errno", None) in self.CONNECTION_ERRNOS
+    
+    def get_stats(self):
+        now = time.monotonic()
+        with self._lock:
+            stats = dict(self._stats)
+            stats['replicas'] = [{
+                'name': pool.name,
+                'healthy': self._down_until.get(pool.name, 0) <= now,
+                'in_use': pool.in_use(),
+                'last_error': self._errors.get(pool.name),
+            } for pool in self.replicas]
+        return stats
+
+
+class DatabaseConnection:
+    # read_only blocks may run on a read replica (ReplicaRouter); everything else, and every
+    # read when no replica is configured, runs on the primary
+    
+    def __init__(self, instrument=True, read_only=False):
+        self.config = AppConfig()
+        self.read_only = read_only
+        self.router = ReplicaRouter()
+        self.pool = ConnectionPool()
+        self.backend = self.pool.backend
+        self.connection = None
+        self.cursor = None
+        self._wrote = False
+        # Timings go to QueryMetrics; EXPLAIN lookups open an uninstrumented connection
+        self.metrics = QueryMetrics() if instrument and self.config.query_metrics_enabled else None
+        self._query = None
+        self._query_sql = None
+        self._query_clock = 0.0
+        self._acquire_ms = 0.0
+        self._slow = []
+    
+    def __enter__(self):
+        try:
+            started = time.perf_counter()
+            self.connection = self._acquire()
+            if self.metrics:
+                self._acquire_ms = (time.perf_counter() - started) * 1000
+                self.metrics.record_acquire(self._acquire_ms)
+            self.backend.begin(self.connection)
+            with self.backend.translate_errors():
+                self.cursor = self.connection.cursor()
+            return self
+        except Error:
+            if self.connection:
+                self.pool.release(self.connection, discard=True)
+                self.connection = None
+            raise
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            if self.cursor:
+                try:
+                    with self.backend.translate_errors():
+                        self.cursor.close()
+                except Error:
+                    pass
+            if self.connection:
+                discard = False
+                try:
+                    with self.backend.translate_errors():
+                        if exc_type is None:
+                            self.connection.commit()
+                        else:
+                            self.connection.rollback()
+                except Error:
+                    # A connection that can't finish its transaction is not safe to hand out again
+                    discard = True
+                    if exc_type is None:
+                        raise
+                finally:
+                    self.pool.release(self.connection, discard=discard)
+                    self.connection = None
+                    self.cursor = None
+                if exc_type is None and self._wrote:
+                    self.router.note_write()
+        finally:
+            # Metrics and the slow log are bookkeeping: they run once the transaction is over
+            # and the connection is back in the pool, whatever happened to either
+            self._finish_query()
+            self._log_slow()
+        return False
+    
+    def _acquire(self):
+        # Replicas in the router's order, skipping any that can't connect (they are marked
+        # down); the primary when none is left
+        if self.read_only:
+            for pool in self.router.candidates():
+                try:
+                    connection = pool.acquire()
+                except PoolTimeoutError:
+                    continue  # busy, not broken
+                except Error as e:
+                    self.router.mark_down(pool, e)
+                    continue
+                self.pool, self.backend = pool, pool.backend
+                self.router.record_read(pool)
+                return connection
+            self.router.record_read(self.pool)
+        return self.pool.acquire()
+    
+    # SQL is written in the MySQL dialect; the backend adapts it and maps driver errors
+    def execute(self, query, params=None):
+        self._start_query(query, params)
+        if not self._wrote and query.lstrip()[:6].upper() != "SELECT":
+            self._wrote = True
+        try:
+            with self.backend.translate_errors():
+                if params:
+                    self.cursor.execute(self.backend.prepare(query), params)
+                else:
+                    self.cursor.execute(self.backend.prepare(query))
+        except Error as e:
+            self._query_failed(e)
+            raise
+        self._query_executed()
+        return self.cursor
+    
+    def executemany(self, query, seq_params):
+        self._start_query(query, None)
+        self._wrote = True
+        try:
+            with self.backend.translate_errors():
+                self.cursor.executemany(self.backend.prepare(query), seq_params)
+        except Error as e:
+            self._query_failed(e)
+            raise
+        self._query_executed()
+        return self.cursor
+    
+    def fetchall(self):
+        started = time.perf_counter()
+        with self.backend.translate_errors():
+            rows = self.cursor.fetchall()
+        self._query_fetched(started, len(rows))
+        return rows
+    
+    def fetchone(self):
+        started = time.perf_counter()
+        with self.backend.translate_errors():
+            row = self.cursor.fetchone()
+        self._query_fetched(started, 1 if row is not None else 0)
+        return row
+    
+    def fetchmany(self, size):
+        started = time.perf_counter()
+        with self.backend.translate_errors():
+            rows = self.cursor.fetchmany(size)
+        self._query_fetched(started, len(rows))
+        return rows
+    
+    def _start_query(self, query, params):
+        if not self.metrics:
+            return
+        # A statement is complete once the next one starts (or the block ends), so its
+        # fetches are counted with it. Waiting for the pool is charged to the first one.
+        self._finish_query()
+        self._query = QueryRecord(fingerprint(query), redact(params), self._acquire_ms)
+        self._query_sql = (query, params)
+        self._acquire_ms = 0.0
+        self._query_clock = time.perf_counter()
+    
+    def _query_executed(self):
+        if self._query:
+            self._query.execute_ms = (time.perf_counter() - self._query_clock) * 1000
+            if not self._query.statement.startswith("SELECT"):
+                # SELECT row counts come from the fetches; drivers report -1 before them
+                self._query.rows = max(self.cursor.rowcount or 0, 0)
+    
+    def _query_failed(self, error):
+        if self._query:
+            self._query.execute_ms = (time.perf_counter() - self._query_clock) * 1000
+            self._query.error = str(error)
+            self._finish_query()
+        if self.pool.name != "primary" and self.router.is_connection_error(error):
+            # The replica went away mid-query: this read fails, the next ones go elsewhere
+            self.router.mark_down(self.pool, error)
+    
+    def _query_fetched(self, started, rows):
+        if self._query:
+            self._query.fetch_ms += (time.perf_counter() - started) * 1000
+            self._query.rows += rows
+    
+    def _finish_query(self):
+        record, self._query = self._query, None
+        if record is not None and self.metrics.record(record):
+            # Logged (and explained) by _log_slow once the block ends, so neither the file
+            # write nor the plan lookup can hold up or join this transaction
+            self._slow.append(self._query_sql + (record,))
+    
+    def _log_slow(self):
+        pending, self._slow = self._slow, []
+        for query, params, record in pending:
+            if self.config.slow_query_explain and record.statement.startswith("SELECT") and not record.error:
+                try:
+                    with DatabaseConnection(instrument=False) as db:
+                        db.execute(self.backend.explain_prefix + query, params)
+                        record.plan = [list(row) for row in db.fetchall()]
+                except Error as e:
+                    record.plan = f"EXPLAIN failed: {e}"
+            self.metrics.log_slow(record)
+
+
+class ChangeSet:
+    
+    def __init__(self, version, rows, deleted_ids, has_more, expired=False):
+        self.version = version
+        self.rows = rows
+        self.deleted_ids = deleted_ids
+        self.has_more = has_more
+        # The log no longer reaches back to the caller's version: reload instead of patching
+        self.expired = expired
+    
+    def __bool__(self):
+        return bool(self.rows or self.deleted_ids)
+
+
+class BatchResult:
+    # Per-row outcome of a batch write: ids that were written, ids that failed with the
+    # reason, and (for updates) the rows as stored afterwards
+    
+    def __init__(self):
+        self.succeeded = []
+        self.failed = {}
+        self.rows = []
+        self.queued = False  # journaled in write-behind mode, not written yet
+    
+    def summary(self, verb):
+        text = f"{len(self.succeeded)} records {verb}"
+        if self.queued:
+            text += " (queued, they will be saved in the background)"
+        if self.failed:
+            text += f", {len(self.failed)} skipped"
+        return text
+
+
+class DatabaseRepository(ABC):
+    def __init__(self):
+        self.config = AppConfig()
+        self.backend = ConnectionPool().backend
+    
+    @abstractmethod
+    def get_all(self, columns=None, sort=None, filters=None):
+        pass
+    
+    @abstractmethod
+    def get_page(self, after=None, before=None, limit=None, columns=None, sort=None, filters=None,
+                 inclusive=False):
+        pass
+    
+    @abstractmethod
+    def get_by_id(self, record_id, columns=None):
+        pass
+    
+    @abstractmethod
+    def create(self, data):
+        pass
+    
+    @abstractmethod
+    def update(self, record_id, data):
+        pass
+    
+    @abstractmethod
+    def delete(self, record_id):
+        pass
+
+
+class TrafficViolationRepository(DatabaseRepository):
+    # Column order matches AppConfig.columns[1:], i.e. the order of the data tuples
+    INSERT_COLUMNS = tuple(field.column for field in EDITABLE_FIELDS)
+    
+    # Blocking keys for near-duplicate search: only records sharing a key are compared
+    BLOCKING_KEYS = {
+        "plate": ("UPPER(REPLACE(TRIM(PlateNumber), ' ', ''))",),
+        "driver_charge": ("UPPER(TRIM(DriverName))", "UPPER(TRIM(Charge))"),
+    }
+    
+    # Dimensions of violation_rollup_state_type (migration 005)
+    ROLLUP_DIMENSIONS = ("State", "Violation Type")
+    ROLLUP_REBUILD_QUERY = """INSERT INTO violation_rollup_state_type
+                                  (State, Violation_Type, violation_count, penalty_count, penalty_total)
+                              SELECT COALESCE(State, ''), COALESCE(Violation_Type, ''), COUNT(*),
+                                     COUNT(PenaltyAmount), COALESCE(SUM(PenaltyAmount), 0)
+                              FROM traffic_violations
+                              GROUP BY COALESCE(State, ''), COALESCE(Violation_Type, '')"""
+    
+    def __init__(self):
+        super().__init__()
+        # With content hashing on (migration 006), every write also stores the record's
+        # models.content_hash, and the unique index turns exact duplicates into errno 1062
+        self.hashing = self.config.content_hash_enabled
+        self.write_columns = self.INSERT_COLUMNS + (("content_hash",) if self.hashing else ())
+        self.insert_query = (f"INSERT INTO traffic_violations ({', '.join(self.write_columns)}) "
+                             f"VALUES ({', '.join(['%s'] * len(self.write_columns))})")
+        self.update_query = (f"UPDATE traffic_violations SET "
+                             f"{', '.join(column + '=%s' for column in self.write_columns)} WHERE id=%s")
+    
+    def get_all(self, columns=None, sort=None, filters=None):
+        try:
+            sql, params, _ = ViolationQuery(columns, sort, filters).select()
+            with DatabaseConnection(read_only=True) as db:
+                db.execute(sql, params)
+                return make_rows(db.fetchall(), columns)
+        except ValueError as e:
+            raise FilterError(str(e)) from e
+        except Error as e:
+            raise DataAccessError("Failed to fetch records", e) from e
+    
+    def get_page(self, after=None, before=None, limit=None, columns=None, sort=None, filters=None,
+                 inclusive=False):
+        # Keyset pagination: cost depends on the page size, not the offset. after/before are
+        # cursors from ViolationQuery.cursor_for() (the id when sorting by id).
+        limit = limit or self.config.page_size
+        try:
+            query = ViolationQuery(columns, sort, filters)
+            sql, params, reverse = query.select(after=after, before=before, inclusive=inclusive,
+                                                limit=limit)
+            with DatabaseConnection(read_only=True) as db:
+                db.execute(sql, params)
+                rows = db.fetchall()
+            return make_rows(rows[::-1] if reverse else rows, columns)
+        except ValueError as e:
+            raise FilterError(str(e)) from e
+        except Error as e:
+            raise DataAccessError("Failed to fetch records", e) from e
+    
+    def get_by_id(self, record_id, columns=None):
+        try:
+            with DatabaseConnection(read_only=True) as db:
+                return self._fetch_by_id(db, record_id, columns)
+        except Error as e:
+            raise DataAccessError("Failed to fetch record", e) from e
+    
+    def search(self, search_term, columns=None):
+        try:
+            return self._search(search_term, columns)
+        except Error as e:
+            raise DataAccessError("Failed to search records", e) from e
+    
+    def _search(self, search_term, columns=None):
+        # The grid's search and the export of its results both come through here, so they
+        # match the same rows, capped at search_result_limit
+        term = search_term.strip()
+        if self.config.search_mode != "indexed" or not term or not self.backend.supports_fulltext:
+            return self._search_like(search_term, columns)
+        return self._search_ranked(term, columns)
+    
+    def _search_ranked(self, term, columns=None):
+        # Without migration 001 MySQL has no FULLTEXT index to MATCH against (errno 1191),
+        # so the search falls back to LIKE
+        try:
+            return self._search_indexed(term, columns)
+        except Error as e:
+            if e.errno != 1191:
+                raise
+            return self._search_like(term, columns)
+    
+    def _search_like(self, search_term, columns=None):
+        with DatabaseConnection(read_only=True) as db:
+            query = f"""SELECT {select_list(columns)} FROM traffic_violations 
+                        WHERE PlateNumber LIKE %s OR DriverName LIKE %s OR Charge LIKE %s
+                        ORDER BY id LIMIT %s"""
+            value = f"%{search_term}%"
+            db.execute(query, (value, value, value, self.config.search_result_limit))
+            return make_rows(db.fetchall(), columns)
+    
+    def _search_indexed(self, term, columns=None):
+        # Ranked: exact plate, then plate prefix (both via the PlateNumber B-tree index),
+        # then FULLTEXT relevance on DriverName/Charge. The queries are kept separate because
+        # MySQL can't combine a range scan and a MATCH() in one OR without a table scan.
+        limit = self.config.search_result_limit
+        select = select_list(columns)
+        ranked = {}
+        with DatabaseConnection(read_only=True) as db:
+            prefix = escape_like(term) + "%"
+            db.execute(f"""SELECT {select}, PlateNumber = %s AS exact_plate
+                           FROM traffic_violations WHERE PlateNumber LIKE %s {LIKE_ESCAPE}
+                           ORDER BY PlateNumber, id LIMIT %s""", (term, prefix, limit))
+            for row in db.fetchall():
+                record, exact = row[:-1], bool(row[-1])
+                ranked[record[0]] = ((2 if exact else 1), 0.0, record)
+            
+            if len(term) >= self.config.fulltext_min_token:
+                db.execute(f"""SELECT {select}, MATCH(DriverName, Charge) AGAINST (%s) AS relevance
+                               FROM traffic_violations
+                               WHERE MATCH(DriverName, Charge) AGAINST (%s)
+                               ORDER BY relevance DESC LIMIT %s""", (term, term, limit))
+                for row in db.fetchall():
+                    record, relevance = row[:-1], float(row[-1])
+                    if record[0] not in ranked:
+                        ranked[record[0]] = (0, relevance, record)
+        
+        results = sorted(ranked.values(), key=lambda item: (-item[0], -item[1], item[2][0]))
+        return make_rows((record for _, _, record in results[:limit]), columns)
+    
+    def iter_rows(self, search_term=None, batch_size=None, columns=None, sort=None, filters=None):
+        # Yields lists of at most batch_size rows, in the grid's order. The listing takes
+        # sort and filters like get_page, and its cursor is unbuffered, so rows stream from
+        # the server as they are fetched instead of being materialized client side. A search
+        # returns what the grid shows: the capped results of search(), without the filters,
+        # ranked unless a sort is given.
+        batch_size = batch_size or self.config.export_batch_size
+        term = search_term.strip() if search_term else ""
+        try:
+            query = ViolationQuery(columns, sort, None if term else filters)
+            sql, params, _ = query.select()
+        except ValueError as e:
+            raise FilterError(str(e)) from e
+        if term:
+            rows = self._search(search_term, columns)
+            if sort is not None:
+                # The same order as TableFrame.sort_loaded: NULLs first, ties keep their rank
+                index = query.columns.index(query.sort_label)
+                rows = sorted(rows, reverse=query.descending,
+                              key=lambda row: (row[index] is not None, row[index]))
+            for start in range(0, len(rows), batch_size):
+                yield rows[start:start + batch_size]
+            return
+        
+        with DatabaseConnection(read_only=True) as db:
+            db.execute(sql, params)
+            while True:
+                rows = db.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield make_rows(rows, columns)
+    
+    def aggregate(self, group_by, filters=None):
+        # GROUP BY runs in MySQL, so only one row per group crosses the wire. Rows are
+        # (group values..., count, total penalty, average penalty), largest groups first.
+        # Raises on error, like the other background-only reads.
+        if not group_by:
+            raise ValueError("Choose at least one column to group by")
+        for label in group_by:
+            if label not in FIELDS_BY_LABEL:
+                raise ValueError(f"Unknown column: {label}")
+        group_columns = ", ".join(FIELDS_BY_LABEL[label].column for label in group_by)
+        clauses, params = ViolationQuery(filters=filters).filter_clauses()
+        
+        sql = (f"SELECT {group_columns}, COUNT(*), SUM(PenaltyAmount), AVG(PenaltyAmount) "
+               f"FROM traffic_violations")
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" GROUP BY {group_columns} ORDER BY COUNT(*) DESC, {group_columns}"
+        with DatabaseConnection(read_only=True) as db:
+            db.execute(sql, params)
+            return db.fetchall()
+    
+    def rollup_aggregate(self, group_by):
+        # Same row shape as aggregate(), read from the trigger-maintained rollup table, so
+        # the cost depends on the number of groups rather than the number of violations
+        for label in group_by:
+            if label not in self.ROLLUP_DIMENSIONS:
+                raise ValueError(f"{label} is not in the rollup")
+        group_columns = ", ".join(FIELDS_BY_LABEL[label].column for label in group_by)
+        keys = ", ".join(f"NULLIF({FIELDS_BY_LABEL[label].column}, '')" for label in group_by)
+        with DatabaseConnection(read_only=True) as db:
+            db.execute(f"""SELECT {keys}, SUM(violation_count), SUM(penalty_total),
+                                  SUM(penalty_total) / NULLIF(SUM(penalty_count), 0)
+                           FROM violation_rollup_state_type WHERE violation_count > 0
+                           GROUP BY {group_columns}
+                           ORDER BY SUM(violation_count) DESC, {group_columns}""")
+            return db.fetchall()
+    
+    def rebuild_rollups(self):
+        # Recomputes the rollup from scratch in one transaction. INSERT ... SELECT share-locks
+        # the rows it reads, so writers wait for it rather than slipping between the two steps.
+        with DatabaseConnection() as db:
+            db.execute("DELETE FROM violation_rollup_state_type")
+            db.execute(self.ROLLUP_REBUILD_QUERY)
+            return db.cursor.rowcount
+    
+    def rollup_differences(self):
+        # Compares the rollup with a live GROUP BY. Returns (state, violation type, expected,
+        # actual) for each group that disagrees; expected/actual are (count, penalty count,
+        # penalty total). An empty list means the rollup is consistent.
+        with DatabaseConnection() as db:
+            db.execute("""SELECT COALESCE(State, ''), COALESCE(Violation_Type, ''), COUNT(*),
+                                 COUNT(PenaltyAmount), COALESCE(SUM(PenaltyAmount), 0)
+                          FROM traffic_violations
+                          GROUP BY COALESCE(State, ''), COALESCE(Violation_Type, '')""")
+            expected = {row[:2]: self._rollup_totals(row[2:]) for row in db.fetchall()}
+            db.execute("""SELECT State, Violation_Type, violation_count, penalty_count, penalty_total
+                          FROM violation_rollup_state_type""")
+            actual = {row[:2]: self._rollup_totals(row[2:]) for row in db.fetchall()}
+        
+        empty = (0, 0, 0.0)
+        differences = []
+        for key in sorted(set(expected) | set(actual)):
+            if expected.get(key, empty) != actual.get(key, empty):
+                differences.append(key + (expected.get(key, empty), actual.get(key, empty)))
+        return differences
+    
+    def _rollup_totals(self, values):
+        count, penalty_count, penalty_total = values
+        return int(count), int(penalty_count), round(float(penalty_total), 2)
+    
+    def get_change_version(self):
+        with DatabaseConnection() as db:
+            db.execute("SELECT COALESCE(MAX(version), 0) FROM traffic_violation_changes")
+            return db.fetchone()[0]
+    
+    def get_changes_since(self, version, limit=None, columns=None):
+        # Collapses the log to one entry per id, then reads the current rows: ids that
+        # still exist are upserts, ids that are gone are tombstones.
+        limit = limit or self.config.change_batch_limit
+        with DatabaseConnection() as db:
+            db.execute("SELECT MIN(version), COALESCE(MAX(version), 0) FROM traffic_violation_changes")
+            oldest, latest = db.fetchone()
+            if oldest is not None and version + 1 < oldest:
+                # Entries after version were pruned, deletes among them
+                return ChangeSet(latest, [], [], False, expired=True)
+            db.execute("""SELECT violation_id, MAX(version) AS last_version
+                          FROM traffic_violation_changes WHERE version > %s
+                          GROUP BY violation_id ORDER BY last_version LIMIT %s""", (version, limit))
+            changes = db.fetchall()
+            if not changes:
+                return ChangeSet(version, [], [], False)
+            
+            changed_ids = [change[0] for change in changes]
+            placeholders = ", ".join(["%s"] * len(changed_ids))
+            db.execute(f"SELECT {select_list(columns)} FROM traffic_violations "
+                       f"WHERE id IN ({placeholders}) ORDER BY id", changed_ids)
+            rows = make_rows(db.fetchall(), columns)
+        
+        existing = {row[0] for row in rows}
+        deleted_ids = [record_id for record_id in changed_ids if record_id not in existing]
+        return ChangeSet(changes[-1][1], rows, deleted_ids, len(changes) >= limit)
+    
+    def prune_changes(self, retention_days=None):
+        # Deletes change-log entries older than the retention window. The newest entry is
+        # always kept, so the log's version never goes back; a station that was further
+        # behind gets an expired ChangeSet and reloads.
+        if retention_days is None:
+            retention_days = self.config.change_log_retention_days
+        with DatabaseConnection() as db:
+            db.execute("SELECT MAX(version) FROM traffic_violation_changes")
+            latest = db.fetchone()[0]
+            if latest is None:
+                return 0
+            db.execute(f"DELETE FROM traffic_violation_changes "
+                       f"WHERE version < %s AND changed_at < {self.backend.seconds_ago}",
+                       (latest, int(retention_days * 86400)))
+            return max(db.cursor.rowcount, 0)
+    
+    def create(self, data):
+        # Returns the stored row (read back in the same transaction) so callers can patch
+        # their view of the table without reloading it
+        try:
+            with DatabaseConnection() as db:
+                return self._insert(db, data)
+        except Error as e:
+            raise DataAccessError("Failed to add record", e) from e
+    
+    def bulk_insert(self, rows):
+        # One transaction and one executemany round trip per call. The driver's Error is
+        # raised as is so bulk jobs can decide what to do with a failed batch by errno.
+        with DatabaseConnection() as db:
+            db.executemany(self.insert_query, [self.write_values(row) for row in rows])
+            return len(rows)
+    
+    def load_data_file(self, path):
+        # Fast path for pre-validated CSV written in write_columns order with a header row.
+        # Needs local_infile enabled on the server and AppConfig.db_allow_local_infile.
+        if not self.backend.supports_load_data:
+            raise Error(f"LOAD DATA is not available on the {self.backend.name} backend")
+        with DatabaseConnection() as db:
+            db.execute(f"""LOAD DATA LOCAL INFILE %s INTO TABLE traffic_violations
+                           CHARACTER SET utf8mb4
+                           FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"' ESCAPED BY ''
+                           LINES TERMINATED BY '\\n' IGNORE 1 LINES
+                           ({', '.join(self.write_columns)})""", (path,))
+            return db.cursor.rowcount
+    
+    def update(self, record_id, data):
+        try:
+            with DatabaseConnection() as db:
+                return self._update(db, record_id, data)
+        except Error as e:
+            raise DataAccessError("Failed to update record", e) from e
+    
+    def get_by_id_with_version(self, record_id):
+        # A database without migration 003 has no row_version: the record comes back with
+        # version None and is saved without the check
+        try:
+            with DatabaseConnection() as db:
+                try:
+                    return self._fetch_with_version(db, record_id)
+                except Error as e:
+                    if e.errno != 1054:
+                        raise
+                return self._fetch_by_id(db, record_id), None
+        except Error as e:
+            raise DataAccessError("Failed to fetch record", e) from e
+    
+    def update_fields(self, record_id, changes, expected_version=None):
+        # Partial update: only the columns in changes ({label: value}) are written. With an
+        # expected_version the row must not have changed since it was read; otherwise a
+        # ConcurrencyConflictError carrying the current row is raised.
+        for label in changes:
+            if label not in FIELDS_BY_LABEL or not FIELDS_BY_LABEL[label].editable:
+                raise ValueError(f"Not an editable column: {label}")
+        try:
+            with DatabaseConnection() as db:
+                if not changes:
+                    return self._fetch_by_id(db, record_id)
+                return self._update_fields(db, record_id, changes, expected_version)
+        except Error as e:
+            raise DataAccessError("Failed to update record", e) from e
+    
+    def delete_many(self, record_ids):
+        # One transaction for the whole batch, with ids sent in chunks so no single IN list
+        # gets unwieldy. Ids that no longer exist are reported as failed. Raises on error,
+        # in which case nothing was deleted.
+        result = BatchResult()
+        record_ids = list(dict.fromkeys(int(record_id) for record_id in record_ids))
+        with DatabaseConnection() as db:
+            for chunk in self._chunks(record_ids):
+                placeholders = ", ".join(["%s"] * len(chunk))
+                db.execute(f"SELECT id FROM traffic_violations WHERE id IN ({placeholders}) FOR UPDATE",
+                           chunk)
+                existing = {row[0] for row in db.fetchall()}
+                if existing:
+                    db.execute(f"DELETE FROM traffic_violations WHERE id IN ({placeholders})", chunk)
+                self._record_outcomes(result, chunk, existing)
+        return result
+    
+    def update_many(self, record_ids, changes):
+        # Writes the same {label: value} changes to every id in one transaction and reads
+        # the stored rows back. Same chunking, reporting and error handling as delete_many.
+        for label in changes:
+            if label not in FIELDS_BY_LABEL or not FIELDS_BY_LABEL[label].editable:
+                raise ValueError(f"Not an editable column: {label}")
+        if not changes:
+            raise ValueError("No changes to apply")
+        
+        result = BatchResult()
+        record_ids = list(dict.fromkeys(int(record_id) for record_id in record_ids))
+        assignments = ", ".join(f"{FIELDS_BY_LABEL[label].column}=%s" for label in changes)
+        with DatabaseConnection() as db:
+            for chunk in self._chunks(record_ids):
+                placeholders = ", ".join(["%s"] * len(chunk))
+                if self.hashing:
+                    # Each row gets its own hash, so one executemany of per-row updates
+                    db.execute(f"SELECT {select_list()} FROM traffic_violations "
+                               f"WHERE id IN ({placeholders}) FOR UPDATE", chunk)
+                    db.executemany(f"UPDATE traffic_violations SET {assignments}, content_hash=%s WHERE id=%s",
+                                   [list(changes.values()) + [content_hash(self._merged(row, changes)), row[0]]
+                                    for row in make_rows(db.fetchall())])
+                else:
+                    db.execute(f"UPDATE traffic_violations SET {assignments} WHERE id IN ({placeholders})",
+                               list(changes.values()) + chunk)
+                db.execute(f"SELECT {select_list()} FROM traffic_violations "
+                           f"WHERE id IN ({placeholders}) ORDER BY id", chunk)
+                rows = make_rows(db.fetchall())
+                result.rows.extend(rows)
+                self._record_outcomes(result, chunk, {row[0] for row in rows})
+        return result
+    
+    def apply_writes(self, writes, forget_keys=()):
+        # Applies write-behind journal entries (journal.PendingWrite) in order, in one
+        # transaction, storing each idempotency key with it: an entry already in
+        # applied_writes was committed before and is skipped. forget_keys are keys the
+        # journal has cleared since, so they no longer need keeping. Returns
+        # {key: stored row, or the id for a delete} for the entries applied now.
+        results = {}
+        try:
+            with DatabaseConnection() as db:
+                keys = [write.key for write in writes]
+                placeholders = ", ".join(["%s"] * len(keys))
+                db.execute(f"SELECT idempotency_key FROM applied_writes "
+                           f"WHERE idempotency_key IN ({placeholders})", keys)
+                applied = {row[0] for row in db.fetchall()}
+                for write in writes:
+                    if write.key not in applied:
+                        results[write.key] = self._apply_write(db, write)
+                if results:
+                    db.executemany("INSERT INTO applied_writes (idempotency_key) VALUES (%s)",
+                                   [(key,) for key in results])
+                for chunk in self._chunks(list(forget_keys)):
+                    db.execute(f"DELETE FROM applied_writes WHERE idempotency_key IN "
+                               f"({', '.join(['%s'] * len(chunk))})", chunk)
+        except Error as e:
+            raise DataAccessError("Failed to apply queued changes", e) from e
+        return results
+    
+    def _apply_write(self, db, write):
+        if write.operation == "create":
+            return self._insert(db, write.payload["values"])
+        if write.operation == "update":
+            return self._update(db, write.record_id, write.payload["values"])
+        if write.operation == "update_fields":
+            return self._update_fields(db, write.record_id, write.payload["changes"],
+                                       write.payload.get("expected_version"))
+        if write.operation == "delete":
+            # Already gone counts as done: the goal of the delete is met
+            db.execute("DELETE FROM traffic_violations WHERE id=%s", (write.record_id,))
+            return write.record_id
+        raise ValueError(f"Unknown queued operation: {write.operation}")
+    
+    def existing_hashes(self, hashes):
+        # The subset of the given content hashes already stored, in chunked IN lists
+        hashes = list(dict.fromkeys(hashes))
+        found = set()
+        with DatabaseConnection() as db:
+            for chunk in self._chunks(hashes):
+                placeholders = ", ".join(["%s"] * len(chunk))
+                db.execute(f"SELECT content_hash FROM traffic_violations "
+                           f"WHERE content_hash IN ({placeholders})", chunk)
+                found.update(row[0] for row in db.fetchall())
+        return found
+    
+    def backfill_content_hashes(self, batch_size=None):
+        # Hashes rows written before migration 006 (or with hashing off), a keyset batch per
+        # transaction. A row whose hash another row already has is left NULL and its id
+        # returned with the id it duplicates, for the duplicates window to resolve.
+        batch_size = batch_size or self.config.batch_chunk_size
+        updated, duplicates, last_id = 0, {}, 0
+        while True:
+            with DatabaseConnection() as db:
+                db.execute(f"SELECT {select_list()} FROM traffic_violations "
+                           f"WHERE content_hash IS NULL AND id > %s ORDER BY id LIMIT %s",
+                           (last_id, batch_size))
+                rows = db.fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                hashed = {}
+                for row in rows:
+                    hashed.setdefault(content_hash(row[1:]), []).append(row[0])
+                placeholders = ", ".join(["%s"] * len(hashed))
+                db.execute(f"SELECT content_hash, id FROM traffic_violations "
+                           f"WHERE content_hash IN ({placeholders})", list(hashed))
+                stored = dict(db.fetchall())
+                params = []
+                for value, ids in hashed.items():
+                    keeper = stored.get(value)
+                    if keeper is None:
+                        keeper = ids[0]
+                        params.append((value, keeper))
+                    duplicates.update((record_id, keeper) for record_id in ids if record_id != keeper)
+                if params:
+                    db.executemany("UPDATE traffic_violations SET content_hash=%s WHERE id=%s", params)
+                updated += len(params)
+        return updated, duplicates
+    
+    def near_duplicate_candidates(self, key, columns=None):
+        # Rows in blocks of 2..dedupe_max_block records sharing the blocking key, ordered so
+        # each block is contiguous. One scan: the block size is a window count over the key.
+        # Returns (key values, rows) per block.
+        expressions = self.BLOCKING_KEYS[key]
+        keys = ", ".join(f"{expression} AS k{index}" for index, expression in enumerate(expressions))
+        key_names = ", ".join(f"k{index}" for index in range(len(expressions)))
+        not_blank = " AND ".join(f"{expression} <> ''" for expression in expressions)
+        projection = select_list(columns)
+        try:
+            with DatabaseConnection(read_only=True) as db:
+                db.execute(f"""SELECT {key_names}, {projection}
+                               FROM (SELECT {keys}, {projection},
+                                            COUNT(*) OVER (PARTITION BY {', '.join(expressions)}) AS block_size
+                                     FROM traffic_violations
+                                     WHERE {not_blank}) blocks
+                               WHERE block_size BETWEEN 2 AND %s
+                               ORDER BY {key_names}, id""", (self.config.dedupe_max_block,))
+                rows = db.fetchall()
+        except Error as e:
+            raise DataAccessError("Failed to search for duplicates", e) from e
+        
+        width = len(expressions)
+        blocks = []
+        for row in rows:
+            block_key, record = row[:width], make_row(row[width:], columns)
+            if blocks and blocks[-1][0] == block_key:
+                blocks[-1][1].append(record)
+            else:
+                blocks.append((block_key, [record]))
+        return blocks
+    
+    def write_values(self, data):
+        # Parameters for insert_query: the data fields, plus their hash when hashing is on
+        values = tuple(data)
+        return values + (content_hash(values),) if self.hashing else values
+    
+    def _merged(self, row, changes):
+        # A stored row's data fields with {label: value} changes applied, in EDITABLE_FIELDS order
+        return tuple(changes.get(field.label, value) for field, value in zip(EDITABLE_FIELDS, row[1:]))
+    
+    def _insert(self, db, data):
+        values = self.write_values(data)
+        self._execute_write(db, self.insert_query, values, values)
+        return self._fetch_by_id(db, db.cursor.lastrowid)
+    
+    def _update(self, db, record_id, data):
+        values = self.write_values(data)
+        self._execute_write(db, self.update_query, values + (record_id,), values)
+        row = self._fetch_by_id(db, record_id)
+        if row is None:
+            raise RecordNotFoundError(record_id)
+        return row
+    
+    def _update_fields(self, db, record_id, changes, expected_version=None):
+        assignments = ", ".join(f"{FIELDS_BY_LABEL[label].column}=%s" for label in changes)
+        params = list(changes.values())
+        values = None
+        if self.hashing:
+            # The hash covers the whole record, so the other columns are read first
+            current = self._fetch_by_id(db, record_id, lock=True)
+            if current is not None:
+                values = self.write_values(self._merged(current, changes))
+            assignments += ", content_hash=%s"
+            params.append(values[-1] if values is not None else None)
+        query = f"UPDATE traffic_violations SET {assignments} WHERE id=%s"
+        params.append(record_id)
+        if expected_version is not None:
+            query += " AND row_version=%s"
+            params.append(expected_version)
+        self._execute_write(db, query, params, values)
+        if expected_version is not None and db.cursor.rowcount == 0:
+            current_row, current_version = self._fetch_with_version(db, record_id)
+            if current_row is not None:
+                raise ConcurrencyConflictError(record_id, current_row, current_version)
+        row = self._fetch_by_id(db, record_id)
+        if row is None:
+            raise RecordNotFoundError(record_id)
+        return row
+    
+    def _execute_write(self, db, query, params, values):
+        # values: the record as written (write_values), to name the record it duplicates
+        try:
+            db.execute(query, params)
+        except Error as e:
+            if values is not None:
+                self._raise_if_duplicate(db, e, values)
+            raise
+    
+    def _raise_if_duplicate(self, db, error, values):
+        # errno 1062 on the content hash index: report which record it duplicates. The
+        # failed statement was rolled back on its own, so the transaction is still usable.
+        if not self.hashing or getattr(error, "errno", None) != 1062:
+            return
+        db.execute("SELECT id FROM traffic_violations WHERE content_hash=%s", (values[-1],))
+        row = db.fetchone()
+        raise DuplicateRecordError(row[0] if row else None) from error
+    
+    def _chunks(self, record_ids):
+        size = self.config.batch_chunk_size
+        for start in range(0, len(record_ids), size):
+            yield record_ids[start:start + size]
+    
+    def _record_outcomes(self, result, chunk, existing):
+        for record_id in chunk:
+            if record_id in existing:
+                result.succeeded.append(record_id)
+            else:
+                result.failed[record_id] = "record no longer exists"
+    
+    def _fetch_with_version(self, db, record_id):
+        db.execute(f"SELECT {select_list()}, row_version FROM traffic_violations WHERE id=%s", (record_id,))
+        row = db.fetchone()
+        if row is None:
+            return None, None
+        return make_row(row[:-1]), row[-1]
+    
+    def _fetch_by_id(self, db, record_id, columns=None, lock=False):
+        db.execute(f"SELECT {select_list(columns)} FROM traffic_violations WHERE id=%s"
+                   f"{' FOR UPDATE' if lock else ''}", (record_id,))
+        return make_row(db.fetchone(), columns)
+    
+    def delete(self, record_id):
+        try:
+            with DatabaseConnection() as db:
+                db.execute("DELETE FROM traffic_violations WHERE id=%s", (record_id,))
+                return True
+        except Error as e:
+            raise DataAccessError("Failed to delete record", e) from e
@@ -0,0 +1,84 @@
+from difflib import SequenceMatcher
+from config import AppConfig
+from database import TrafficViolationRepository
+from models import EDITABLE_FIELDS, normalize_value
+
+
+class DuplicateGroup:
+    # Records judged to be the same ticket; score is the weakest link that joined them
+    
+    def __init__(self, rows, score):
+        self.rows = sorted(rows, key=lambda row: row[0])
+        self.score = score
+    
+    @property
+    def ids(self):
+        return [row[0] for row in self.rows]
+
+
+class DuplicateFinder:
+    # Near-duplicate search. The database does the blocking (records sharing a normalized
+    # plate, or driver and charge), so only pairs inside a block are scored here instead of
+    # every pair in the table. A pair scores on plate and name similarity plus the share of
+    # the other fields that match; pairs over dedupe_threshold are joined into groups.
+    PLATE_WEIGHT = 0.35
+    NAME_WEIGHT = 0.35
+    OTHER_WEIGHT = 0.3
+    
+    def __init__(self, repository=None, threshold=None):
+        self.config = AppConfig()
+        self.repository = repository or TrafficViolationRepository()
+        self.threshold = self.config.dedupe_threshold if threshold is None else threshold
+        self.compared = 0
+    
+    def find(self):
+        parents = {}
+        scores = {}
+        rows_by_id = {}
+        self.compared = 0
+        for key in self.repository.BLOCKING_KEYS:
+            for _, rows in self.repository.near_duplicate_candidates(key):
+                normalized = [self._normalize(row) for row in rows]
+                for i in range(len(rows)):
+                    for j in range(i + 1, len(rows)):
+                        self.compared += 1
+                        score = self.score(normalized[i], normalized[j])
+                        if score >= self.threshold:
+                            rows_by_id[rows[i][0]] = rows[i]
+                            rows_by_id[rows[j][0]] = rows[j]
+                            self._union(parents, scores, rows[i][0], rows[j][0], score)
+        
+        groups = {}
+        for record_id in rows_by_id:
+            groups.setdefault(self._root(parents, record_id), []).append(rows_by_id[record_id])
+        return sorted((DuplicateGroup(rows, scores[root]) for root, rows in groups.items()),
+                      key=lambda group: (-group.score, group.ids[0]))
+    
+    def score(self, first, second):
+        # first/second: normalized data fields (EDITABLE_FIELDS order). 1.0 means equal.
+        others = list(zip(first[2:], second[2:]))
+        base = self.OTHER_WEIGHT * sum(1 for a, b in others if a == b) / len(others)
+        plate = SequenceMatcher(None, first[0], second[0])
+        name = SequenceMatcher(None, first[1], second[1])
+        # quick_ratio() is a cheap upper bound on ratio(): a pair that can't reach the
+        # threshold even with it skips the full comparison
+        bound = base + self.PLATE_WEIGHT * plate.quick_ratio() + self.NAME_WEIGHT * name.quick_ratio()
+        if bound < self.threshold:
+            return bound
+        return base + self.PLATE_WEIGHT * plate.ratio() + self.NAME_WEIGHT * name.ratio()
+    
+    def _normalize(self, row):
+        return [normalize_value(field, value) for field, value in zip(EDITABLE_FIELDS, row[1:])]
+    
+    def _root(self, parents, record_id):
+        while parents.get(record_id, record_id) != record_id:
+            parents[record_id] = parents.get(parents[record_id], parents[record_id])
+            record_id = parents[record_id]
+        return record_id
+    
+    def _union(self, parents, scores, first, second, score):
+        first_root, second_root = self._root(parents, first), self._root(parents, second)
+        score = min(score, scores.get(first_root, 1.0), scores.get(second_root, 1.0))
+        if first_root != second_root:
+            parents[second_root] = first_root
+        scores[first_root] = score
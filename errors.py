@@ -0,0 +1,77 @@
+from backends import Error
+
+
+class AppError(Exception):
+    # Raised by the repository and service layers instead of showing anything; the UI
+    # decides how to present it. title is the heading a notification uses.
+    title = "Error"
+    
+    def __init__(self, message, cause=None):
+        super().__init__(message)
+        self.message = message
+        self.cause = cause
+
+
+class DataAccessError(AppError):
+    # A database failure, with the driver's errno (MySQL codes on every backend) kept
+    title = "Database Error"
+    
+    def __init__(self, message, cause=None):
+        super().__init__(f"{message}:\n{cause}" if cause is not None else message, cause)
+        self.errno = getattr(cause, "errno", None)
+
+
+class RecordNotFoundError(AppError):
+    title = "Record Not Found"
+    
+    def __init__(self, record_id):
+        super().__init__(f"Record {record_id} no longer exists.")
+        self.record_id = record_id
+
+
+class ValidationError(AppError, ValueError):
+    # Carries every problem found, not just the first; still a ValueError for older callers
+    title = "Validation Error"
+    
+    def __init__(self, errors, fields=()):
+        errors = [errors] if isinstance(errors, str) else list(errors)
+        super().__init__("\n".join(errors))
+        self.errors = errors
+        self.fields = list(fields)  # labels of the offending fields, when known
+
+
+class FilterError(ValidationError):
+    title = "Filter Error"
+
+
+class ConcurrencyConflictError(AppError):
+    title = "Edit Conflict"
+    
+    def __init__(self, record_id, current_row, current_version):
+        super().__init__(f"Record {record_id} was changed by someone else")
+        self.record_id = record_id
+        self.current_row = current_row
+        self.current_version = current_version
+
+
+class DuplicateRecordError(AppError):
+    # The record's content hash matches a stored record (errno 1062 on the unique index)
+    title = "Duplicate Record"
+    
+    def __init__(self, existing_id=None):
+        where = f" (record {existing_id})" if existing_id is not None else ""
+        super().__init__(f"An identical record already exists{where}.")
+        self.existing_id = existing_id
+
+
+def describe(error, context=None):
+    # (title, message) for any exception, for notifications and logs
+    if isinstance(error, AppError):
+        title, message = error.title, error.message
+    elif isinstance(error, Error):
+        title, message = "Database Error", str(error)
+    else:
+        title, message = "Error", str(error) or type(error).__name__
+    if context:
+        message = f"{context}:\n{message}"
+    return title, message
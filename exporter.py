@@ -0,0 +1,112 @@
+import csv
+import os
+import time
+from config import AppConfig
+from database import TrafficViolationRepository
+
+
+class ExportReport:
+
+    def __init__(self, path, file_format):
+        self.path = path
+        self.file_format = file_format
+        self.rows_written = 0
+        self.started_at = time.monotonic()
+        self.finished_at = None
+    
+    @property
+    def elapsed(self):
+        return (self.finished_at or time.monotonic()) - self.started_at
+    
+    @property
+    def rows_per_second(self):
+        return self.rows_written / self.elapsed if self.elapsed > 0 else 0.0
+    
+    def finish(self):
+        self.finished_at = time.monotonic()
+    
+    def summary(self):
+        return (f"{self.rows_written} rows written to {self.path} "
+                f"in {self.elapsed:.1f}s ({self.rows_per_second:.0f} rows/s)")
+
+
+class ViolationExporter:
+    FORMATS = ("csv", "parquet")
+    
+    def __init__(self, repository=None, batch_size=None, progress_callback=None):
+        self.config = AppConfig()
+        self.repository = repository or TrafficViolationRepository()
+        self.batch_size = batch_size or self.config.export_batch_size
+        self.progress_callback = progress_callback
+    
+    def export(self, path, search_term=None, file_format=None, sort=None, filters=None):
+        file_format = file_format or self.detect_format(path)
+        if file_format not in self.FORMATS:
+            raise ValueError(f"Unsupported export format: {file_format}")
+        
+        report = ExportReport(path, file_format)
+        batches = self.repository.iter_rows(search_term=search_term, batch_size=self.batch_size,
+                                            sort=sort, filters=filters)
+        if file_format == "parquet":
+            self._write_parquet(path, batches, report)
+        else:
+            self._write_csv(path, batches, report)
+        report.finish()
+        return report
+    
+    def detect_format(self, path):
+        extension = os.path.splitext(path)[1].lower()
+        return "parquet" if extension in (".parquet", ".pq") else "csv"
+    
+    def _write_csv(self, path, batches, report):
+        with open(path, "w", newline="", encoding="utf-8") as target:
+            writer = csv.writer(target)
+            writer.writerow(self.config.columns)
+            for rows in batches:
+                writer.writerows(rows)
+                self._advance(report, len(rows))
+    
+    def _write_parquet(self, path, batches, report):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+        
+        # A fixed schema keeps every row group identical even when a batch has all-NULL columns
+        converters = [self._converter(label) for label in self.config.columns]
+        schema = pa.schema([(label, arrow_type(pa)) for label, (arrow_type, _) in
+                            zip(self.config.columns, converters)])
+        with pq.ParquetWriter(path, schema) as writer:
+            for rows in batches:
+                columns = [pa.array([convert(row[index]) for row in rows], type=schema.field(index).type)
+                           for index, (_, convert) in enumerate(converters)]
+                writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+                self._advance(report, len(rows))
+    
+    def _converter(self, label):
+        if label == "ID" or label in self.config.int_fields:
+            return (lambda pa: pa.int64()), self._to_int
+        if label in self.config.numeric_fields:
+            return (lambda pa: pa.float64()), self._to_float
+        return (lambda pa: pa.string()), self._to_text
+    
+    def _to_int(self, value):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+    
+    def _to_float(self, value):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+    
+    def _to_text(self, value):
+        return None if value is None else str(value)
+    
+    def _advance(self, report, count):
+        report.rows_written += count
+        if self.progress_callback:
+            self.progress_callback(report)
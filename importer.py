@@ -0,0 +1,192 @@
+import csv
+import json
+import os
+import re
+import tempfile
+import time
+from backends import Error
+from config import AppConfig
+from database import TrafficViolationRepository
+from models import content_hash
+from services import ValidationService
+
+
+def normalize_header(name):
+    # "Plate Number", "PlateNumber" and "plate_number" all map to "platenumber"
+    return re.sub(r"[^a-z0-9]", "", str(name).lower())
+
+
+class ImportReport:
+
+    def __init__(self, error_path=None):
+        self.rows_read = 0
+        self.inserted = 0
+        self.rejected = 0
+        self.error_path = error_path
+        self.started_at = time.monotonic()
+        self.finished_at = None
+    
+    @property
+    def elapsed(self):
+        return (self.finished_at or time.monotonic()) - self.started_at
+    
+    @property
+    def rows_per_second(self):
+        return self.rows_read / self.elapsed if self.elapsed > 0 else 0.0
+    
+    def finish(self):
+        self.finished_at = time.monotonic()
+    
+    def summary(self):
+        return (f"{self.rows_read} read, {self.inserted} inserted, {self.rejected} rejected "
+                f"in {self.elapsed:.1f}s ({self.rows_per_second:.0f} rows/s)")
+
+
+class BulkImporter:
+
+    def __init__(self, repository=None, batch_size=None, use_load_data=False, progress_callback=None):
+        self.config = AppConfig()
+        self.repository = repository or TrafficViolationRepository()
+        self.validator = ValidationService()
+        self.batch_size = batch_size or self.config.import_batch_size
+        # LOAD DATA is MySQL-only; other backends always use executemany
+        self.use_load_data = use_load_data and self.repository.backend.supports_load_data
+        self.progress_callback = progress_callback
+        self._seen_hashes = set()
+        
+        self.labels = list(self.config.columns[1:])
+        self.header_map = {}
+        for label, column in zip(self.labels, self.repository.INSERT_COLUMNS):
+            self.header_map[normalize_header(label)] = label
+            self.header_map[normalize_header(column)] = label
+    
+    def import_file(self, path, error_path=None, file_format=None):
+        file_format = file_format or self.detect_format(path)
+        error_path = error_path or f"{os.path.splitext(path)[0]}.rejected.csv"
+        report = ImportReport(error_path)
+        self._seen_hashes = set()
+        
+        with open(error_path, "w", newline="", encoding="utf-8") as error_file:
+            rejects = csv.writer(error_file)
+            rejects.writerow(["Line", "Error"] + self.labels)
+            
+            for batch in self._read_batches(path, file_format):
+                mapped = []
+                for line_number, record in batch:
+                    report.rows_read += 1
+                    if isinstance(record, Exception):
+                        self._reject(report, rejects, line_number, str(record), ())
+                    else:
+                        mapped.append((line_number, self.map_record(record)))
+                
+                # The whole batch is validated in one pass, a column at a time
+                problems = self.validator.validate_batch([values for _, values in mapped], self.labels)
+                valid = []
+                for (line_number, values), row_problems in zip(mapped, problems):
+                    if row_problems:
+                        self._reject(report, rejects, line_number, "; ".join(row_problems), values)
+                    else:
+                        valid.append((line_number, values))
+                
+                if valid and self.repository.hashing:
+                    valid = self._drop_duplicates(valid, report, rejects)
+                if valid:
+                    self._insert_batch(valid, report, rejects)
+                if self.progress_callback:
+                    self.progress_callback(report)
+        
+        report.finish()
+        if not report.rejected:
+            os.remove(error_path)
+            report.error_path = None
+        return report
+    
+    def detect_format(self, path):
+        extension = os.path.splitext(path)[1].lower()
+        if extension in (".jsonl", ".ndjson", ".json"):
+            return "jsonl"
+        return "csv"
+    
+    def map_record(self, record):
+        # Onto AppConfig.columns order; unknown keys (including ID) are ignored
+        mapped = {}
+        for key, value in record.items():
+            label = self.header_map.get(normalize_header(key))
+            if label is not None:
+                mapped[label] = "" if value is None else str(value).strip()
+        return tuple(mapped.get(label, "") for label in self.labels)
+    
+    def _read_batches(self, path, file_format):
+        batch = []
+        for line_number, record in self._read_records(path, file_format):
+            batch.append((line_number, record))
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
+    def _read_records(self, path, file_format):
+        with open(path, newline="", encoding="utf-8-sig") as source:
+            if file_format == "jsonl":
+                for line_number, line in enumerate(source, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                        if not isinstance(record, dict):
+                            raise ValueError("Expected a JSON object per line")
+                    except ValueError as e:
+                        record = e
+                    yield line_number, record
+            else:
+                reader = csv.DictReader(source)
+                for record in reader:
+                    yield reader.line_num, record
+    
+    def _drop_duplicates(self, valid, report, rejects):
+        # Rows repeating an earlier row of the file or a stored record are rejected up front
+        # (one hash lookup per batch) rather than failing the batch on the unique index
+        hashes = [content_hash(values) for _, values in valid]
+        existing = self.repository.existing_hashes(hashes)
+        unique = []
+        for (line_number, values), value_hash in zip(valid, hashes):
+            if value_hash in existing or value_hash in self._seen_hashes:
+                self._reject(report, rejects, line_number, "duplicate of existing record", values)
+            else:
+                self._seen_hashes.add(value_hash)
+                unique.append((line_number, values))
+        return unique
+    
+    def _insert_batch(self, valid, report, rejects):
+        rows = [values for _, values in valid]
+        try:
+            if self.use_load_data:
+                self._load_data(rows)
+            else:
+                self.repository.bulk_insert(rows)
+            report.inserted += len(rows)
+        except Error:
+            # The batch was rolled back; retry row by row so one bad value
+            # only rejects its own row
+            for line_number, values in valid:
+                try:
+                    self.repository.bulk_insert([values])
+                    report.inserted += 1
+                except Error as e:
+                    self._reject(report, rejects, line_number, str(e), values)
+    
+    def _load_data(self, rows):
+        handle, temp_path = tempfile.mkstemp(suffix=".csv")
+        try:
+            with os.fdopen(handle, "w", newline="", encoding="utf-8") as temp_file:
+                writer = csv.writer(temp_file, lineterminator="\n")
+                writer.writerow(self.repository.write_columns)
+                writer.writerows(self.repository.write_values(row) for row in rows)
+            self.repository.load_data_file(temp_path)
+        finally:
+            os.remove(temp_path)
+    
+    def _reject(self, report, rejects, line_number, error, values):
+        report.rejected += 1
+        rejects.writerow([line_number, error] + list(values))
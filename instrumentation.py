@@ -0,0 +1,195 @@
+import json
+import re
+import threading
+import time
+from collections import deque
+from config import AppConfig
+
+
+# Upper bounds in milliseconds; the last bucket takes everything slower
+HISTOGRAM_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float("inf"))
+
+WHITESPACE = re.compile(r"\s+")
+IN_LIST = re.compile(r"IN \((?:%s, )+%s\)")
+
+
+def fingerprint(query):
+    # One key per statement shape: whitespace collapsed and IN lists of any length folded
+    return IN_LIST.sub("IN (...)", WHITESPACE.sub(" ", query).strip())
+
+
+def redact(params):
+    # Plates and names are personal data, so strings only show their length; numbers
+    # (ids, years, limits) are kept since they explain most plans
+    if not params:
+        return []
+    redacted = []
+    for value in params:
+        if value is None or isinstance(value, (int, float)):
+            redacted.append(value)
+        else:
+            redacted.append(f"<{type(value).__name__} len={len(str(value))}>")
+    return redacted
+
+
+class LatencyHistogram:
+
+    def __init__(self):
+        self.counts = [0] * len(HISTOGRAM_BUCKETS)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+    
+    def add(self, elapsed_ms):
+        for index, bound in enumerate(HISTOGRAM_BUCKETS):
+            if elapsed_ms <= bound:
+                self.counts[index] += 1
+                break
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+    
+    def percentile(self, fraction):
+        # Upper bound of the bucket holding that fraction of samples (max for the last one)
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(HISTOGRAM_BUCKETS, self.counts):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max_ms)
+        return self.max_ms
+    
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 3),
+            "buckets": {("inf" if bound == float("inf") else str(bound)): count
+                        for bound, count in zip(HISTOGRAM_BUCKETS, self.counts)},
+        }
+
+
+class QueryRecord:
+    __slots__ = ("started_at", "statement", "params", "rows", "acquire_ms", "execute_ms",
+                 "fetch_ms", "error", "plan")
+    
+    def __init__(self, statement, params, acquire_ms):
+        self.started_at = time.time()
+        self.statement = statement
+        self.params = params
+        self.rows = 0
+        self.acquire_ms = acquire_ms
+        self.execute_ms = 0.0
+        self.fetch_ms = 0.0
+        self.error = None
+        self.plan = None
+    
+    @property
+    def total_ms(self):
+        return self.execute_ms + self.fetch_ms
+    
+    def to_dict(self):
+        return {
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started_at)),
+            "statement": self.statement,
+            "params": self.params,
+            "rows": self.rows,
+            "acquire_ms": round(self.acquire_ms, 3),
+            "execute_ms": round(self.execute_ms, 3),
+            "fetch_ms": round(self.fetch_ms, 3),
+            "error": self.error,
+            "plan": self.plan,
+        }
+
+
+class QueryMetrics:
+    # Process-wide collector fed by DatabaseConnection: per-statement latency histograms,
+    # recent queries, and slow queries (also appended to slow_query_log_path as JSON lines)
+    _instance = None
+    _instance_lock = threading.Lock()
+    
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance._initialized = False
+        return cls._instance
+    
+    def __init__(self):
+        if self._initialized:
+            return
+        self._initialized = True
+        
+        self.config = AppConfig()
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+            self._acquire = LatencyHistogram()
+            self._recent = deque(maxlen=self.config.query_log_size)
+            self._slow = deque(maxlen=self.config.query_log_size)
+            self._errors = 0
+            self._log_errors = 0
+            self._since = time.time()
+    
+    def record_acquire(self, elapsed_ms):
+        with self._lock:
+            self._acquire.add(elapsed_ms)
+    
+    def record(self, record):
+        # Returns True when the query was slow; the caller logs it with log_slow(), after
+        # attaching an EXPLAIN plan if it wants one
+        slow = record.total_ms >= self.config.slow_query_ms
+        with self._lock:
+            histogram = self._histograms.get(record.statement)
+            if histogram is None:
+                histogram = self._histograms[record.statement] = LatencyHistogram()
+            histogram.add(record.total_ms)
+            self._recent.append(record)
+            if record.error:
+                self._errors += 1
+            if slow:
+                self._slow.append(record)
+        return slow
+    
+    def snapshot(self):
+        with self._lock:
+            operations = sorted(((statement, histogram.to_dict())
+                                 for statement, histogram in self._histograms.items()),
+                                key=lambda item: item[1]["total_ms"], reverse=True)
+            return {
+                "since": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self._since)),
+                "errors": self._errors,
+                "slow_log_errors": self._log_errors,
+                "acquire": self._acquire.to_dict(),
+                "operations": [dict(statement=statement, **stats) for statement, stats in operations],
+                "slow_queries": [record.to_dict() for record in self._slow],
+                "recent_queries": [record.to_dict() for record in self._recent],
+            }
+    
+    def export(self, path, extra=None):
+        data = self.snapshot()
+        data.update(extra or {})
+        with open(path, "w", encoding="utf-8") as target:
+            json.dump(data, target, indent=2, default=str)
+        return path
+    
+    def log_slow(self, record):
+        if not self.config.slow_query_log_path:
+            return
+        # Slow queries are rare by definition, so a plain locked append is enough. A log that
+        # can't be written only loses the entry (it is still in snapshot()), never the query.
+        with self._lock:
+            try:
+                with open(self.config.slow_query_log_path, "a", encoding="utf-8") as log:
+                    log.write(json.dumps(record.to_dict(), default=str) + "\n")
+            except OSError:
+                self._log_errors += 1
@@ -0,0 +1,281 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from backends import Error
+from config import AppConfig
+from database import PoolTimeoutError, ReplicaRouter, TrafficViolationRepository
+from errors import DataAccessError
+
+
+class PendingWrite:
+    # One journaled mutation. payload is JSON: {"values": [...]} for create/update,
+    # {"changes": {label: value}, "expected_version": n} for update_fields, {} for delete.
+    __slots__ = ("seq", "key", "operation", "record_id", "payload", "attempts", "last_error")
+    
+    def __init__(self, seq, key, operation, record_id, payload, attempts=0, last_error=None):
+        self.seq = seq
+        self.key = key
+        self.operation = operation
+        self.record_id = record_id
+        self.payload = payload
+        self.attempts = attempts
+        self.last_error = last_error
+    
+    def describe(self):
+        target = f"record {self.record_id}" if self.record_id is not None else "new record"
+        return f"{self.operation.replace('_', ' ')} of {target}"
+
+
+class WriteJournal:
+    # Durable, ordered queue of mutations in a local SQLite file, separate from the
+    # application database (which may be the MySQL server that can't be reached).
+    # synchronous=FULL: an entry is on disk before the UI is told it was saved.
+    COLUMNS = "seq, idempotency_key, operation, record_id, payload, attempts, last_error"
+    
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=FULL")
+        self.connection.execute("""CREATE TABLE IF NOT EXISTS pending_writes (
+                                       seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                                       idempotency_key TEXT NOT NULL UNIQUE,
+                                       operation TEXT NOT NULL,
+                                       record_id INTEGER,
+                                       payload TEXT NOT NULL,
+                                       attempts INTEGER NOT NULL DEFAULT 0,
+                                       last_error TEXT,
+                                       created_at REAL NOT NULL)""")
+        self.connection.execute("""CREATE TABLE IF NOT EXISTS failed_writes (
+                                       seq INTEGER PRIMARY KEY,
+                                       idempotency_key TEXT NOT NULL,
+                                       operation TEXT NOT NULL,
+                                       record_id INTEGER,
+                                       payload TEXT NOT NULL,
+                                       attempts INTEGER NOT NULL,
+                                       last_error TEXT,
+                                       created_at REAL NOT NULL,
+                                       failed_at REAL NOT NULL)""")
+    
+    def append(self, entries):
+        # entries: [(operation, record_id, payload)], written in one transaction
+        writes = []
+        now = time.time()
+        with self._lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                for operation, record_id, payload in entries:
+                    key = str(uuid.uuid4())
+                    cursor = self.connection.execute(
+                        "INSERT INTO pending_writes (idempotency_key, operation, record_id, payload, "
+                        "created_at) VALUES (?, ?, ?, ?, ?)",
+                        (key, operation, record_id, json.dumps(payload), now))
+                    writes.append(PendingWrite(cursor.lastrowid, key, operation, record_id, payload))
+                self.connection.execute("COMMIT")
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+        return writes
+    
+    def peek(self, limit):
+        # The oldest entries, in the order they were written
+        return self._select(f"SELECT {self.COLUMNS} FROM pending_writes ORDER BY seq LIMIT ?", (limit,))
+    
+    def pending_for(self, record_id):
+        return self._select(f"SELECT {self.COLUMNS} FROM pending_writes WHERE record_id=? ORDER BY seq",
+                            (record_id,))
+    
+    def failed(self, limit=100):
+        return self._select(f"SELECT {self.COLUMNS} FROM failed_writes ORDER BY seq LIMIT ?", (limit,))
+    
+    def remove(self, writes):
+        with self._lock:
+            self.connection.executemany("DELETE FROM pending_writes WHERE seq=?",
+                                        [(write.seq,) for write in writes])
+    
+    def record_attempt(self, write, error):
+        with self._lock:
+            self.connection.execute("UPDATE pending_writes SET attempts=attempts+1, last_error=? WHERE seq=?",
+                                    (str(error), write.seq))
+    
+    def fail(self, write, error):
+        # Moves an entry that can never be applied out of the queue, keeping it for review
+        with self._lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                self.connection.execute(
+                    f"INSERT INTO failed_writes ({self.COLUMNS}, created_at, failed_at) "
+                    f"SELECT seq, idempotency_key, operation, record_id, payload, attempts + 1, ?, "
+                    f"created_at, ? FROM pending_writes WHERE seq=?", (str(error), time.time(), write.seq))
+                self.connection.execute("DELETE FROM pending_writes WHERE seq=?", (write.seq,))
+                self.connection.execute("COMMIT")
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+    
+    def counts(self):
+        with self._lock:
+            return self.connection.execute(
+                "SELECT (SELECT COUNT(*) FROM pending_writes), (SELECT COUNT(*) FROM failed_writes)").fetchone()
+    
+    def _select(self, query, params):
+        with self._lock:
+            rows = self.connection.execute(query, params).fetchall()
+        return [PendingWrite(seq, key, operation, record_id, json.loads(payload), attempts, last_error)
+                for seq, key, operation, record_id, payload, attempts, last_error in rows]
+
+
+class WriteBehindQueue:
+    # Write-behind mode (AppConfig.write_behind_enabled): TrafficViolationService journals
+    # each create/update/delete and returns at once, and one flusher thread applies the
+    # journal in order, a batch per transaction, through TrafficViolationRepository.apply_writes.
+    # An error that may pass (server unreachable, lock timeout) stops the flusher, which
+    # retries with exponential backoff so later entries never overtake the one that failed.
+    # One that can't pass (validation, edit conflict, duplicate, missing record) moves the
+    # entry to failed_writes and the rest carry on.
+    _instance = None
+    _instance_lock = threading.Lock()
+    
+    # The only errors worth waiting out: the server can't be reached or went away, or a
+    # lock wait timed out or deadlocked (plus PoolTimeoutError). Anything else, an unknown
+    # error or a missing table included, would fail the same way on every retry.
+    TRANSIENT_ERRNOS = ReplicaRouter.CONNECTION_ERRNOS | {1205, 1213}
+    
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance._initialized = False
+        return cls._instance
+    
+    def __init__(self):
+        if self._initialized:
+            return
+        self._initialized = True
+        
+        self.config = AppConfig()
+        self.journal = WriteJournal(self.config.write_behind_journal_path)
+        self.repository = TrafficViolationRepository()
+        self.on_applied = None
+        self.last_error = None
+        self._events = deque(maxlen=1000)
+        self._forget_keys = []
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    def start(self, on_applied=None):
+        # on_applied([(write, row or id)]) runs on the flusher thread after each commit
+        with self._lock:
+            if on_applied is not None:
+                self.on_applied = on_applied
+            if self._thread is None:
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+                self._thread.start()
+    
+    def stop(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stopping = True
+        self._wake.set()
+        if thread is not None:
+            thread.join()
+    
+    def enqueue(self, operation, record_id=None, **payload):
+        return self.enqueue_many([(operation, record_id, payload)])[0]
+    
+    def enqueue_many(self, entries):
+        writes = self.journal.append(entries)
+        self._wake.set()
+        return writes
+    
+    def status(self):
+        pending, failed = self.journal.counts()
+        return {"pending": pending, "failed": failed, "error": self.last_error}
+    
+    def pending_changes(self, record_id):
+        # {label: value} of the updates still queued for a record, oldest first, so a form
+        # can show the record as it will be once they are written
+        changes = {}
+        for write in self.journal.pending_for(record_id):
+            if write.operation == "update_fields":
+                changes.update(write.payload["changes"])
+        return changes
+    
+    def has_pending(self, record_id):
+        return bool(self.journal.pending_for(record_id))
+    
+    def take_events(self):
+        # ("applied", write, row or id) and ("failed", write, error) since the last call,
+        # for the UI to patch its view and report what could not be saved
+        events = []
+        while self._events:
+            events.append(self._events.popleft())
+        return events
+    
+    def flush(self):
+        # Applies everything queued on the calling thread and returns how many entries were
+        # applied. Raises the first error that may pass; its entry stays queued.
+        applied = 0
+        with self._flush_lock:
+            while True:
+                writes = self.journal.peek(self.config.write_behind_batch_size)
+                if not writes:
+                    self.last_error = None
+                    return applied
+                try:
+                    done = self._apply(writes)
+                except Exception as e:
+                    if self._is_transient(e):
+                        raise
+                    # Something in the batch can't be applied: one entry at a time finds it
+                    done = []
+                    for write in writes:
+                        try:
+                            done.extend(self._apply([write]))
+                        except Exception as e:
+                            if self._is_transient(e):
+                                raise
+                            self.journal.fail(write, e)
+                            self._events.append(("failed", write, e))
+                applied += len(done)
+    
+    def _apply(self, writes):
+        results = self.repository.apply_writes(writes, self._forget_keys)
+        self.journal.remove(writes)
+        # Committed and cleared locally: the server needn't keep the keys past the next batch
+        self._forget_keys = [write.key for write in writes]
+        done = [(write, results[write.key]) for write in writes if write.key in results]
+        self._events.extend(("applied", write, result) for write, result in done)
+        if done and self.on_applied is not None:
+            self.on_applied(done)
+        return done
+    
+    def _run(self):
+        delay_ms = 0
+        while not self._stopping:
+            try:
+                self.flush()
+                delay_ms = 0
+            except Exception as e:
+                writes = self.journal.peek(1)
+                if writes:
+                    self.journal.record_attempt(writes[0], e)
+                self.last_error = str(e)
+                delay_ms = min(delay_ms * 2 or self.config.write_behind_retry_ms,
+                               self.config.write_behind_max_retry_ms)
+            # Sleeps until the next retry, or until something new is queued
+            self._wake.wait(delay_ms / 1000 if delay_ms else None)
+            self._wake.clear()
+    
+    def _is_transient(self, error):
+        cause = error.cause if isinstance(error, DataAccessError) else error
+        if isinstance(cause, PoolTimeoutError):
+            return True
+        return isinstance(cause, Error) and cause.errno in self.TRANSIENT_ERRNOS
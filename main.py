@@ -1,24 +1,31 @@
-from ui_login import LoginPage
-from tkinter import messagebox
-
-
-class TrafficViolationApplication:
-    
-    def __init__(self):
-        self.current_page = None
-    
-    def start(self):
-        try:
-            self.current_page = LoginPage()
-            self.current_page.run()
-        except Exception as e:
-            messagebox.showerror("Critical Error", f"Application failed to start:\n{e}")
-
-
-def main():
-    app = TrafficViolationApplication()
-    app.start()
-
-
-if __name__ == "__main__":
-    main()
+from startup import StartupProfiler
+
+
+class TrafficViolationApplication:
+    
+    def __init__(self):
+        self.current_page = None
+        self.profiler = StartupProfiler()
+    
+    def start(self):
+        # Imports happen after the profiler starts so the startup report can time them
+        self.profiler.start()
+        try:
+            from ui_login import LoginPage
+            self.profiler.mark("login modules imported")
+            self.current_page = LoginPage()
+            self.current_page.run()
+        except Exception as e:
+            from tkinter import messagebox
+            messagebox.showerror("Critical Error", f"Application failed to start:\n{e}")
+        finally:
+            self.profiler.finish("exited")
+
+
+def main():
+    app = TrafficViolationApplication()
+    app.start()
+
+
+if __name__ == "__main__":
+    main()
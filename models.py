@@ -0,0 +1,114 @@
+import hashlib
+from collections import namedtuple
+from functools import lru_cache
+
+
+class Field:
+    __slots__ = ("label", "column", "attribute", "kind", "editable", "in_grid")
+    
+    def __init__(self, label, column, kind=str, editable=True, in_grid=True):
+        self.label = label
+        self.column = column
+        self.attribute = label.lower().replace(" ", "_")
+        self.kind = kind
+        self.editable = editable
+        self.in_grid = in_grid
+
+
+# The single definition of a traffic violation record. Display labels (AppConfig.columns),
+# SQL column lists and the row types below are all derived from this, in this order.
+FIELDS = (
+    Field("ID", "id", int, editable=False),
+    Field("Plate Number", "PlateNumber"),
+    Field("Driver Name", "DriverName"),
+    Field("Description", "Description", in_grid=False),
+    Field("Belts", "Belts"),
+    Field("Personal Injury", "Personal_Injury"),
+    Field("Property Damage", "Property_Damage"),
+    Field("Commercial License", "Commercial_License"),
+    Field("Commercial Vehicle", "Commercial_Vehicle"),
+    Field("State", "State"),
+    Field("Vehicle Type", "VehicleType"),
+    Field("Year", "Year", int),
+    Field("Make", "Make"),
+    Field("Model", "Model"),
+    Field("Color", "Color"),
+    Field("Charge", "Charge"),
+    Field("Penalty Amount", "PenaltyAmount", float),
+    Field("Contributed To Accident", "Contributed_To_Accident"),
+    Field("Race", "Race"),
+    Field("Gender", "Gender"),
+    Field("Driver City", "Driver_City"),
+    Field("Driver State", "Driver_State"),
+    Field("DL State", "DL_State"),
+    Field("Arrest Type", "Arrest_Type"),
+    Field("Violation Type", "Violation_Type"),
+)
+FIELDS_BY_LABEL = {field.label: field for field in FIELDS}
+EDITABLE_FIELDS = tuple(field for field in FIELDS if field.editable)
+ALL_LABELS = tuple(field.label for field in FIELDS)
+
+
+def normalize_projection(labels=None):
+    # Unknown labels are rejected here, so projections can be put into SQL safely;
+    # ID always comes first because rows are keyed by it
+    if labels is None:
+        return ALL_LABELS
+    for label in labels:
+        if label not in FIELDS_BY_LABEL:
+            raise ValueError(f"Unknown column: {label}")
+    return ("ID",) + tuple(label for label in labels if label != "ID")
+
+
+def select_list(labels=None):
+    return ", ".join(FIELDS_BY_LABEL[label].column for label in normalize_projection(labels))
+
+
+@lru_cache(maxsize=None)
+def _row_type(labels):
+    name = "ViolationRow" if labels == ALL_LABELS else "ViolationRowProjection"
+    return namedtuple(name, [FIELDS_BY_LABEL[label].attribute for label in labels])
+
+
+def row_type(labels=None):
+    # Rows are namedtuples: no per-instance dict, still indexable like the old tuples
+    return _row_type(normalize_projection(labels))
+
+
+def make_rows(rows, labels=None):
+    cls = row_type(labels)
+    return list(map(cls._make, rows))
+
+
+def make_row(row, labels=None):
+    return None if row is None else row_type(labels)._make(row)
+
+
+def project(row, labels):
+    # Narrows a typed row to the given columns (it must include them)
+    labels = normalize_projection(labels)
+    return row_type(labels)._make(getattr(row, FIELDS_BY_LABEL[label].attribute) for label in labels)
+
+
+ViolationRow = row_type()
+
+
+def normalize_value(field, value):
+    # Case, surrounding and repeated spaces, and number formatting ("70" vs 70.0) don't
+    # make two records different
+    if value is None:
+        return ""
+    if field.kind in (int, float):
+        try:
+            number = float(value)
+            return str(int(number)) if number.is_integer() else repr(number)
+        except (TypeError, ValueError):
+            pass
+    return " ".join(str(value).split()).casefold()
+
+
+def content_hash(values):
+    # Hash of a record's data fields (EDITABLE_FIELDS order) after normalization; equal
+    # hashes mean the same ticket entered twice
+    normalized = "\x1f".join(normalize_value(field, value) for field, value in zip(EDITABLE_FIELDS, values))
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
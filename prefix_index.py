@@ -0,0 +1,60 @@
+import threading
+from bisect import bisect_left, insort
+
+
+class PrefixIndex:
+    # Case-insensitive prefix lookup over one column. Entries are (folded value, value, id)
+    # in a sorted list, so a lookup is a bisect to the first match plus a short scan.
+    
+    def __init__(self):
+        self._entries = []
+        self._values = {}
+        self._lock = threading.Lock()
+    
+    def build(self, pairs):
+        # pairs: iterable of (record id, value)
+        values = {record_id: value for record_id, value in pairs if value}
+        entries = sorted((value.casefold(), value, record_id) for record_id, value in values.items())
+        with self._lock:
+            self._values = values
+            self._entries = entries
+    
+    def set(self, record_id, value):
+        with self._lock:
+            self._discard(record_id)
+            if value:
+                self._values[record_id] = value
+                insort(self._entries, (value.casefold(), value, record_id))
+    
+    def remove(self, record_id):
+        with self._lock:
+            self._discard(record_id)
+    
+    def suggest(self, prefix, limit=10):
+        # Distinct values starting with prefix, in sorted order
+        folded = prefix.casefold()
+        if not folded:
+            return []
+        suggestions = []
+        with self._lock:
+            index = bisect_left(self._entries, (folded,))
+            while index < len(self._entries) and len(suggestions) < limit:
+                key, value, _ = self._entries[index]
+                if not key.startswith(folded):
+                    break
+                if not suggestions or suggestions[-1] != value:
+                    suggestions.append(value)
+                index += 1
+        return suggestions
+    
+    def __len__(self):
+        return len(self._values)
+    
+    def _discard(self, record_id):
+        value = self._values.pop(record_id, None)
+        if value is None:
+            return
+        entry = (value.casefold(), value, record_id)
+        index = bisect_left(self._entries, entry)
+        if index < len(self._entries) and self._entries[index] == entry:
+            del self._entries[index]
@@ -0,0 +1,114 @@
+import re
+from models import FIELDS_BY_LABEL, normalize_projection, select_list
+
+
+COMPARISON = re.compile(r"^\s*(>=|<=|>|<|=)?\s*(.+?)\s*$")
+
+
+# An explicit ESCAPE character reads the same in MySQL and SQLite, unlike MySQL's default
+# backslash (a plain character in SQLite string literals)
+LIKE_ESCAPE = "ESCAPE '!'"
+
+
+def escape_like(value):
+    return value.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+
+
+class ViolationQuery:
+    # Builds parameterized SELECTs for the grid. Every column name that reaches SQL comes
+    # from models.FIELDS; user input only ever travels as parameters.
+    
+    def __init__(self, columns=None, sort=None, filters=None):
+        self.columns = normalize_projection(columns)
+        self.sort_label, self.descending = sort or ("ID", False)
+        if self.sort_label not in FIELDS_BY_LABEL:
+            raise ValueError(f"Unknown sort column: {self.sort_label}")
+        if self.sort_label not in self.columns:
+            raise ValueError(f"Sort column {self.sort_label} is not in the selected columns")
+        
+        self.filters = {}
+        for label, value in (filters or {}).items():
+            if label not in FIELDS_BY_LABEL:
+                raise ValueError(f"Unknown filter column: {label}")
+            if str(value).strip():
+                self.filters[label] = str(value).strip()
+    
+    @property
+    def sort_column(self):
+        return FIELDS_BY_LABEL[self.sort_label].column
+    
+    def cursor_for(self, row):
+        # Keyset cursor for a row of this query's projection: the id alone when sorting by
+        # id, otherwise (sort value, id) so ties on the sort column are broken by id
+        if row is None:
+            return None
+        if self.sort_label == "ID":
+            return row[0]
+        return (row[self.columns.index(self.sort_label)], row[0])
+    
+    def select(self, after=None, before=None, inclusive=False, limit=None):
+        # Returns (sql, params, reverse). Paging backwards runs the query in the opposite
+        # order, so the caller must reverse the rows when reverse is True.
+        clauses, params = self.filter_clauses()
+        backwards = before is not None
+        cursor = before if backwards else after
+        if cursor is not None:
+            clause, cursor_params = self._keyset_clause(cursor, backwards, inclusive)
+            clauses.append(clause)
+            params.extend(cursor_params)
+        
+        sql = f"SELECT {select_list(self.columns)} FROM traffic_violations"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {self.order_by(self.descending != backwards)}"
+        if limit is not None:
+            sql += " LIMIT %s"
+            params.append(limit)
+        return sql, params, backwards
+    
+    def order_by(self, descending=None):
+        # The sort column, then id so ties come back in a stable order
+        direction = "DESC" if (self.descending if descending is None else descending) else "ASC"
+        if self.sort_label == "ID":
+            return f"id {direction}"
+        return f"{self.sort_column} {direction}, id {direction}"
+    
+    def filter_clauses(self):
+        clauses, params = [], []
+        for label, value in self.filters.items():
+            field = FIELDS_BY_LABEL[label]
+            if field.kind in (int, float):
+                operator, operand = COMPARISON.match(value).groups()
+                try:
+                    number = field.kind(operand)
+                except ValueError:
+                    raise ValueError(f"{label} filter must be a number, optionally with >, >=, < or <=")
+                clauses.append(f"{field.column} {operator or '='} %s")
+                params.append(number)
+            elif value.startswith("="):
+                clauses.append(f"{field.column} = %s")
+                params.append(value[1:].strip())
+            else:
+                # Prefix match, so the column index can still be used
+                clauses.append(f"{field.column} LIKE %s {LIKE_ESCAPE}")
+                params.append(escape_like(value) + "%")
+        return clauses, params
+    
+    def _keyset_clause(self, cursor, backwards, inclusive):
+        forward = self.descending == backwards
+        strict = ">" if forward else "<"
+        last = strict + "=" if inclusive else strict
+        if self.sort_label == "ID":
+            return f"id {last} %s", [cursor]
+        value, record_id = cursor
+        column = self.sort_column
+        # MySQL sorts NULLs first, so they sit "below" every value on the cursor's axis
+        if value is None:
+            if forward:
+                return f"({column} IS NOT NULL OR ({column} IS NULL AND id {last} %s))", [record_id]
+            return f"({column} IS NULL AND id {last} %s)", [record_id]
+        if forward:
+            return (f"({column} > %s OR ({column} = %s AND id {last} %s))",
+                    [value, value, record_id])
+        return (f"({column} < %s OR {column} IS NULL OR ({column} = %s AND id {last} %s))",
+                [value, value, record_id])
@@ -0,0 +1,309 @@
+from backends import Error
+from database import DatabaseConnection, ConnectionPool
+
+
+# MySQL error codes (SQLite errors are mapped onto them) that mean a migration step has
+# already been applied by hand
+ALREADY_APPLIED_ERRORS = (
+    1060,  # duplicate column name
+    1061,  # duplicate key name
+    1050,  # table already exists
+    1359,  # trigger already exists
+)
+
+
+class SchemaMigrator:
+    # Ordered, append-only list of (name, statements). Never edit a migration that has shipped;
+    # add a new one instead so existing databases pick up the change.
+    MIGRATIONS = [
+        ("001_search_indexes", [
+            "CREATE INDEX idx_violations_plate ON traffic_violations (PlateNumber)",
+            """CREATE FULLTEXT INDEX ft_violations_driver_charge
+               ON traffic_violations (DriverName, Charge) WITH PARSER ngram""",
+        ]),
+        # Every write, from any client, appends to the change log. Clients poll it for rows
+        # changed since the last version they saw; 'D' entries are the delete tombstones.
+        ("002_change_tracking", [
+            """CREATE TABLE traffic_violation_changes (
+                   version BIGINT AUTO_INCREMENT PRIMARY KEY,
+                   violation_id INT NOT NULL,
+                   operation CHAR(1) NOT NULL,
+                   changed_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+                   INDEX idx_changes_violation (violation_id))""",
+            """CREATE TRIGGER trg_violations_change_insert AFTER INSERT ON traffic_violations
+               FOR EACH ROW INSERT INTO traffic_violation_changes (violation_id, operation)
+               VALUES (NEW.id, 'I')""",
+            """CREATE TRIGGER trg_violations_change_update AFTER UPDATE ON traffic_violations
+               FOR EACH ROW INSERT INTO traffic_violation_changes (violation_id, operation)
+               VALUES (NEW.id, 'U')""",
+            """CREATE TRIGGER trg_violations_change_delete AFTER DELETE ON traffic_violations
+               FOR EACH ROW INSERT INTO traffic_violation_changes (violation_id, operation)
+               VALUES (OLD.id, 'D')""",
+        ]),
+        # Optimistic concurrency: the trigger bumps the version on every update from any client
+        ("003_row_version", [
+            "ALTER TABLE traffic_violations ADD COLUMN row_version INT NOT NULL DEFAULT 0",
+            """CREATE TRIGGER trg_violations_row_version BEFORE UPDATE ON traffic_violations
+               FOR EACH ROW SET NEW.row_version = OLD.row_version + 1""",
+        ]),
+        # Grid sorting/filtering: ORDER BY col, id and the (col, id) keyset cursor both use these
+        ("004_sort_filter_indexes", [
+            "CREATE INDEX idx_violations_state ON traffic_violations (State, id)",
+            "CREATE INDEX idx_violations_violation_type ON traffic_violations (Violation_Type, id)",
+            "CREATE INDEX idx_violations_year ON traffic_violations (Year, id)",
+            "CREATE INDEX idx_violations_penalty ON traffic_violations (PenaltyAmount, id)",
+        ]),
+        # Rollup of counts and penalty sums per State/Violation_Type, kept current by triggers
+        # in the writing transaction. NULL keys are stored as '' since they are part of the
+        # primary key. Groups that drop to zero rows stay behind with a zero count.
+        ("005_state_type_rollup", [
+            """CREATE TABLE violation_rollup_state_type (
+                   State VARCHAR(255) NOT NULL DEFAULT '',
+                   Violation_Type VARCHAR(255) NOT NULL DEFAULT '',
+                   violation_count BIGINT NOT NULL DEFAULT 0,
+                   penalty_count BIGINT NOT NULL DEFAULT 0,
+                   penalty_total DECIMAL(18, 2) NOT NULL DEFAULT 0,
+                   PRIMARY KEY (State, Violation_Type))""",
+            """CREATE TRIGGER trg_violations_rollup_insert AFTER INSERT ON traffic_violations
+               FOR EACH ROW
+               INSERT INTO violation_rollup_state_type
+                   (State, Violation_Type, violation_count, penalty_count, penalty_total)
+               VALUES (COALESCE(NEW.State, ''), COALESCE(NEW.Violation_Type, ''), 1,
+                       NEW.PenaltyAmount IS NOT NULL, COALESCE(NEW.PenaltyAmount, 0))
+               ON DUPLICATE KEY UPDATE
+                   violation_count = violation_count + 1,
+                   penalty_count = penalty_count + VALUES(penalty_count),
+                   penalty_total = penalty_total + VALUES(penalty_total)""",
+            """CREATE TRIGGER trg_violations_rollup_update AFTER UPDATE ON traffic_violations
+               FOR EACH ROW
+               BEGIN
+                   IF NOT (OLD.State <=> NEW.State AND OLD.Violation_Type <=> NEW.Violation_Type
+                           AND OLD.PenaltyAmount <=> NEW.PenaltyAmount) THEN
+                       UPDATE violation_rollup_state_type
+                       SET violation_count = violation_count - 1,
+                           penalty_count = penalty_count - (OLD.PenaltyAmount IS NOT NULL),
+                           penalty_total = penalty_total - COALESCE(OLD.PenaltyAmount, 0)
+                       WHERE State = COALESCE(OLD.State, '')
+                         AND Violation_Type = COALESCE(OLD.Violation_Type, '');
+                       INSERT INTO violation_rollup_state_type
+                           (State, Violation_Type, violation_count, penalty_count, penalty_total)
+                       VALUES (COALESCE(NEW.State, ''), COALESCE(NEW.Violation_Type, ''), 1,
+                               NEW.PenaltyAmount IS NOT NULL, COALESCE(NEW.PenaltyAmount, 0))
+                       ON DUPLICATE KEY UPDATE
+                           violation_count = violation_count + 1,
+                           penalty_count = penalty_count + VALUES(penalty_count),
+                           penalty_total = penalty_total + VALUES(penalty_total);
+                   END IF;
+               END""",
+            """CREATE TRIGGER trg_violations_rollup_delete AFTER DELETE ON traffic_violations
+               FOR EACH ROW
+               UPDATE violation_rollup_state_type
+               SET violation_count = violation_count - 1,
+                   penalty_count = penalty_count - (OLD.PenaltyAmount IS NOT NULL),
+                   penalty_total = penalty_total - COALESCE(OLD.PenaltyAmount, 0)
+               WHERE State = COALESCE(OLD.State, '')
+                 AND Violation_Type = COALESCE(OLD.Violation_Type, '')""",
+            # Initial fill; the same statement as `python cli.py rollup rebuild`
+            """INSERT INTO violation_rollup_state_type
+                   (State, Violation_Type, violation_count, penalty_count, penalty_total)
+               SELECT COALESCE(State, ''), COALESCE(Violation_Type, ''), COUNT(*),
+                      COUNT(PenaltyAmount), COALESCE(SUM(PenaltyAmount), 0)
+               FROM traffic_violations GROUP BY COALESCE(State, ''), COALESCE(Violation_Type, '')
+               ON DUPLICATE KEY UPDATE
+                   violation_count = VALUES(violation_count),
+                   penalty_count = VALUES(penalty_count),
+                   penalty_total = VALUES(penalty_total)""",
+        ]),
+        # Normalized content hash (models.content_hash), written by the application. The
+        # unique index rejects exact duplicates at insert; rows from before this migration
+        # stay NULL until `python cli.py dedupe backfill`.
+        ("006_content_hash", [
+            "ALTER TABLE traffic_violations ADD COLUMN content_hash CHAR(32) NULL",
+            "CREATE UNIQUE INDEX uq_violations_content_hash ON traffic_violations (content_hash)",
+        ]),
+        # Idempotency keys of write-behind journal entries, stored in the transaction that
+        # applies them so a replayed entry is recognised and skipped (journal.py)
+        ("007_applied_writes", [
+            """CREATE TABLE applied_writes (
+                   idempotency_key CHAR(36) PRIMARY KEY,
+                   applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)""",
+        ]),
+        # prune_changes() deletes by age, so the log needs an index on it
+        ("008_change_log_pruning", [
+            "CREATE INDEX idx_changes_changed_at ON traffic_violation_changes (changed_at)",
+        ]),
+    ]
+    
+    # The same history for the SQLite backend. Names match the MySQL list where the step has an
+    # equivalent; full-text search has none, so search uses LIKE there. SQLite has no tables
+    # created by hand, so its list starts by creating the violations table itself.
+    SQLITE_MIGRATIONS = [
+        ("000_violations_table", [
+            """CREATE TABLE traffic_violations (
+                   id INTEGER PRIMARY KEY AUTOINCREMENT,
+                   PlateNumber TEXT, DriverName TEXT, Description TEXT, Belts TEXT,
+                   Personal_Injury TEXT, Property_Damage TEXT, Commercial_License TEXT,
+                   Commercial_Vehicle TEXT, State TEXT, VehicleType TEXT, Year INTEGER,
+                   Make TEXT, Model TEXT, Color TEXT, Charge TEXT, PenaltyAmount REAL,
+                   Contributed_To_Accident TEXT, Race TEXT, Gender TEXT, Driver_City TEXT,
+                   Driver_State TEXT, DL_State TEXT, Arrest_Type TEXT, Violation_Type TEXT)""",
+        ]),
+        ("001_search_indexes", [
+            "CREATE INDEX idx_violations_plate ON traffic_violations (PlateNumber)",
+            "CREATE INDEX idx_violations_driver ON traffic_violations (DriverName)",
+        ]),
+        ("002_change_tracking", [
+            """CREATE TABLE traffic_violation_changes (
+                   version INTEGER PRIMARY KEY AUTOINCREMENT,
+                   violation_id INTEGER NOT NULL,
+                   operation CHAR(1) NOT NULL,
+                   changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)""",
+            "CREATE INDEX idx_changes_violation ON traffic_violation_changes (violation_id)",
+            """CREATE TRIGGER trg_violations_change_insert AFTER INSERT ON traffic_violations
+               BEGIN
+                   INSERT INTO traffic_violation_changes (violation_id, operation) VALUES (NEW.id, 'I');
+               END""",
+            """CREATE TRIGGER trg_violations_change_update AFTER UPDATE ON traffic_violations
+               BEGIN
+                   INSERT INTO traffic_violation_changes (violation_id, operation) VALUES (NEW.id, 'U');
+               END""",
+            """CREATE TRIGGER trg_violations_change_delete AFTER DELETE ON traffic_violations
+               BEGIN
+                   INSERT INTO traffic_violation_changes (violation_id, operation) VALUES (OLD.id, 'D');
+               END""",
+        ]),
+        # SQLite triggers can't assign NEW, so the version is bumped by a follow-up UPDATE;
+        # the WHEN clause stops that UPDATE from triggering another one
+        ("003_row_version", [
+            "ALTER TABLE traffic_violations ADD COLUMN row_version INTEGER NOT NULL DEFAULT 0",
+            """CREATE TRIGGER trg_violations_row_version AFTER UPDATE ON traffic_violations
+               WHEN NEW.row_version = OLD.row_version
+               BEGIN
+                   UPDATE traffic_violations SET row_version = OLD.row_version + 1 WHERE id = NEW.id;
+               END""",
+        ]),
+        ("004_sort_filter_indexes", [
+            "CREATE INDEX idx_violations_state ON traffic_violations (State, id)",
+            "CREATE INDEX idx_violations_violation_type ON traffic_violations (Violation_Type, id)",
+            "CREATE INDEX idx_violations_year ON traffic_violations (Year, id)",
+            "CREATE INDEX idx_violations_penalty ON traffic_violations (PenaltyAmount, id)",
+        ]),
+        ("005_state_type_rollup", [
+            """CREATE TABLE violation_rollup_state_type (
+                   State TEXT NOT NULL DEFAULT '',
+                   Violation_Type TEXT NOT NULL DEFAULT '',
+                   violation_count INTEGER NOT NULL DEFAULT 0,
+                   penalty_count INTEGER NOT NULL DEFAULT 0,
+                   penalty_total REAL NOT NULL DEFAULT 0,
+                   PRIMARY KEY (State, Violation_Type))""",
+            """CREATE TRIGGER trg_violations_rollup_insert AFTER INSERT ON traffic_violations
+               BEGIN
+                   INSERT INTO violation_rollup_state_type
+                       (State, Violation_Type, violation_count, penalty_count, penalty_total)
+                   VALUES (COALESCE(NEW.State, ''), COALESCE(NEW.Violation_Type, ''), 1,
+                           NEW.PenaltyAmount IS NOT NULL, COALESCE(NEW.PenaltyAmount, 0))
+                   ON CONFLICT (State, Violation_Type) DO UPDATE SET
+                       violation_count = violation_count + 1,
+                       penalty_count = penalty_count + excluded.penalty_count,
+                       penalty_total = penalty_total + excluded.penalty_total;
+               END""",
+            """CREATE TRIGGER trg_violations_rollup_update AFTER UPDATE ON traffic_violations
+               WHEN NOT (OLD.State IS NEW.State AND OLD.Violation_Type IS NEW.Violation_Type
+                         AND OLD.PenaltyAmount IS NEW.PenaltyAmount)
+               BEGIN
+                   UPDATE violation_rollup_state_type
+                   SET violation_count = violation_count - 1,
+                       penalty_count = penalty_count - (OLD.PenaltyAmount IS NOT NULL),
+                       penalty_total = penalty_total - COALESCE(OLD.PenaltyAmount, 0)
+                   WHERE State = COALESCE(OLD.State, '')
+                     AND Violation_Type = COALESCE(OLD.Violation_Type, '');
+                   INSERT INTO violation_rollup_state_type
+                       (State, Violation_Type, violation_count, penalty_count, penalty_total)
+                   VALUES (COALESCE(NEW.State, ''), COALESCE(NEW.Violation_Type, ''), 1,
+                           NEW.PenaltyAmount IS NOT NULL, COALESCE(NEW.PenaltyAmount, 0))
+                   ON CONFLICT (State, Violation_Type) DO UPDATE SET
+                       violation_count = violation_count + 1,
+                       penalty_count = penalty_count + excluded.penalty_count,
+                       penalty_total = penalty_total + excluded.penalty_total;
+               END""",
+            """CREATE TRIGGER trg_violations_rollup_delete AFTER DELETE ON traffic_violations
+               BEGIN
+                   UPDATE violation_rollup_state_type
+                   SET violation_count = violation_count - 1,
+                       penalty_count = penalty_count - (OLD.PenaltyAmount IS NOT NULL),
+                       penalty_total = penalty_total - COALESCE(OLD.PenaltyAmount, 0)
+                   WHERE State = COALESCE(OLD.State, '')
+                     AND Violation_Type = COALESCE(OLD.Violation_Type, '');
+               END""",
+            """INSERT INTO violation_rollup_state_type
+                   (State, Violation_Type, violation_count, penalty_count, penalty_total)
+               SELECT COALESCE(State, ''), COALESCE(Violation_Type, ''), COUNT(*),
+                      COUNT(PenaltyAmount), COALESCE(SUM(PenaltyAmount), 0)
+               FROM traffic_violations WHERE true
+               GROUP BY COALESCE(State, ''), COALESCE(Violation_Type, '')
+               ON CONFLICT (State, Violation_Type) DO UPDATE SET
+                   violation_count = excluded.violation_count,
+                   penalty_count = excluded.penalty_count,
+                   penalty_total = excluded.penalty_total""",
+        ]),
+        ("006_content_hash", [
+            "ALTER TABLE traffic_violations ADD COLUMN content_hash TEXT",
+            "CREATE UNIQUE INDEX uq_violations_content_hash ON traffic_violations (content_hash)",
+        ]),
+        ("007_applied_writes", [
+            """CREATE TABLE applied_writes (
+                   idempotency_key TEXT PRIMARY KEY,
+                   applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)""",
+        ]),
+        # The index as on MySQL. The row_version bump from 003 is an UPDATE of its own, which
+        # logged every edit twice; only the statement that leaves row_version alone logs now.
+        ("008_change_log_pruning", [
+            "CREATE INDEX idx_changes_changed_at ON traffic_violation_changes (changed_at)",
+            "DROP TRIGGER IF EXISTS trg_violations_change_update",
+            """CREATE TRIGGER trg_violations_change_update AFTER UPDATE ON traffic_violations
+               WHEN NEW.row_version = OLD.row_version
+               BEGIN
+                   INSERT INTO traffic_violation_changes (violation_id, operation) VALUES (NEW.id, 'U');
+               END""",
+        ]),
+    ]
+    
+    def __init__(self):
+        self.backend = ConnectionPool().backend
+    
+    def migrations(self):
+        return self.SQLITE_MIGRATIONS if self.backend.name == "sqlite" else self.MIGRATIONS
+    
+    def applied_migrations(self):
+        with DatabaseConnection() as db:
+            self._ensure_migrations_table(db)
+            db.execute("SELECT name FROM schema_migrations")
+            return {row[0] for row in db.fetchall()}
+    
+    def pending_migrations(self):
+        applied = self.applied_migrations()
+        return [name for name, _ in self.migrations() if name not in applied]
+    
+    def migrate(self):
+        applied = self.applied_migrations()
+        newly_applied = []
+        for name, statements in self.migrations():
+            if name in applied:
+                continue
+            # MySQL commits DDL implicitly, so each statement runs on its own on either backend
+            for statement in statements:
+                try:
+                    with DatabaseConnection() as db:
+                        db.execute(statement)
+                except Error as e:
+                    if e.errno not in ALREADY_APPLIED_ERRORS:
+                        raise
+            with DatabaseConnection() as db:
+                db.execute("INSERT INTO schema_migrations (name) VALUES (%s)", (name,))
+            newly_applied.append(name)
+        return newly_applied
+    
+    def _ensure_migrations_table(self, db):
+        db.execute("""CREATE TABLE IF NOT EXISTS schema_migrations (
+                          name VARCHAR(100) PRIMARY KEY,
+                          applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)""")
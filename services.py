@@ -1,91 +1,291 @@
-from config import AppConfig
-from tkinter import messagebox
-from database import TrafficViolationRepository
-
-
-class ValidationService:
-    
-    def __init__(self):
-        self.config = AppConfig()
-    
-    def validate_empty_fields(self, entries, labels):
-        for i, ent in enumerate(entries):
-            if not ent.get().strip():
-                messagebox.showerror("Validation Error", f"Please fill in the field: {labels[i]}")
-                return False
-        return True
-    
-    def validate_data_types(self, entries, labels):
-        for i, label in enumerate(labels):
-            value = entries[i].get().strip()
-            
-            # Check strictly integer fields
-            if label in self.config.int_fields:
-                if not self._is_valid_integer(value):
-                    messagebox.showerror("Validation Error", f"{label} must be a valid integer number")
-                    return False
-            
-            # Check numeric fields (can be integer or decimal)
-            elif label in self.config.numeric_fields:
-                if not self._is_valid_numeric(value):
-                    messagebox.showerror("Validation Error", f"{label} must be a valid number")
-                    return False
-        
-        return True
-    
-    def validate_record_fields(self, entries, labels):
-        return (self.validate_empty_fields(entries, labels) and 
-                self.validate_data_types(entries, labels))
-    
-    def _is_valid_integer(self, value):
-        try:
-            int(value)
-            return True
-        except ValueError:
-            return False
-    
-    def _is_valid_numeric(self, value):
-        try:
-            float(value)
-            return True
-        except ValueError:
-            return False
-
-
-class AuthenticationService:
-    
-    def __init__(self):
-        self.config = AppConfig()
-    
-    def authenticate(self, username, password):
-        return (username == self.config.login_username and 
-                password == self.config.login_password)
-
-
-class TrafficViolationService:
-    def __init__(self):
-        self.repository = TrafficViolationRepository()
-        self.validator = ValidationService()
-    
-    def get_all_violations(self):
-        return self.repository.get_all()
-    
-    def search_violations(self, search_term):
-        return self.repository.search(search_term)
-    
-    def create_violation(self, entries, labels):
-        if not self.validator.validate_record_fields(entries, labels):
-            return False
-        
-        values = tuple(ent.get().strip() for ent in entries)
-        return self.repository.create(values)
-    
-    def update_violation(self, record_id, entries, labels):
-        if not self.validator.validate_record_fields(entries, labels):
-            return False
-        
-        values = tuple(ent.get().strip() for ent in entries)
-        return self.repository.update(record_id, values)
-    
-    def delete_violation(self, record_id):
-        return self.repository.delete(record_id)
+import threading
+from config import AppConfig
+from database import TrafficViolationRepository, BatchResult
+from errors import ValidationError
+from validation import record_schema
+from cache import ResultCache
+from prefix_index import PrefixIndex
+from models import FIELDS_BY_LABEL
+from journal import WriteBehindQueue
+
+
+class ValidationService:
+    
+    def __init__(self):
+        self.config = AppConfig()
+    
+    # Rules come from validation.RecordSchema: types from models.FIELDS plus the domain
+    # rules in AppConfig.validation_rules. Every problem is reported, not just the first.
+    
+    def validate_record_fields(self, entries, labels):
+        # Raises ValidationError naming the fields at fault, so the form can mark them
+        problems = record_schema(tuple(labels)).problems([ent.get() for ent in entries])
+        if problems:
+            raise ValidationError([message for _, message in problems],
+                                  fields=[label for label, _ in problems if label])
+    
+    def validate_values(self, values, labels):
+        # One record as a tuple in labels order; usable without Tk (bulk jobs, the CLI)
+        return record_schema(tuple(labels)).validate(values)
+    
+    def validate_record(self, record, labels=None):
+        # A {label: value} dict or a tuple in labels order (default: every editable column)
+        return record_schema(tuple(labels) if labels else None).validate(record)
+    
+    def validate_batch(self, records, labels=None):
+        # One list of problems per record, checked a column at a time
+        return record_schema(tuple(labels) if labels else None).validate_batch(records)
+
+
+class AuthenticationService:
+    
+    def __init__(self):
+        self.config = AppConfig()
+    
+    def authenticate(self, username, password):
+        return (username == self.config.login_username and 
+                password == self.config.login_password)
+
+
+class TrafficViolationService:
+    # Shared by every service instance so a RecordDialog's write invalidates the
+    # ManagementPage's cached listings
+    _cache = None
+    _cache_lock = threading.Lock()
+    
+    LIST_KINDS = ("all", "page", "search")
+    
+    # Autocomplete: one in-memory prefix index per column, also shared process-wide
+    SUGGEST_LABELS = ("Plate Number", "Driver Name")
+    _suggestions = None
+    _suggestions_lock = threading.Lock()
+    
+    def __init__(self):
+        self.config = AppConfig()
+        self.repository = TrafficViolationRepository()
+        self.validator = ValidationService()
+        with TrafficViolationService._cache_lock:
+            if TrafficViolationService._cache is None:
+                TrafficViolationService._cache = ResultCache(self.config.cache_max_entries,
+                                                             self.config.cache_ttl)
+        self.cache = TrafficViolationService._cache
+        # Write-behind mode: writes are journaled locally and return a journal.PendingWrite;
+        # the queue's flusher applies them and calls back to refresh the cache
+        self.write_behind = None
+        if self.config.write_behind_enabled:
+            self.write_behind = WriteBehindQueue()
+            self.write_behind.start(on_applied=self._on_writes_applied)
+    
+    def get_all_violations(self, columns=None, sort=None, filters=None):
+        return self._cached(("all", self._key(columns), sort, self._key(filters)),
+                            lambda: self.repository.get_all(columns, sort, filters))
+    
+    def get_violations_page(self, after=None, before=None, limit=None, columns=None, sort=None,
+                            filters=None, inclusive=False):
+        return self._cached(("page", after, before, inclusive, limit, self._key(columns), sort,
+                             self._key(filters)),
+                            lambda: self.repository.get_page(after=after, before=before, limit=limit,
+                                                             columns=columns, sort=sort,
+                                                             filters=filters, inclusive=inclusive))
+    
+    def get_violation(self, record_id):
+        return self._cached(("by_id", str(record_id)), lambda: self.repository.get_by_id(record_id))
+    
+    def search_violations(self, search_term, columns=None):
+        return self._cached(("search", search_term, self._key(columns)),
+                            lambda: self.repository.search(search_term, columns))
+    
+    def collect_record_values(self, entries, labels, original=None):
+        # Reads Tk entries, so this must run on the UI thread. Raises ValidationError. Given
+        # the record's original values (an edit), only the fields that changed are checked:
+        # an unchanged value that predates the rules is written back as it was.
+        values = tuple(ent.get().strip() for ent in entries)
+        if original is not None:
+            changes = self.changed_fields(original, values, labels)
+            changed = [(ent, label) for ent, label in zip(entries, labels) if label in changes]
+            entries, labels = [ent for ent, _ in changed], [label for _, label in changed]
+        self.validator.validate_record_fields(entries, labels)
+        return values
+    
+    def create_violation(self, entries, labels):
+        return self.create_violation_record(self.collect_record_values(entries, labels))
+    
+    def update_violation(self, record_id, entries, labels):
+        return self.update_violation_record(record_id, self.collect_record_values(entries, labels))
+    
+    # Writes return the stored row and raise AppError subclasses (errors.py) on failure
+    def create_violation_record(self, values):
+        if self.write_behind is not None:
+            return self.write_behind.enqueue("create", values=list(values))
+        created = self.repository.create(values)
+        self.cache.invalidate(self.LIST_KINDS)
+        self._sync_suggestions([created])
+        return created
+    
+    def update_violation_record(self, record_id, values):
+        if self.write_behind is not None:
+            return self.write_behind.enqueue("update", int(record_id), values=list(values))
+        updated = self.repository.update(record_id, values)
+        self.cache.invalidate(self.LIST_KINDS, keys=[("by_id", str(record_id))])
+        self._sync_suggestions([updated])
+        return updated
+    
+    def get_violation_for_edit(self, record_id):
+        # Returns (row, version); version is None when optimistic locking is off. Always read
+        # on the primary and past the cache: a lagging copy would be saved back over newer data.
+        row, version = self.repository.get_by_id_with_version(record_id)
+        if not self.config.optimistic_locking:
+            version = None
+        if self.write_behind is not None and row is not None:
+            changes = self.write_behind.pending_changes(int(record_id))
+            if changes:
+                # Shown as it will be once this station's queued edits are written. Their own
+                # writes will bump the version, so it can't be checked against.
+                row = row._replace(**{FIELDS_BY_LABEL[label].attribute: value
+                                      for label, value in changes.items()})
+                version = None
+        return row, version
+    
+    def changed_fields(self, original, values, labels):
+        # Entries are filled with str(value), so an untouched entry compares equal
+        changes = {}
+        for label, value, old in zip(labels, values, original):
+            if value != ("" if old is None else str(old)):
+                changes[label] = value
+        return changes
+    
+    def update_violation_fields(self, record_id, changes, expected_version=None):
+        if self.write_behind is not None:
+            return self.write_behind.enqueue("update_fields", int(record_id), changes=changes,
+                                             expected_version=expected_version)
+        updated = self.repository.update_fields(record_id, changes, expected_version)
+        self.cache.invalidate(self.LIST_KINDS, keys=[("by_id", str(record_id))])
+        self._sync_suggestions([updated])
+        return updated
+    
+    def delete_violation(self, record_id):
+        if self.write_behind is not None:
+            return self.write_behind.enqueue("delete", int(record_id))
+        deleted = self.repository.delete(record_id)
+        self.cache.invalidate(self.LIST_KINDS, keys=[("by_id", str(record_id))])
+        self._sync_suggestions(deleted_ids=[int(record_id)])
+        return deleted
+    
+    def delete_violations(self, record_ids):
+        if self.write_behind is not None:
+            return self._enqueue_batch(record_ids, "delete", {})
+        result = self.repository.delete_many(record_ids)
+        if result.succeeded:
+            self.cache.invalidate(self.LIST_KINDS,
+                                  keys=[("by_id", str(record_id)) for record_id in result.succeeded])
+            self._sync_suggestions(deleted_ids=result.succeeded)
+        return result
+    
+    def update_violations(self, record_ids, changes):
+        # The same {label: value} changes for every id; values are checked with the single-record
+        # rules first, so a bad value fails the whole batch before anything is written
+        errors = self.validator.validate_values(list(changes.values()), list(changes))
+        if errors:
+            raise ValidationError(errors)
+        if self.write_behind is not None:
+            return self._enqueue_batch(record_ids, "update_fields", {"changes": changes})
+        result = self.repository.update_many(record_ids, changes)
+        if result.succeeded:
+            self.cache.invalidate(self.LIST_KINDS,
+                                  keys=[("by_id", str(record_id)) for record_id in result.succeeded])
+            self._sync_suggestions(result.rows)
+        return result
+    
+    def get_change_version(self):
+        return self.repository.get_change_version()
+    
+    def get_changes_since(self, version, columns=None):
+        changes = self.repository.get_changes_since(version, columns=columns)
+        if changes.expired:
+            # Too far behind to patch: nothing cached or indexed can be trusted
+            self.cache.clear()
+            with TrafficViolationService._suggestions_lock:
+                rebuild, TrafficViolationService._suggestions = TrafficViolationService._suggestions, None
+            if rebuild is not None:
+                self.build_suggestion_index()
+        elif changes:
+            # Other stations wrote; their rows may be sitting in our cache
+            changed_ids = [row[0] for row in changes.rows] + changes.deleted_ids
+            self.cache.invalidate(self.LIST_KINDS,
+                                  keys=[("by_id", str(record_id)) for record_id in changed_ids])
+            self._sync_suggestions(changes.rows, changes.deleted_ids)
+        return changes
+    
+    def build_suggestion_index(self):
+        # Built once from a narrow read of the two columns; after that the writes above and
+        # the change-log deltas keep it current
+        with TrafficViolationService._suggestions_lock:
+            if TrafficViolationService._suggestions is None:
+                rows = self.repository.get_all(self.SUGGEST_LABELS)
+                indexes = {}
+                for label in self.SUGGEST_LABELS:
+                    attribute = FIELDS_BY_LABEL[label].attribute
+                    indexes[label] = PrefixIndex()
+                    indexes[label].build((row.id, getattr(row, attribute)) for row in rows)
+                TrafficViolationService._suggestions = indexes
+            return sum(len(index) for index in TrafficViolationService._suggestions.values())
+    
+    def suggest(self, prefix, limit=None):
+        # Pure in-memory lookup, cheap enough for the UI thread; empty until the index is built
+        indexes = TrafficViolationService._suggestions
+        if indexes is None:
+            return []
+        limit = limit or self.config.suggestion_limit
+        suggestions = []
+        for index in indexes.values():
+            for value in index.suggest(prefix.strip(), limit):
+                if value not in suggestions:
+                    suggestions.append(value)
+        return suggestions[:limit]
+    
+    def get_cache_stats(self):
+        return self.cache.get_stats()
+    
+    def _enqueue_batch(self, record_ids, operation, payload):
+        # One journal entry per record, appended together; reported as queued, not written
+        record_ids = list(dict.fromkeys(int(record_id) for record_id in record_ids))
+        self.write_behind.enqueue_many([(operation, record_id, payload) for record_id in record_ids])
+        result = BatchResult()
+        result.succeeded = record_ids
+        result.queued = True
+        return result
+    
+    def _on_writes_applied(self, applied):
+        # Called on the write-behind flusher thread after queued writes are committed
+        rows = [result for write, result in applied if write.operation != "delete"]
+        deleted_ids = [result for write, result in applied if write.operation == "delete"]
+        self.cache.invalidate(self.LIST_KINDS, keys=[("by_id", str(record_id))
+                                                     for record_id in [row[0] for row in rows] + deleted_ids])
+        self._sync_suggestions(rows, deleted_ids)
+    
+    def _sync_suggestions(self, rows=(), deleted_ids=()):
+        indexes = TrafficViolationService._suggestions
+        if indexes is None:
+            return
+        for label, index in indexes.items():
+            attribute = FIELDS_BY_LABEL[label].attribute
+            for record_id in deleted_ids:
+                index.remove(record_id)
+            for row in rows:
+                if hasattr(row, attribute):
+                    index.set(row[0], getattr(row, attribute))
+    
+    def _key(self, items):
+        # Hashable form of a column list or a filter dict for cache keys
+        if items is None:
+            return None
+        if isinstance(items, dict):
+            return tuple(sorted(items.items()))
+        return tuple(items)
+    
+    def _cached(self, key, loader):
+        if not self.config.cache_enabled:
+            return loader()
+        # Failures raise, so nothing but real results is cached; None (a missing record) is
+        # left out so a record created elsewhere shows up on the next lookup
+        return self.cache.get_or_load(key, loader, cache_if=lambda result: result is not None)
@@ -0,0 +1,143 @@
+import os
+import sys
+import threading
+import time
+from config import AppConfig
+
+
+class ImportTimer:
+    # Meta path hook that times each module the first time it is executed, like
+    # `python -X importtime`: cumulative time includes the modules it imported in turn,
+    # self time does not
+    
+    def __init__(self):
+        self.timings = []  # (module, self seconds, cumulative seconds, nesting depth)
+        self._local = threading.local()
+    
+    def install(self):
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+    
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+    
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = TimedLoader(spec.loader, self)
+                return spec
+        return None
+    
+    def begin(self):
+        stack = self._stack()
+        stack.append(0.0)
+        return time.perf_counter()
+    
+    def end(self, name, started):
+        elapsed = time.perf_counter() - started
+        stack = self._stack()
+        children = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        self.timings.append((name, elapsed - children, elapsed, len(stack)))
+    
+    def slowest(self, count):
+        return sorted(self.timings, key=lambda timing: timing[2], reverse=True)[:count]
+    
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+
+class TimedLoader:
+    # Wraps a module's real loader; everything but loading is passed through
+    
+    def __init__(self, loader, timer):
+        self.loader = loader
+        self.timer = timer
+    
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+    
+    def exec_module(self, module):
+        started = self.timer.begin()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            self.timer.end(module.__name__, started)
+    
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+
+class StartupProfiler:
+    # Milestones of one launch, in seconds since main.py started, plus import timings when
+    # the report is on (AppConfig.startup_report or TV_STARTUP_REPORT=1). The report is
+    # printed to stderr once the management page has opened, or on exit from the login.
+    _instance = None
+    _instance_lock = threading.Lock()
+    
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance._initialized = False
+        return cls._instance
+    
+    def __init__(self):
+        if self._initialized:
+            return
+        self._initialized = True
+        
+        self.config = AppConfig()
+        self.enabled = self.config.startup_report or os.environ.get("TV_STARTUP_REPORT") == "1"
+        self.started = time.perf_counter()
+        self.marks = []
+        self.import_timer = None
+        self._lock = threading.Lock()
+        self._reported = False
+    
+    def start(self):
+        self.started = time.perf_counter()
+        if self.enabled:
+            self.import_timer = ImportTimer()
+            self.import_timer.install()
+    
+    def mark(self, label):
+        with self._lock:
+            self.marks.append((label, time.perf_counter() - self.started,
+                               threading.current_thread().name))
+    
+    def report(self):
+        lines = ["Startup timings (seconds since launch):"]
+        with self._lock:
+            marks = sorted(self.marks, key=lambda mark: mark[1])
+        for label, elapsed, thread in marks:
+            where = "" if thread == "MainThread" else f"  [{thread}]"
+            lines.append(f"  {elapsed:8.3f}  {label}{where}")
+        if self.import_timer is not None:
+            timings = self.import_timer.timings
+            lines.append(f"Imports: {len(timings)} modules, "
+                         f"{sum(timing[1] for timing in timings):.3f}s in total. Slowest "
+                         f"(cumulative / self ms):")
+            for name, self_time, cumulative, depth in self.import_timer.slowest(
+                    self.config.startup_report_top):
+                lines.append(f"  {cumulative * 1000:8.1f} {self_time * 1000:8.1f}  "
+                             f"{'  ' * depth}{name}")
+        return "\n".join(lines)
+    
+    def finish(self, label):
+        # Records the last milestone and prints the report, once per launch
+        self.mark(label)
+        if not self.enabled or self._reported:
+            return
+        self._reported = True
+        if self.import_timer is not None:
+            self.import_timer.uninstall()
+        print(self.report(), file=sys.stderr)
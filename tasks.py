@@ -0,0 +1,99 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from config import AppConfig
+
+
+class BackgroundTaskRunner:
+    # Runs blocking calls on worker threads and hands results back on the Tk thread.
+    # Tk is not thread-safe, so workers only push onto a queue that the UI drains with after().
+    
+    def __init__(self, widget, on_busy_change=None):
+        self.config = AppConfig()
+        self.widget = widget
+        self.on_busy_change = on_busy_change
+        self._executor = ThreadPoolExecutor(max_workers=self.config.worker_threads,
+                                            thread_name_prefix="db-worker")
+        self._results = queue.Queue()
+        self._generations = {}
+        self._futures = {}
+        self._pending = 0
+        self._poll_id = None
+        self._closed = False
+    
+    def submit(self, func, *args, key=None, on_success=None, on_error=None, **kwargs):
+        # Submitting under a key that is already running makes the older call stale:
+        # it is cancelled if it hasn't started and its result is dropped if it has.
+        if self._closed:
+            return None
+        generation = None
+        if key is not None:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+            previous = self._futures.pop(key, None)
+            if previous is not None:
+                previous.cancel()
+        
+        future = self._executor.submit(func, *args, **kwargs)
+        if key is not None:
+            self._futures[key] = future
+        self._set_pending(self._pending + 1)
+        future.add_done_callback(
+            lambda done: self._results.put((key, generation, done, on_success, on_error)))
+        self._schedule_poll()
+        return future
+    
+    def cancel(self, key):
+        self._generations[key] = self._generations.get(key, 0) + 1
+        future = self._futures.pop(key, None)
+        if future is not None:
+            future.cancel()
+    
+    def is_busy(self):
+        return self._pending > 0
+    
+    def shutdown(self):
+        self._closed = True
+        if self._poll_id is not None:
+            try:
+                self.widget.after_cancel(self._poll_id)
+            except Exception:
+                pass
+            self._poll_id = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _schedule_poll(self):
+        if self._poll_id is None and not self._closed:
+            self._poll_id = self.widget.after(self.config.task_poll_interval_ms, self._poll)
+    
+    def _poll(self):
+        self._poll_id = None
+        try:
+            while True:
+                try:
+                    key, generation, future, on_success, on_error = self._results.get_nowait()
+                except queue.Empty:
+                    break
+                self._set_pending(self._pending - 1)
+                if key is not None:
+                    if self._generations.get(key) != generation:
+                        continue
+                    if self._futures.get(key) is future:
+                        del self._futures[key]
+                if future.cancelled():
+                    continue
+                
+                error = future.exception()
+                if error is not None:
+                    if on_error:
+                        on_error(error)
+                elif on_success:
+                    on_success(future.result())
+        finally:
+            if self._pending:
+                self._schedule_poll()
+    
+    def _set_pending(self, pending):
+        was_busy = self._pending > 0
+        self._pending = pending
+        if self.on_busy_change and was_busy != (pending > 0):
+            self.on_busy_change(pending > 0)
@@ -0,0 +1,53 @@
+import pytest
+from benchmark import generate_rows
+from config import AppConfig
+from database import ConnectionPool, ReplicaRouter, TrafficViolationRepository
+from instrumentation import QueryMetrics
+from journal import WriteBehindQueue
+from models import EDITABLE_FIELDS
+from schema import SchemaMigrator
+from services import TrafficViolationService
+
+
+@pytest.fixture(autouse=True)
+def config(tmp_path):
+    # Every test gets its own migrated SQLite database and fresh process-wide singletons
+    for singleton in (AppConfig, ConnectionPool, ReplicaRouter, QueryMetrics, WriteBehindQueue):
+        singleton._instance = None
+    TrafficViolationService._cache = None
+    TrafficViolationService._suggestions = None
+    
+    config = AppConfig()
+    config.db_backend = "sqlite"
+    config.db_sqlite_path = str(tmp_path / "violations.db")
+    config.write_behind_journal_path = str(tmp_path / "pending_writes.db")
+    SchemaMigrator().migrate()
+    yield config
+    
+    queue = WriteBehindQueue._instance
+    if queue is not None and queue._initialized:
+        queue.stop()
+        queue.journal.connection.close()
+    ConnectionPool().close_all()
+
+
+@pytest.fixture
+def repository(config):
+    return TrafficViolationRepository()
+
+
+@pytest.fixture
+def make_values():
+    # One record's values in INSERT_COLUMNS order: a generated row with some labels replaced
+    def make(changes=None, seed=0):
+        values = list(next(generate_rows(1, seed)))
+        labels = [field.label for field in EDITABLE_FIELDS]
+        for label, value in (changes or {}).items():
+            values[labels.index(label)] = value
+        return tuple(values)
+    return make
+
+
+@pytest.fixture
+def records(repository):
+    return [repository.create(values) for values in generate_rows(40)]
@@ -0,0 +1,56 @@
+import csv
+import cli
+from database import DatabaseConnection
+
+
+def test_dedupe_scan_runs_with_content_hashing_off(repository, make_values, capsys):
+    original = repository.create(make_values())
+    typo = repository.create(make_values({"Driver Name": make_values()[1].replace("a", "e", 1)}))
+    repository.create(make_values(seed=1))
+    
+    assert cli.main(["dedupe", "scan"]) == 0
+    output = capsys.readouterr().out
+    assert f"{original.id}, {typo.id}" in output
+    assert "1 groups of likely duplicates" in output
+
+
+def test_dedupe_backfill_needs_content_hashing(capsys):
+    assert cli.main(["dedupe", "backfill"]) == 1
+    assert "content_hash_enabled" in capsys.readouterr().err
+
+
+def test_dedupe_backfill_hashes_records_and_reports_exact_duplicates(config, repository, make_values, capsys):
+    first = repository.create(make_values())
+    second = repository.create(make_values())
+    repository.create(make_values(seed=1))
+    config.content_hash_enabled = True
+    
+    assert cli.main(["dedupe", "backfill"]) == 0
+    output = capsys.readouterr().out
+    assert "Hashed 2 records" in output
+    assert f"duplicate  {second.id} is identical to {first.id}" in output
+
+
+def test_export_writes_every_record(tmp_path, records):
+    path = tmp_path / "violations.csv"
+    assert cli.main(["export", str(path), "--batch-size", "7"]) == 0
+    with open(path, newline="", encoding="utf-8") as exported:
+        rows = list(csv.reader(exported))
+    assert len(rows) == len(records) + 1
+    assert [int(row[0]) for row in rows[1:]] == [record.id for record in records]
+
+
+def test_export_of_a_search_writes_the_capped_search_results(config, tmp_path, repository, records):
+    config.search_result_limit = 5
+    path = tmp_path / "search.csv"
+    assert cli.main(["export", str(path), "--search", "a"]) == 0
+    with open(path, newline="", encoding="utf-8") as exported:
+        ids = [int(row[0]) for row in list(csv.reader(exported))[1:]]
+    assert ids == [row.id for row in repository.search("a")]
+
+
+def test_changes_prune_deletes_old_entries(repository, records, capsys):
+    with DatabaseConnection() as db:
+        db.execute("UPDATE traffic_violation_changes SET changed_at = '2000-01-01 00:00:00'")
+    assert cli.main(["changes", "prune", "--days", "30"]) == 0
+    assert f"Deleted {len(records) - 1} change-log entries" in capsys.readouterr().out
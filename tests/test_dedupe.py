@@ -0,0 +1,33 @@
+import pytest
+from dedupe import DuplicateFinder
+from models import EDITABLE_FIELDS, normalize_value
+
+
+def normalized(values):
+    return [normalize_value(field, value) for field, value in zip(EDITABLE_FIELDS, values)]
+
+
+def test_case_and_spacing_do_not_lower_the_score(repository, make_values):
+    finder = DuplicateFinder(repository)
+    values = make_values()
+    shouted = make_values({"Driver Name": f"  {values[1].upper()} "})
+    assert finder.score(normalized(values), normalized(shouted)) == pytest.approx(1.0)
+
+
+def test_unrelated_records_score_below_the_threshold(repository, make_values):
+    finder = DuplicateFinder(repository)
+    assert finder.score(normalized(make_values()), normalized(make_values(seed=1))) < finder.threshold
+
+
+def test_find_groups_near_duplicates_across_blocks(repository, make_values):
+    values = make_values()
+    original = repository.create(values)
+    # renamed shares original's plate block, replated its driver and charge block
+    renamed = repository.create(make_values({"Driver Name": values[1].replace("a", "e", 1)}))
+    replated = repository.create(make_values({"Plate Number": values[0][:-1] + "9"}))
+    repository.create(make_values(seed=1))
+    
+    finder = DuplicateFinder(repository)
+    groups = finder.find()
+    assert [group.ids for group in groups] == [[original.id, renamed.id, replated.id]]
+    assert finder.threshold <= groups[0].score < 1.0
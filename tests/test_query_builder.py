@@ -0,0 +1,93 @@
+import pytest
+from errors import FilterError
+from query_builder import ViolationQuery, escape_like
+
+
+COLUMNS = ("ID", "Plate Number", "Year", "State")
+
+
+def page_through(repository, sort, filters=None, limit=7):
+    query = ViolationQuery(COLUMNS, sort, filters)
+    rows, after = [], None
+    while True:
+        page = repository.get_page(after=query.cursor_for(after), limit=limit, columns=COLUMNS,
+                                   sort=sort, filters=filters)
+        rows.extend(page)
+        if len(page) < limit:
+            return rows
+        after = page[-1]
+
+
+def page_backwards(repository, sort, last, limit=7):
+    # From the last row back to the first, the way the grid scrolls up
+    query = ViolationQuery(COLUMNS, sort)
+    rows, before = [last], last
+    while True:
+        page = repository.get_page(before=query.cursor_for(before), limit=limit, columns=COLUMNS,
+                                   sort=sort)
+        rows[:0] = page
+        if len(page) < limit:
+            return rows
+        before = page[0]
+
+
+def ordered(rows, descending=False):
+    # MySQL's order: NULLs below every value, ties broken by id in the same direction
+    return sorted(rows, key=lambda row: (row.year is not None, row.year or 0, row.id), reverse=descending)
+
+
+@pytest.fixture
+def rows_with_nulls(repository, records, make_values):
+    for seed in range(3):
+        repository.create(make_values({"Year": None}, seed=100 + seed))
+    return repository.get_all(COLUMNS)
+
+
+def test_keyset_pages_by_id_cover_every_row_once(repository, records):
+    rows = page_through(repository, None)
+    assert [row.id for row in rows] == sorted(record.id for record in records)
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_keyset_pages_on_a_sort_column_keep_ties_and_nulls_in_order(repository, rows_with_nulls, descending):
+    rows = page_through(repository, ("Year", descending))
+    assert rows == ordered(rows_with_nulls, descending)
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_paging_backwards_matches_paging_forwards(repository, rows_with_nulls, descending):
+    expected = ordered(rows_with_nulls, descending)
+    assert page_backwards(repository, ("Year", descending), expected[-1]) == expected
+
+
+def test_inclusive_start_repeats_the_cursor_row(repository, records):
+    query = ViolationQuery(COLUMNS, ("Year", False))
+    first = repository.get_page(limit=5, columns=COLUMNS, sort=("Year", False))
+    again = repository.get_page(after=query.cursor_for(first[2]), inclusive=True, limit=3,
+                                columns=COLUMNS, sort=("Year", False))
+    assert again == first[2:5]
+
+
+def test_filters_apply_to_every_page(repository, records):
+    filters = {"Year": ">=2005", "State": "M"}
+    rows = page_through(repository, ("Year", True), filters)
+    expected = [row for row in repository.get_all(COLUMNS)
+                if row.year >= 2005 and row.state.startswith("M")]
+    assert rows == ordered(expected, descending=True)
+
+
+def test_filter_values_are_prefix_matches_with_like_wildcards_escaped(repository, make_values):
+    repository.create(make_values({"State": "M%"}))
+    repository.create(make_values({"State": "MD"}, seed=1))
+    rows = repository.get_all(COLUMNS, filters={"State": "M%"})
+    assert [row.state for row in rows] == ["M%"]
+    assert escape_like("5%_!") == "5!%!_!!"
+
+
+def test_bad_filters_and_sorts_are_rejected(repository):
+    with pytest.raises(FilterError):
+        repository.get_page(columns=COLUMNS, filters={"Year": "recent"})
+    with pytest.raises(ValueError):
+        ViolationQuery(COLUMNS, ("Color", False))
+    with pytest.raises(ValueError):
+        ViolationQuery(COLUMNS, None, {"Not A Column": "x"})
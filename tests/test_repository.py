@@ -0,0 +1,124 @@
+import sqlite3
+import pytest
+from database import DatabaseConnection, TrafficViolationRepository
+from errors import ConcurrencyConflictError, DuplicateRecordError, RecordNotFoundError
+
+
+def test_update_fields_writes_only_the_changed_columns(repository, records):
+    record = records[0]
+    updated = repository.update_fields(record.id, {"Color": "RED"})
+    assert updated.color == "RED"
+    assert updated._replace(color=record.color) == record
+
+
+def test_each_update_bumps_the_row_version_once(repository, records):
+    record_id = records[0].id
+    _, version = repository.get_by_id_with_version(record_id)
+    repository.update_fields(record_id, {"Color": "RED"}, version)
+    assert repository.get_by_id_with_version(record_id)[1] == version + 1
+
+
+def test_update_fields_with_a_stale_version_raises_a_conflict(repository, records):
+    record_id = records[0].id
+    _, version = repository.get_by_id_with_version(record_id)
+    repository.update_fields(record_id, {"Color": "RED"}, version)
+    
+    with pytest.raises(ConcurrencyConflictError) as conflict:
+        repository.update_fields(record_id, {"Color": "BLUE"}, version)
+    assert conflict.value.current_row.color == "RED"
+    assert conflict.value.current_version == version + 1
+    assert repository.get_by_id(record_id).color == "RED"
+
+
+def test_update_fields_on_a_deleted_record_raises_not_found(repository, records):
+    repository.delete(records[0].id)
+    with pytest.raises(RecordNotFoundError):
+        repository.update_fields(records[0].id, {"Color": "RED"})
+
+
+def test_records_load_unversioned_without_the_row_version_column(config, repository, records):
+    connection = sqlite3.connect(config.db_sqlite_path)
+    # As before migration 003 (008's trigger reads the column too)
+    connection.execute("DROP TRIGGER trg_violations_row_version")
+    connection.execute("DROP TRIGGER trg_violations_change_update")
+    connection.execute("ALTER TABLE traffic_violations DROP COLUMN row_version")
+    connection.commit()
+    connection.close()
+    
+    row, version = repository.get_by_id_with_version(records[0].id)
+    assert row == records[0] and version is None
+    assert repository.update_fields(records[0].id, {"Color": "RED"}, version).color == "RED"
+
+
+def test_an_edit_is_logged_once_in_the_change_log(repository, records):
+    version = repository.get_change_version()
+    repository.update_fields(records[0].id, {"Color": "RED"})
+    repository.delete(records[1].id)
+    assert repository.get_change_version() == version + 2
+    
+    changes = repository.get_changes_since(version)
+    assert [row.id for row in changes.rows] == [records[0].id]
+    assert changes.deleted_ids == [records[1].id]
+    assert not changes.expired
+
+
+def test_pruning_keeps_recent_entries_and_expires_stations_left_behind(repository, records):
+    version = repository.get_change_version()
+    with DatabaseConnection() as db:
+        db.execute("UPDATE traffic_violation_changes SET changed_at = '2000-01-01 00:00:00'")
+    repository.update_fields(records[0].id, {"Color": "RED"})
+    
+    assert repository.prune_changes() == version
+    assert repository.get_change_version() == version + 1
+    assert not repository.get_changes_since(version).expired
+    assert repository.get_changes_since(1).expired
+
+
+def test_pruning_never_empties_the_change_log(repository, records):
+    version = repository.get_change_version()
+    with DatabaseConnection() as db:
+        db.execute("UPDATE traffic_violation_changes SET changed_at = '2000-01-01 00:00:00'")
+    repository.prune_changes()
+    assert repository.get_change_version() == version
+
+
+def test_search_and_search_export_return_the_same_capped_rows(config, repository, records):
+    config.search_result_limit = 5
+    term = "a"
+    shown = repository.search(term)
+    exported = [row for batch in repository.iter_rows(term, batch_size=2) for row in batch]
+    assert len(shown) == 5
+    assert exported == shown
+
+
+def test_sorted_search_export_reorders_the_rows_the_grid_shows(config, repository, records):
+    config.search_result_limit = 10
+    shown = repository.search("a")
+    exported = [row for batch in repository.iter_rows("a", sort=("Year", True)) for row in batch]
+    assert len(shown) == 10
+    assert sorted(exported) == sorted(shown)
+    assert [row.year for row in exported] == sorted((row.year for row in shown), reverse=True)
+
+
+def test_listing_export_streams_the_filtered_listing_in_order(repository, records):
+    filters, sort = {"Year": "<2010"}, ("Year", False)
+    exported = [row for batch in repository.iter_rows(batch_size=3, sort=sort, filters=filters)
+                for row in batch]
+    assert exported == repository.get_all(sort=sort, filters=filters)
+
+
+def test_exact_duplicates_are_rejected_when_hashing_is_on(config, make_values):
+    config.content_hash_enabled = True
+    repository = TrafficViolationRepository()
+    original = repository.create(make_values())
+    # Case and spacing don't make a record different
+    values = make_values({"Driver Name": make_values()[1].upper() + "  "})
+    with pytest.raises(DuplicateRecordError) as duplicate:
+        repository.create(values)
+    assert duplicate.value.existing_id == original.id
+
+
+def test_writes_leave_the_hash_alone_when_hashing_is_off(repository, make_values):
+    repository.create(make_values())
+    repository.create(make_values())
+    assert len(repository.get_all()) == 2
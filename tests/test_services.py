@@ -0,0 +1,61 @@
+import pytest
+from cache import ResultCache
+from config import AppConfig
+from errors import ValidationError
+from services import TrafficViolationService
+
+
+class Entry:
+    # Stands in for a Tk entry
+    
+    def __init__(self, value):
+        self.value = value
+    
+    def get(self):
+        return "" if self.value is None else str(self.value)
+
+
+def test_a_value_loaded_during_an_invalidation_is_not_cached():
+    cache = ResultCache(max_entries=8, ttl=60)
+    
+    def load_then_write():
+        # Another thread's write lands while this load is still running
+        cache.invalidate(("all",))
+        return ["stale"]
+    assert cache.get_or_load(("all",), load_then_write) == ["stale"]
+    assert cache.get_or_load(("all",), lambda: ["fresh"]) == ["fresh"]
+    assert cache.get_or_load(("all",), lambda: ["newer"]) == ["fresh"]
+
+
+def test_writes_invalidate_cached_listings(records):
+    service = TrafficViolationService()
+    before = service.get_all_violations()
+    service.update_violation_fields(records[0].id, {"Color": "RED"})
+    assert service.get_all_violations()[0].color == "RED"
+    assert before[0].color == records[0].color
+
+
+def test_an_edit_validates_only_the_fields_it_changes(repository, make_values):
+    labels = list(AppConfig().columns[1:])
+    # Stored before the State rule existed
+    record = repository.create(make_values({"State": "Maryland"}))
+    original = record[1:]
+    service = TrafficViolationService()
+    
+    entries = [Entry(value) for value in original]
+    entries[labels.index("Color")] = Entry("RED")
+    values = service.collect_record_values(entries, labels, original)
+    assert service.changed_fields(original, values, labels) == {"Color": "RED"}
+    
+    entries[labels.index("Year")] = Entry("1700")
+    with pytest.raises(ValidationError) as invalid:
+        service.collect_record_values(entries, labels, original)
+    assert invalid.value.fields == ["Year"]
+
+
+def test_a_new_record_validates_every_field(make_values):
+    labels = list(AppConfig().columns[1:])
+    entries = [Entry(value) for value in make_values({"State": "Maryland"})]
+    with pytest.raises(ValidationError) as invalid:
+        TrafficViolationService().collect_record_values(entries, labels)
+    assert invalid.value.fields == ["State"]
@@ -0,0 +1,99 @@
+import pytest
+from backends import Error
+from database import DatabaseConnection, PoolTimeoutError
+from errors import DataAccessError, RecordNotFoundError
+from journal import PendingWrite, WriteBehindQueue
+
+
+def create_write(key, values):
+    return PendingWrite(0, key, "create", None, {"values": list(values)})
+
+
+def test_apply_writes_skips_entries_already_applied(repository, make_values):
+    write = create_write("key-1", make_values())
+    first = repository.apply_writes([write])
+    assert list(first) == ["key-1"]
+    
+    # Replayed after a crash between the commit and clearing the journal
+    assert repository.apply_writes([write]) == {}
+    assert len(repository.get_all()) == 1
+
+
+def test_apply_writes_applies_a_batch_in_order(repository, records):
+    record_id = records[0].id
+    writes = [PendingWrite(0, "update", "update_fields", record_id, {"changes": {"Color": "RED"}}),
+              PendingWrite(0, "delete", "delete", record_id, {})]
+    results = repository.apply_writes(writes)
+    assert results["update"].color == "RED"
+    assert results["delete"] == record_id
+    assert repository.get_by_id(record_id) is None
+
+
+def test_forgotten_keys_are_dropped_from_applied_writes(repository, make_values):
+    repository.apply_writes([create_write("key-1", make_values())])
+    repository.apply_writes([create_write("key-2", make_values(seed=1))], forget_keys=["key-1"])
+    with DatabaseConnection() as db:
+        db.execute("SELECT idempotency_key FROM applied_writes")
+        assert [row[0] for row in db.fetchall()] == ["key-2"]
+
+
+@pytest.mark.parametrize("error, transient", [
+    (DataAccessError("x", Error("Can't connect", errno=2003)), True),
+    (DataAccessError("x", Error("Server has gone away", errno=2006)), True),
+    (DataAccessError("x", PoolTimeoutError("No connection available")), True),
+    (Error("Lock wait timeout exceeded", errno=1205), True),
+    (Error("Deadlock found", errno=1213), True),
+    (DataAccessError("x", Error("no such table: applied_writes", errno=1146)), False),
+    (DataAccessError("x", Error("disk I/O error")), False),
+    (DataAccessError("x", Error("Duplicate entry", errno=1062)), False),
+    (RecordNotFoundError(1), False),
+    (ValueError("Unknown queued operation"), False),
+])
+def test_only_connection_and_lock_errors_are_retried(config, error, transient):
+    assert WriteBehindQueue()._is_transient(error) is transient
+
+
+def test_flush_applies_queued_writes_in_order(config, records):
+    queue = WriteBehindQueue()
+    record_id = records[0].id
+    queue.enqueue("update_fields", record_id, changes={"Color": "RED"})
+    queue.enqueue("update_fields", record_id, changes={"Color": "BLUE"})
+    assert queue.flush() == 2
+    assert queue.repository.get_by_id(record_id).color == "BLUE"
+    assert queue.status()["pending"] == 0
+
+
+def test_a_write_that_cannot_pass_is_set_aside_and_the_rest_carry_on(config, records):
+    queue = WriteBehindQueue()
+    queue.enqueue("update_fields", 10 ** 6, changes={"Color": "RED"})
+    queue.enqueue("update_fields", records[0].id, changes={"Color": "RED"})
+    assert queue.flush() == 1
+    assert queue.status() == {"pending": 0, "failed": 1, "error": None}
+    assert queue.journal.failed()[0].record_id == 10 ** 6
+
+
+def test_a_missing_table_fails_the_writes_instead_of_blocking_the_queue(config, records):
+    queue = WriteBehindQueue()
+    with DatabaseConnection() as db:
+        db.execute("DROP TABLE applied_writes")
+    queue.enqueue("update_fields", records[0].id, changes={"Color": "RED"})
+    queue.enqueue("delete", records[1].id)
+    queue.flush()
+    assert queue.status()["pending"] == 0
+    assert queue.status()["failed"] == 2
+
+
+def test_a_transient_error_keeps_the_write_queued(config, records, monkeypatch):
+    queue = WriteBehindQueue()
+    queue.enqueue("update_fields", records[0].id, changes={"Color": "RED"})
+    
+    def unreachable(writes, forget_keys=()):
+        raise DataAccessError("Failed to apply queued changes", Error("Can't connect", errno=2003))
+    monkeypatch.setattr(queue.repository, "apply_writes", unreachable)
+    with pytest.raises(DataAccessError):
+        queue.flush()
+    assert queue.status()["pending"] == 1
+    
+    monkeypatch.undo()
+    assert queue.flush() == 1
+    assert queue.repository.get_by_id(records[0].id).color == "RED"
@@ -1,40 +1,138 @@
-import tkinter as tk
-from abc import ABC, abstractmethod
-from config import AppConfig
-
-
-class BaseWindow(ABC):
-    
-    def __init__(self):
-        self.config = AppConfig()
-        self.window = None
-    
-    @abstractmethod
-    def setup_ui(self):
-        pass
-    
-    def get_color(self, color_key):
-        return self.config.colors.get(color_key, 'white')
-    
-    def run(self):
-        if self.window:
-            self.window.mainloop()
-    
-    def close(self):
-        if self.window:
-            self.window.destroy()
-
-
-class BaseFrame(ABC):
-    
-    def __init__(self, parent):
-        self.parent = parent
-        self.config = AppConfig()
-        self.frame = None
-    
-    @abstractmethod
-    def create(self):
-        pass
-    
-    def get_color(self, color_key):
-        return self.config.colors.get(color_key, 'white')
+import queue
+import time
+import tkinter as tk
+from abc import ABC, abstractmethod
+from collections import deque
+from config import AppConfig
+from errors import describe
+
+
+class BaseWindow(ABC):
+    
+    def __init__(self):
+        self.config = AppConfig()
+        self.window = None
+    
+    @abstractmethod
+    def setup_ui(self):
+        pass
+    
+    def get_color(self, color_key):
+        return self.config.colors.get(color_key, 'white')
+    
+    def run(self):
+        if self.window:
+            self.window.mainloop()
+    
+    def close(self):
+        if self.window:
+            self.window.destroy()
+
+
+class BaseFrame(ABC):
+    
+    def __init__(self, parent):
+        self.parent = parent
+        self.config = AppConfig()
+        self.frame = None
+    
+    @abstractmethod
+    def create(self):
+        pass
+    
+    def get_color(self, color_key):
+        return self.config.colors.get(color_key, 'white')
+
+
+class NotificationBar(BaseFrame):
+    # Non-modal status bar for errors and confirmations. notify() may be called from any
+    # thread: messages are queued and the Tk thread picks them up with after(). While one
+    # is showing, newer ones replace it and are counted, so a burst of failures becomes a
+    # single line instead of a stack of dialogs; History lists everything recent.
+    LEVEL_COLORS = {"info": 'teal', "success": 'light_teal', "error": 'error'}
+    
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.label = None
+        self.history = deque(maxlen=self.config.notification_history)
+        self._queue = queue.Queue()
+        self._unseen = 0
+        self._hide_id = None
+        self._history_window = None
+    
+    def create(self):
+        self.frame = tk.Frame(self.parent, bg=self.get_color('dark'))
+        self.frame.pack(side="bottom", fill="x")
+        tk.Button(self.frame, text="History", font=("Arial", 9), relief="flat",
+                  command=self.show_history).pack(side="right", padx=5, pady=2)
+        self.label = tk.Label(self.frame, text="", anchor="w", justify="left",
+                              bg=self.get_color('dark'), fg=self.get_color('white'),
+                              font=("Arial", 10))
+        self.label.pack(side="left", fill="x", expand=True, padx=10, pady=2)
+        self.label.bind("<Button-1>", lambda event: self.clear())
+        self.frame.after(self.config.notification_poll_ms, self._poll)
+        return self.frame
+    
+    def notify(self, message, level="info", title=None):
+        self._queue.put((time.time(), level, title, message))
+    
+    def error(self, error, context=None):
+        title, message = describe(error, context)
+        self.notify(message, "error", title)
+    
+    def clear(self):
+        if self._hide_id is not None:
+            self.frame.after_cancel(self._hide_id)
+            self._hide_id = None
+        self._unseen = 0
+        self.label.config(text="", bg=self.get_color('dark'))
+    
+    def show_history(self):
+        if self._history_window is not None and self._history_window.winfo_exists():
+            self._history_window.lift()
+            return
+        window = tk.Toplevel(self.frame)
+        window.title("Messages")
+        window.geometry("700x300")
+        listbox = tk.Listbox(window, font=("Arial", 10))
+        scrollbar = tk.Scrollbar(window, orient="vertical", command=listbox.yview)
+        listbox.config(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        listbox.pack(fill="both", expand=True)
+        for entry in reversed(self.history):
+            listbox.insert("end", self._format(*entry, timestamp=True))
+        self._history_window = window
+    
+    def _poll(self):
+        if not self.frame.winfo_exists():
+            return
+        while True:
+            try:
+                entry = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self.history.append(entry)
+            self._show(entry)
+        self.frame.after(self.config.notification_poll_ms, self._poll)
+    
+    def _show(self, entry):
+        if self._hide_id is not None:
+            self.frame.after_cancel(self._hide_id)
+            self._unseen += 1
+        level = entry[1]
+        text = self._format(*entry)
+        if self._unseen:
+            text += f"   (+{self._unseen} more, see History)"
+        self.label.config(text=text, bg=self.get_color(self.LEVEL_COLORS.get(level, 'dark')))
+        delay = (self.config.notification_error_display_ms if level == "error"
+                 else self.config.notification_display_ms)
+        self._hide_id = self.frame.after(delay, self.clear)
+    
+    def _format(self, created, level, title, message, timestamp=False):
+        lines = message.replace(":\n", ": ").splitlines()
+        text = "; ".join(line.strip() for line in lines if line.strip())
+        if title:
+            text = f"{title}: {text}"
+        if timestamp:
+            text = f"{time.strftime('%H:%M:%S', time.localtime(created))}  {text}"
+        return text
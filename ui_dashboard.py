@@ -0,0 +1,123 @@
+import time
+import tkinter as tk
+from tkinter import ttk
+from config import AppConfig
+from analytics import AnalyticsService
+from errors import describe
+
+
+class DashboardWindow:
+    TASK_KEY = "dashboard"
+    NONE = "(none)"
+    METRIC_LABELS = {"Count": "count", "Total Penalty": "total_penalty",
+                     "Average Penalty": "average_penalty"}
+    
+    def __init__(self, parent):
+        self.parent = parent
+        self.config = AppConfig()
+        self.service = AnalyticsService()
+        self.task_runner = parent.task_runner
+        
+        self.group_var = tk.StringVar(value=self.config.analytics_dimensions[0])
+        self.then_var = tk.StringVar(value=self.NONE)
+        self.metric_var = tk.StringVar(value="Count")
+        self.crosstab_var = tk.BooleanVar(value=False)
+        self.filtered_var = tk.BooleanVar(value=bool(getattr(parent, "filters", None)))
+        self.tree = None
+        self.status_label = None
+        
+        self.window = tk.Toplevel(parent.window)
+        self.window.title("Violation Statistics")
+        self.window.geometry("900x600")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        
+        self.setup_ui()
+        self.run()
+    
+    def setup_ui(self):
+        colors = self.config.colors
+        controls = tk.Frame(self.window, bg=colors['white'], pady=10)
+        controls.pack(fill="x")
+        
+        dimensions = list(self.config.analytics_dimensions)
+        tk.Label(controls, text="Group by:", bg=colors['white']).pack(side="left", padx=(10, 2))
+        ttk.Combobox(controls, textvariable=self.group_var, values=dimensions, state="readonly",
+                     width=20).pack(side="left")
+        tk.Label(controls, text="then:", bg=colors['white']).pack(side="left", padx=(10, 2))
+        ttk.Combobox(controls, textvariable=self.then_var, values=[self.NONE] + dimensions,
+                     state="readonly", width=20).pack(side="left")
+        tk.Checkbutton(controls, text="Cross-tab", variable=self.crosstab_var,
+                       bg=colors['white']).pack(side="left", padx=(10, 2))
+        ttk.Combobox(controls, textvariable=self.metric_var, values=list(self.METRIC_LABELS),
+                     state="readonly", width=15).pack(side="left")
+        tk.Checkbutton(controls, text="Grid filters", variable=self.filtered_var,
+                       bg=colors['white']).pack(side="left", padx=10)
+        
+        tk.Button(controls, text="Run", bg=colors['light_teal'], fg=colors['white'],
+                  font=("Arial", 11), command=self.run).pack(side="left", padx=5)
+        tk.Button(controls, text="Refresh", bg=colors['dark'], fg=colors['white'],
+                  font=("Arial", 11), command=lambda: self.run(refresh=True)).pack(side="left", padx=5)
+        
+        self.status_label = tk.Label(self.window, text="", anchor="w", bg=colors['white'],
+                                     fg=colors['dark'], font=("Arial", 10, "italic"))
+        self.status_label.pack(fill="x", padx=10)
+        
+        frame_table = tk.Frame(self.window)
+        frame_table.pack(fill="both", expand=True, padx=10, pady=10)
+        x_scroll = tk.Scrollbar(frame_table, orient="horizontal")
+        x_scroll.pack(side="bottom", fill="x")
+        y_scroll = tk.Scrollbar(frame_table, orient="vertical")
+        y_scroll.pack(side="right", fill="y")
+        self.tree = ttk.Treeview(frame_table, show="headings", xscrollcommand=x_scroll.set,
+                                 yscrollcommand=y_scroll.set)
+        self.tree.pack(fill="both", expand=True)
+        x_scroll.config(command=self.tree.xview)
+        y_scroll.config(command=self.tree.yview)
+    
+    def run(self, refresh=False):
+        group_by = [self.group_var.get()]
+        if self.then_var.get() not in (self.NONE, group_by[0]):
+            group_by.append(self.then_var.get())
+        
+        if self.crosstab_var.get():
+            if len(group_by) < 2:
+                self._show_status("A cross-tab needs two different columns", error=True)
+                return
+            task = (self.service.crosstab, group_by[0], group_by[1],
+                    self.METRIC_LABELS[self.metric_var.get()])
+        else:
+            filters = dict(self.parent.filters) if self.filtered_var.get() else None
+            task = (self.service.summarize, group_by, filters)
+        
+        self._show_status("Loading...")
+        started = time.monotonic()
+        self.task_runner.submit(*task, refresh=refresh, key=self.TASK_KEY,
+                                on_success=lambda table: self._render(table, started),
+                                on_error=self._on_failed)
+    
+    def _render(self, table, started):
+        if not self.window.winfo_exists():
+            return
+        self.tree.delete(*self.tree.get_children())
+        self.tree.config(columns=table.headers)
+        for header in table.headers:
+            self.tree.heading(header, text=header)
+            self.tree.column(header, width=120, anchor="center")
+        for row in table.rows:
+            self.tree.insert("", "end", values=row)
+        elapsed = (time.monotonic() - started) * 1000
+        self._show_status(f"{len(table)} rows ({table.source}) in {elapsed:.0f} ms")
+    
+    def _on_failed(self, error):
+        if not self.window.winfo_exists():
+            return
+        title, message = describe(error, "Failed to load statistics")
+        self._show_status(" ".join(message.split()), error=True)
+    
+    def _show_status(self, text, error=False):
+        colors = self.config.colors
+        self.status_label.config(text=text, fg=colors['error'] if error else colors['dark'])
+    
+    def close(self):
+        self.task_runner.cancel(self.TASK_KEY)
+        self.window.destroy()
@@ -0,0 +1,133 @@
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from config import AppConfig
+from database import ConnectionPool, ReplicaRouter
+from instrumentation import QueryMetrics
+
+
+class DiagnosticsWindow:
+    REFRESH_MS = 2000
+    OPERATION_COLUMNS = (("Statement", 420), ("Count", 70), ("Avg ms", 80), ("p95 ms", 80),
+                         ("Max ms", 80), ("Total ms", 90))
+    SLOW_COLUMNS = (("Time", 140), ("Statement", 420), ("Rows", 70), ("Wait ms", 80),
+                    ("Total ms", 90), ("Error", 200))
+    
+    def __init__(self, parent):
+        self.parent = parent
+        self.config = AppConfig()
+        self.metrics = QueryMetrics()
+        self.operations_tree = None
+        self.slow_tree = None
+        self.summary_label = None
+        self._refresh_id = None
+        
+        self.window = tk.Toplevel(parent.window)
+        self.window.title("Diagnostics")
+        self.window.geometry("1000x650")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        
+        self.setup_ui()
+        self.refresh()
+    
+    def setup_ui(self):
+        colors = self.config.colors
+        controls = tk.Frame(self.window, bg=colors['white'], pady=10)
+        controls.pack(fill="x")
+        tk.Button(controls, text="Reset", bg=colors['dark'], fg=colors['white'],
+                  font=("Arial", 11), command=self.reset).pack(side="left", padx=10)
+        tk.Button(controls, text="Export Metrics", bg=colors['light_teal'], fg=colors['white'],
+                  font=("Arial", 11), command=self.export).pack(side="left", padx=5)
+        
+        self.summary_label = tk.Label(self.window, text="", anchor="w", justify="left",
+                                      bg=colors['white'], fg=colors['dark'], font=("Arial", 10))
+        self.summary_label.pack(fill="x", padx=10)
+        
+        if not self.config.query_metrics_enabled:
+            tk.Label(self.window, text="Query metrics are turned off (query_metrics_enabled)",
+                     bg=colors['white'], fg=colors['dark'],
+                     font=("Arial", 10, "italic")).pack(fill="x", padx=10)
+        
+        tk.Label(self.window, text="Statements by total time", anchor="w",
+                 font=("Arial", 11, "bold")).pack(fill="x", padx=10, pady=(10, 0))
+        self.operations_tree = self._create_tree(self.OPERATION_COLUMNS)
+        tk.Label(self.window, text=f"Slow queries (over {self.config.slow_query_ms} ms)", anchor="w",
+                 font=("Arial", 11, "bold")).pack(fill="x", padx=10, pady=(10, 0))
+        self.slow_tree = self._create_tree(self.SLOW_COLUMNS)
+    
+    def _create_tree(self, columns):
+        frame = tk.Frame(self.window)
+        frame.pack(fill="both", expand=True, padx=10, pady=5)
+        y_scroll = tk.Scrollbar(frame, orient="vertical")
+        y_scroll.pack(side="right", fill="y")
+        tree = ttk.Treeview(frame, columns=[name for name, _ in columns], show="headings",
+                            yscrollcommand=y_scroll.set, height=8)
+        tree.pack(fill="both", expand=True)
+        y_scroll.config(command=tree.yview)
+        for name, width in columns:
+            tree.heading(name, text=name)
+            tree.column(name, width=width, anchor="w" if name == "Statement" else "center")
+        return tree
+    
+    def refresh(self):
+        if not self.window.winfo_exists():
+            return
+        snapshot = self.metrics.snapshot()
+        pool = ConnectionPool().get_stats()
+        cache = self.parent.service.cache.get_stats()
+        acquire = snapshot["acquire"]
+        summary = (f"Since {snapshot['since']}  |  errors: {snapshot['errors']}  |  "
+                   f"pool: {pool['in_use']} in use, {pool['idle']} idle of {pool['size']}, "
+                   f"wait p95 {acquire['p95_ms']:.1f} ms  |  "
+                   f"cache: {cache['entries']} entries, hit rate {cache['hit_rate']:.0%}")
+        routing = ReplicaRouter().get_stats()
+        if routing["replicas"]:
+            summary += "\nreplicas: " + ", ".join(
+                f"{replica['name']} {'up' if replica['healthy'] else 'down'} ({replica['in_use']} in use)"
+                for replica in routing["replicas"])
+            summary += (f"  |  reads: {routing['replica_reads']} replica, {routing['primary_reads']} primary "
+                        f"({routing['sticky_reads']} after a write), {routing['failovers']} failovers")
+        self.summary_label.config(text=summary)
+        
+        self.operations_tree.delete(*self.operations_tree.get_children())
+        for operation in snapshot["operations"]:
+            self.operations_tree.insert("", "end", values=(
+                operation["statement"], operation["count"], f"{operation['avg_ms']:.1f}",
+                f"{operation['p95_ms']:.1f}", f"{operation['max_ms']:.1f}",
+                f"{operation['total_ms']:.0f}"))
+        
+        self.slow_tree.delete(*self.slow_tree.get_children())
+        for query in reversed(snapshot["slow_queries"]):
+            self.slow_tree.insert("", "end", values=(
+                query["started_at"], query["statement"], query["rows"],
+                f"{query['acquire_ms']:.1f}", f"{query['execute_ms'] + query['fetch_ms']:.1f}",
+                query["error"] or ""))
+        
+        self._refresh_id = self.window.after(self.REFRESH_MS, self.refresh)
+    
+    def reset(self):
+        self.metrics.reset()
+        self._cancel_refresh()
+        self.refresh()
+    
+    def export(self):
+        path = filedialog.asksaveasfilename(parent=self.window, defaultextension=".json",
+                                            filetypes=[("JSON files", "*.json")],
+                                            initialfile="query_metrics.json")
+        if not path:
+            return
+        try:
+            self.metrics.export(path, extra={"pool": ConnectionPool().get_stats(),
+                                             "replicas": ReplicaRouter().get_stats(),
+                                             "cache": self.parent.service.cache.get_stats()})
+            messagebox.showinfo("Export Complete", f"Metrics saved to {path}", parent=self.window)
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to export metrics:\n{e}", parent=self.window)
+    
+    def _cancel_refresh(self):
+        if self._refresh_id is not None:
+            self.window.after_cancel(self._refresh_id)
+            self._refresh_id = None
+    
+    def close(self):
+        self._cancel_refresh()
+        self.window.destroy()
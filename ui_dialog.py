@@ -1,79 +1,241 @@
-import tkinter as tk
-from tkinter import messagebox
-from config import AppConfig
-from services import TrafficViolationService
-
-
-class RecordDialog:
-    def __init__(self, parent, mode="add", record_values=None):
-        self.parent = parent
-        self.mode = mode
-        self.record_values = record_values
-        self.service = TrafficViolationService()
-        self.config = AppConfig()
-        
-        self.entries = []
-        self.labels = list(self.config.columns[1:])
-        
-        parent_window = getattr(parent, "window", parent)
-        
-        self.window = tk.Toplevel(parent_window)
-        self.window.title(f"{mode.capitalize()} Record")
-        self.window.geometry("500x600")
-        
-        self.setup_ui()
-    
-    def setup_ui(self):
-        container = tk.Frame(self.window)
-        canvas = tk.Canvas(container, width=480, height=550)
-        scrollbar = tk.Scrollbar(container, orient="vertical", command=canvas.yview)
-        scroll_frame = tk.Frame(canvas)
-        
-        scroll_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-        
-        canvas.create_window((0, 0), window=scroll_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        container.pack(fill="both", expand=True)
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        self._create_form_fields(scroll_frame)
-        self._create_save_button(scroll_frame)
-    
-    def _create_form_fields(self, parent):
-        for i, label in enumerate(self.labels):
-            tk.Label(parent, text=label).grid(row=i, column=0, padx=10, pady=5, sticky="w")
-            ent = tk.Entry(parent, width=40)
-            ent.grid(row=i, column=1, padx=10, pady=5)
-            
-            if self.mode == "edit" and self.record_values:
-                ent.insert(0, self.record_values[i+1])
-            
-            self.entries.append(ent)
-    
-    def _create_save_button(self, parent):
-        tk.Button(parent, text="Save", bg=self.config.colors['light_teal'], 
-                  fg=self.config.colors['white'], font=("Arial", 12, "bold"),
-                  command=self.handle_save).grid(row=len(self.labels), column=0, 
-                                                 columnspan=2, pady=15)
-    
-    def handle_save(self):
-        if self.mode == "add":
-            if self.service.create_violation(self.entries, self.labels):
-                self.window.destroy()
-    
-                try:
-                    self.parent.load_data()
-                except Exception:
-                    pass
-                messagebox.showinfo("Success", "Record added successfully!")
-        elif self.mode == "edit":
-            record_id = self.record_values[0]
-            if self.service.update_violation(record_id, self.entries, self.labels):
-                self.window.destroy()
-                try:
-                    self.parent.load_data()
-                except Exception:
-                    pass
-                messagebox.showinfo("Success", "Record updated successfully!")
+import tkinter as tk
+from tkinter import messagebox
+from config import AppConfig
+from services import TrafficViolationService
+from errors import ConcurrencyConflictError, RecordNotFoundError, ValidationError
+from ui_base import NotificationBar
+from journal import PendingWrite
+from models import make_row
+
+
+class RecordDialog:
+    def __init__(self, parent, mode="add", record_values=None):
+        self.parent = parent
+        self.mode = mode
+        self.record_values = record_values
+        self.record_version = None
+        self.service = TrafficViolationService()
+        self.config = AppConfig()
+        
+        self.entries = []
+        self._entry_background = None
+        self.save_button = None
+        self.notifications = None
+        self.labels = list(self.config.columns[1:])
+        
+        parent_window = getattr(parent, "window", parent)
+        
+        self.window = tk.Toplevel(parent_window)
+        self.window.title(f"{mode.capitalize()} Record")
+        self.window.geometry("500x600")
+        
+        self.setup_ui()
+        if self.mode == "edit" and self.record_values:
+            self._load_record(self.record_values[0])
+    
+    def setup_ui(self):
+        # Problems with the form are shown in the dialog's own bar, without a modal popup
+        self.notifications = NotificationBar(self.window)
+        self.notifications.create()
+        
+        container = tk.Frame(self.window)
+        canvas = tk.Canvas(container, width=480, height=550)
+        scrollbar = tk.Scrollbar(container, orient="vertical", command=canvas.yview)
+        scroll_frame = tk.Frame(canvas)
+        
+        scroll_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
+        
+        canvas.create_window((0, 0), window=scroll_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+        
+        container.pack(fill="both", expand=True)
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        self._create_form_fields(scroll_frame)
+        self._create_save_button(scroll_frame)
+    
+    def _create_form_fields(self, parent):
+        for i, label in enumerate(self.labels):
+            tk.Label(parent, text=label).grid(row=i, column=0, padx=10, pady=5, sticky="w")
+            ent = tk.Entry(parent, width=40)
+            self._entry_background = ent.cget("background")
+            ent.grid(row=i, column=1, padx=10, pady=5)
+            self.entries.append(ent)
+    
+    def _create_save_button(self, parent):
+        self.save_button = tk.Button(parent, text="Save", bg=self.config.colors['light_teal'], 
+                                     fg=self.config.colors['white'], font=("Arial", 12, "bold"),
+                                     command=self.handle_save)
+        self.save_button.grid(row=len(self.labels), column=0, columnspan=2, pady=15)
+    
+    def _load_record(self, record_id):
+        # The grid only holds its visible columns, so the full record is read on open
+        self.save_button.config(state="disabled", text="Loading...")
+        task_runner = getattr(self.parent, "task_runner", None)
+        if task_runner is None:
+            self._on_record_loaded(self.service.get_violation_for_edit(record_id))
+        else:
+            task_runner.submit(self.service.get_violation_for_edit, record_id,
+                               on_success=self._on_record_loaded, on_error=self._on_load_failed)
+    
+    def _on_record_loaded(self, loaded):
+        record, version = loaded
+        if not self.window.winfo_exists():
+            return
+        if record is None:
+            self._on_load_failed(RecordNotFoundError(self.record_values[0]))
+            return
+        self.record_values = record
+        self.record_version = version
+        for ent, value in zip(self.entries, record[1:]):
+            ent.delete(0, tk.END)
+            ent.insert(0, "" if value is None else value)
+        self._restore_save_button()
+    
+    def _on_load_failed(self, error):
+        if self.window.winfo_exists():
+            self.window.destroy()
+        self._report_to_parent(error=error, context="Failed to load record")
+    
+    def handle_save(self):
+        # Validation reads the Tk entries here; only the database write goes to the worker
+        try:
+            original = self.record_values[1:] if self.mode == "edit" else None
+            values = self.service.collect_record_values(self.entries, self.labels, original)
+        except ValidationError as e:
+            self._show_invalid(e)
+            return
+        self._mark_invalid(())
+        
+        provisional = None
+        if self.mode == "add":
+            task = (self.service.create_violation_record, values)
+            message = "Record added successfully!"
+        elif self.mode == "edit":
+            # Only the fields the user actually changed are sent
+            changes = self.service.changed_fields(self.record_values[1:], values, self.labels)
+            if not changes:
+                self.window.destroy()
+                self._report_to_parent("Nothing was changed.")
+                return
+            task = (self.service.update_violation_fields, self.record_values[0], changes,
+                    self.record_version)
+            message = "Record updated successfully!"
+            # What the grid shows if the write is queued (write-behind) rather than made
+            provisional = make_row((self.record_values[0],) + values)
+        else:
+            return
+        
+        self.save_button.config(state="disabled", text="Saving...")
+        task_runner = getattr(self.parent, "task_runner", None)
+        if task_runner is None:
+            try:
+                saved = task[0](*task[1:])
+            except Exception as e:
+                self._on_save_failed(e)
+                return
+            self._on_saved(saved, message, provisional)
+        else:
+            task_runner.submit(*task, on_success=lambda saved: self._on_saved(saved, message, provisional),
+                               on_error=self._on_save_failed)
+    
+    def _on_saved(self, saved, message, provisional=None):
+        if self.window.winfo_exists():
+            self.window.destroy()
+        if isinstance(saved, PendingWrite):
+            # Journaled: a new record appears once it is written; an edit shows right away
+            message = "Saved. It will be written to the database in the background."
+            saved = provisional
+            if saved is None:
+                self._report_to_parent(message, "success")
+                return
+        try:
+            if hasattr(self.parent, "on_record_saved"):
+                self.parent.on_record_saved(saved)
+            else:
+                self.parent.load_data()
+        except Exception:
+            pass
+        self._report_to_parent(message, "success")
+    
+    def _on_save_failed(self, error):
+        self._restore_save_button()
+        if isinstance(error, ConcurrencyConflictError):
+            reload = messagebox.askyesno(
+                "Edit Conflict",
+                "This record was changed by someone else after you opened it.\n\n"
+                "Reload the latest version? Your changes in this window will be lost.",
+                parent=self.window)
+            if reload:
+                self._on_record_loaded((error.current_row, error.current_version))
+            return
+        if self.window.winfo_exists():
+            self.notifications.error(error, "Failed to save record")
+        else:
+            self._report_to_parent(error=error, context="Failed to save record")
+    
+    def _show_invalid(self, error):
+        self._mark_invalid(error.fields)
+        self.notifications.error(error)
+    
+    def _mark_invalid(self, fields):
+        for label, ent in zip(self.labels, self.entries):
+            ent.config(bg=self.config.colors['invalid'] if label in fields
+                   else self._entry_background)
+    
+    def _restore_save_button(self):
+        if self.window.winfo_exists():
+            self.save_button.config(state="normal", text="Save")
+    
+    def _report_to_parent(self, message=None, level="info", error=None, context=None):
+        # Once the dialog is closed its messages go to the parent window's bar
+        notifications = getattr(self.parent, "notifications", None)
+        if notifications is None:
+            if error is not None:
+                messagebox.showerror("Error", f"{context}:\n{error}")
+            else:
+                messagebox.showinfo("Success", message)
+        elif error is not None:
+            notifications.error(error, context)
+        else:
+            notifications.notify(message, level)
+
+
+class BatchEditDialog(RecordDialog):
+    # Writes the same values to every selected record; blank fields are left as they are
+    
+    def __init__(self, parent, record_ids):
+        self.record_ids = record_ids
+        super().__init__(parent, mode="batch")
+        self.window.title(f"Edit {len(record_ids)} Records")
+    
+    def _create_save_button(self, parent):
+        super()._create_save_button(parent)
+        tk.Label(parent, text="Fields left blank keep each record's current value.",
+                 font=("Arial", 10, "italic")).grid(row=len(self.labels) + 1, column=0, columnspan=2)
+    
+    def handle_save(self):
+        filled = [(label, ent) for label, ent in zip(self.labels, self.entries) if ent.get().strip()]
+        if not filled:
+            self.notifications.notify("Fill in the fields to change.")
+            return
+        try:
+            self.service.validator.validate_record_fields([ent for _, ent in filled],
+                                                          [label for label, _ in filled])
+        except ValidationError as e:
+            self._show_invalid(e)
+            return
+        self._mark_invalid(())
+        changes = {label: ent.get().strip() for label, ent in filled}
+        
+        self.save_button.config(state="disabled", text="Saving...")
+        self.parent.task_runner.submit(self.service.update_violations, self.record_ids, changes,
+                                       on_success=self._on_batch_saved,
+                                       on_error=self._on_save_failed)
+    
+    def _on_batch_saved(self, result):
+        if self.window.winfo_exists():
+            self.window.destroy()
+        self.parent.on_records_saved(result.rows)
+        self._report_to_parent(result.summary("updated"), "info" if result.failed else "success")
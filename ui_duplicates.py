@@ -0,0 +1,122 @@
+import time
+import tkinter as tk
+from tkinter import ttk, messagebox
+from config import AppConfig
+from dedupe import DuplicateFinder
+from errors import describe
+
+
+class DuplicatesWindow:
+    TASK_KEY = "duplicates"
+    
+    def __init__(self, parent):
+        self.parent = parent
+        self.config = AppConfig()
+        self.service = parent.service
+        self.task_runner = parent.task_runner
+        self.columns = list(self.config.grid_columns)
+        self.groups = {}
+        self.tree = None
+        self.status_label = None
+        
+        self.window = tk.Toplevel(parent.window)
+        self.window.title("Duplicate Records")
+        self.window.geometry("1000x600")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        
+        self.setup_ui()
+        self.scan()
+    
+    def setup_ui(self):
+        colors = self.config.colors
+        controls = tk.Frame(self.window, bg=colors['white'], pady=10)
+        controls.pack(fill="x")
+        tk.Button(controls, text="Scan", bg=colors['light_teal'], fg=colors['white'],
+                  font=("Arial", 11), command=self.scan).pack(side="left", padx=10)
+        tk.Button(controls, text="Keep Selected, Delete Others", bg=colors['dark'], fg=colors['white'],
+                  font=("Arial", 11), command=self.merge_selected).pack(side="left", padx=5)
+        
+        self.status_label = tk.Label(self.window, text="", anchor="w", bg=colors['white'],
+                                     fg=colors['dark'], font=("Arial", 10, "italic"))
+        self.status_label.pack(fill="x", padx=10)
+        
+        frame_table = tk.Frame(self.window)
+        frame_table.pack(fill="both", expand=True, padx=10, pady=10)
+        x_scroll = tk.Scrollbar(frame_table, orient="horizontal")
+        x_scroll.pack(side="bottom", fill="x")
+        y_scroll = tk.Scrollbar(frame_table, orient="vertical")
+        y_scroll.pack(side="right", fill="y")
+        # Groups are parent items (score in the tree column), their records the children
+        self.tree = ttk.Treeview(frame_table, columns=self.columns, selectmode="browse",
+                                 xscrollcommand=x_scroll.set, yscrollcommand=y_scroll.set)
+        self.tree.pack(fill="both", expand=True)
+        x_scroll.config(command=self.tree.xview)
+        y_scroll.config(command=self.tree.yview)
+        self.tree.heading("#0", text="Similarity")
+        self.tree.column("#0", width=110)
+        for column in self.columns:
+            self.tree.heading(column, text=column)
+            self.tree.column(column, width=60 if column == "ID" else 120, anchor="center")
+    
+    def scan(self):
+        self._show_status("Scanning for duplicates...")
+        started = time.monotonic()
+        finder = DuplicateFinder(self.service.repository)
+        self.task_runner.submit(finder.find, key=self.TASK_KEY,
+                                on_success=lambda groups: self._render(groups, finder, started),
+                                on_error=lambda e: self._on_failed(e, "Failed to search for duplicates"))
+    
+    def _render(self, groups, finder, started):
+        if not self.window.winfo_exists():
+            return
+        self.tree.delete(*self.tree.get_children())
+        self.groups = {}
+        indexes = [self.config.columns.index(column) for column in self.columns]
+        for group in groups:
+            group_iid = self.tree.insert("", "end", text=f"{group.score:.0%}", open=True,
+                                         values=[f"{len(group.rows)} records"])
+            self.groups[group_iid] = group
+            for row in group.rows:
+                self.tree.insert(group_iid, "end", iid=str(row[0]),
+                                 values=["" if row[index] is None else row[index] for index in indexes])
+        elapsed = (time.monotonic() - started) * 1000
+        self._show_status(f"{len(groups)} groups of likely duplicates "
+                          f"({finder.compared} pairs compared) in {elapsed:.0f} ms")
+    
+    def merge_selected(self):
+        selection = self.tree.selection()
+        group_iid = self.tree.parent(selection[0]) if selection else ""
+        if not group_iid:
+            self._show_status("Select the record to keep within a group", error=True)
+            return
+        keep_id = int(selection[0])
+        others = [record_id for record_id in self.groups[group_iid].ids if record_id != keep_id]
+        if not messagebox.askyesno("Confirm", f"Keep record {keep_id} and delete "
+                                   f"{', '.join(str(record_id) for record_id in others)}?",
+                                   parent=self.window):
+            return
+        self.task_runner.submit(self.service.delete_violations, others,
+                                on_success=lambda result: self._on_merged(group_iid, result),
+                                on_error=lambda e: self._on_failed(e, "Failed to delete duplicates"))
+    
+    def _on_merged(self, group_iid, result):
+        deleted = result.succeeded + list(result.failed)
+        self.parent.table_frame.remove_records(deleted)
+        self.parent.notifications.notify(result.summary("deleted"), "success", "Duplicates Removed")
+        if self.window.winfo_exists() and self.tree.exists(group_iid):
+            self.tree.delete(group_iid)
+            self.groups.pop(group_iid, None)
+    
+    def _on_failed(self, error, context):
+        if not self.window.winfo_exists():
+            return
+        title, message = describe(error, context)
+        self._show_status(" ".join(message.split()), error=True)
+    
+    def _show_status(self, text, error=False):
+        colors = self.config.colors
+        self.status_label.config(text=text, fg=colors['error'] if error else colors['dark'])
+    
+    def close(self):
+        self.task_runner.cancel(self.TASK_KEY)
+        self.window.destroy()
@@ -1,225 +1,903 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
-from ui_base import BaseWindow, BaseFrame
-from services import TrafficViolationService
-from config import AppConfig
-
-
-class HeaderFrame(BaseFrame):
-    
-    def create(self):
-        header = tk.Frame(self.parent, bg=self.get_color('teal'), height=60)
-        header.pack(side="top", fill="x")
-        tk.Label(header, text="Traffic Violations Management", 
-                 bg=self.get_color('teal'), fg=self.get_color('white'),
-                 font=("Arial", 18, "bold")).pack(side="left", padx=20)
-        return header
-
-
-class SearchFrame(BaseFrame):
-    
-    def __init__(self, parent, on_search_callback, on_clear_callback):
-        super().__init__(parent)
-        self.on_search_callback = on_search_callback
-        self.on_clear_callback = on_clear_callback
-        self.search_entry = None
-    
-    def create(self):
-        search_frame = tk.Frame(self.parent, bg=self.get_color('white'), pady=10)
-        search_frame.pack(fill="x")
-        
-        tk.Label(search_frame, text="Search (Plate / Driver):", 
-                 bg=self.get_color('white'), fg=self.get_color('dark'), 
-                 font=("Arial", 12)).pack(side="left", padx=10)
-        
-        self.search_entry = tk.Entry(search_frame, bg=self.get_color('light_cyan'), 
-                                     fg=self.get_color('dark'), font=("Arial", 12))
-        self.search_entry.pack(side="left", padx=5, ipadx=30, ipady=3)
-        
-        tk.Button(search_frame, text="Search", bg=self.get_color('light_teal'), 
-                  fg=self.get_color('white'), font=("Arial", 11),
-                  command=self.on_search_callback).pack(side="left", padx=5)
-        tk.Button(search_frame, text="Clear", bg=self.get_color('dark'), 
-                  fg=self.get_color('white'), font=("Arial", 11),
-                  command=self.on_clear_callback).pack(side="left", padx=5)
-        
-        return search_frame
-    
-    def get_search_term(self):
-        return self.search_entry.get()
-    
-    def clear(self):
-        self.search_entry.delete(0, tk.END)
-
-
-class TableFrame(BaseFrame):
-    
-    def __init__(self, parent):
-        super().__init__(parent)
-        self.tree = None
-    
-    def create(self):
-        frame_table = tk.Frame(self.parent)
-        frame_table.pack(fill="both", expand=True, padx=10, pady=10)
-        
-        x_scroll = tk.Scrollbar(frame_table, orient="horizontal")
-        x_scroll.pack(side="bottom", fill="x")
-        y_scroll = tk.Scrollbar(frame_table, orient="vertical")
-        y_scroll.pack(side="right", fill="y")
-        
-        self.tree = ttk.Treeview(frame_table, columns=self.config.columns, show="headings",
-                                 xscrollcommand=x_scroll.set, yscrollcommand=y_scroll.set)
-        
-        for col in self.config.columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=150, anchor="center")
-        
-        self.tree.pack(fill="both", expand=True)
-        
-        x_scroll.config(command=self.tree.xview)
-        y_scroll.config(command=self.tree.yview)
-        
-        return frame_table
-    
-    def load_data(self, records):
-        self.clear_data()
-        for record in records:
-            self.tree.insert("", "end", values=record)
-    
-    def clear_data(self):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-    
-    def get_selected_record(self):
-        selected = self.tree.focus()
-        if not selected:
-            return None
-        return self.tree.item(selected, "values")
-
-
-class ActionButtonsFrame(BaseFrame):
-    
-    def __init__(self, parent, callbacks):
-        super().__init__(parent)
-        self.callbacks = callbacks
-    
-    def create(self):
-        btn_frame = tk.Frame(self.parent, bg=self.get_color('white'), pady=10)
-        btn_frame.pack(fill="x")
-        
-        buttons = [
-            ("Add", 'light_teal', self.callbacks['add']),
-            ("Edit", 'light_teal', self.callbacks['edit']),
-            ("Delete", 'light_teal', self.callbacks['delete']),
-            ("Refresh", 'light_teal', self.callbacks['refresh'])
-        ]
-        
-        for text, color, command in buttons:
-            tk.Button(btn_frame, text=text, bg=self.get_color(color), 
-                     fg=self.get_color('white'), font=("Arial", 12), width=10,
-                     command=command).pack(side="left", padx=10)
-        
-        tk.Button(btn_frame, text="Logout", bg=self.get_color('dark'), 
-                 fg=self.get_color('white'), font=("Arial", 12), width=10,
-                 command=self.callbacks['logout']).pack(side="right", padx=10)
-        
-        return btn_frame
-
-
-class ManagementPage(BaseWindow):
-    
-    def __init__(self):
-        super().__init__()
-        self.service = TrafficViolationService()
-        
-        self.header_frame = None
-        self.search_frame = None
-        self.table_frame = None
-        self.buttons_frame = None
-        
-        self.window = tk.Tk()
-        self.window.title("Traffic Violations Management")
-        self.window.state("zoomed")
-        
-        self.setup_ui()
-        self.load_data()
-    
-    def setup_ui(self):
-        self.header_frame = HeaderFrame(self.window)
-        self.header_frame.create()
-        
-        self.search_frame = SearchFrame(self.window, self.handle_search, self.handle_clear_search)
-        self.search_frame.create()
-        
-        self.table_frame = TableFrame(self.window)
-        self.table_frame.create()
-        
-        callbacks = {
-            'add': self.handle_add,
-            'edit': self.handle_edit,
-            'delete': self.handle_delete,
-            'refresh': self.load_data,
-            'logout': self.handle_logout
-        }
-        self.buttons_frame = ActionButtonsFrame(self.window, callbacks)
-        self.buttons_frame.create()
-    
-    def load_data(self):
-        try:
-            records = self.service.get_all_violations()
-            self.table_frame.load_data(records)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load data:\n{e}")
-    
-    def handle_search(self):
-        try:
-            search_term = self.search_frame.get_search_term()
-            records = self.service.search_violations(search_term)
-            self.table_frame.load_data(records)
-        except Exception as e:
-            messagebox.showerror("Error", f"Search failed:\n{e}")
-    
-    def handle_clear_search(self):
-        try:
-            self.search_frame.clear()
-            self.load_data()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to clear search:\n{e}")
-    
-    def handle_add(self):
-        try:
-            from ui_dialog import RecordDialog
-            RecordDialog(self, mode="add")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to open add window:\n{e}")
-    
-    def handle_edit(self):
-        try:
-            record = self.table_frame.get_selected_record()
-            if not record:
-                messagebox.showerror("Error", "Select a record to edit")
-                return
-            from ui_dialog import RecordDialog
-            RecordDialog(self, mode="edit", record_values=record)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to open edit window:\n{e}")
-    
-    def handle_delete(self):
-        try:
-            record = self.table_frame.get_selected_record()
-            if not record:
-                messagebox.showerror("Error", "Select a record to delete")
-                return
-            
-            confirm = messagebox.askyesno("Confirm", "Delete this record?")
-            if confirm:
-                if self.service.delete_violation(record[0]):
-                    self.load_data()
-                    messagebox.showinfo("Success", "Record deleted successfully!")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to delete record:\n{e}")
-    
-    def handle_logout(self):
-        self.close()
-        login_page = __import__("ui_login").ui_login.LoginPage()
-        login_page.run()
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from ui_base import BaseWindow, BaseFrame, NotificationBar
+from services import TrafficViolationService
+from database import ConnectionPool
+from startup import StartupProfiler
+from tasks import BackgroundTaskRunner
+from models import project
+from query_builder import ViolationQuery
+from errors import FilterError
+from journal import PendingWrite
+from config import AppConfig
+
+
+class HeaderFrame(BaseFrame):
+    
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.status_label = None
+        self.pending_label = None
+    
+    def create(self):
+        header = tk.Frame(self.parent, bg=self.get_color('teal'), height=60)
+        header.pack(side="top", fill="x")
+        tk.Label(header, text="Traffic Violations Management", 
+                 bg=self.get_color('teal'), fg=self.get_color('white'),
+                 font=("Arial", 18, "bold")).pack(side="left", padx=20)
+        self.status_label = tk.Label(header, text="", bg=self.get_color('teal'),
+                                     fg=self.get_color('light_cyan'), font=("Arial", 12, "italic"))
+        self.status_label.pack(side="right", padx=20)
+        self.pending_label = tk.Label(header, text="", bg=self.get_color('teal'),
+                                      fg=self.get_color('white'), font=("Arial", 12, "bold"))
+        self.pending_label.pack(side="right", padx=10)
+        return header
+    
+    def set_busy(self, busy):
+        self.status_label.config(text="Working..." if busy else "")
+    
+    def set_pending(self, status):
+        # Write-behind queue state: {"pending": n, "failed": n, "error": last error or None}
+        parts = []
+        if status["pending"]:
+            parts.append(f"{status['pending']} unsaved" + (" (offline)" if status["error"] else ""))
+        if status["failed"]:
+            parts.append(f"{status['failed']} failed")
+        self.pending_label.config(text=", ".join(parts),
+                                  fg=self.get_color('invalid' if status["failed"] else 'white'))
+
+
+class SearchFrame(BaseFrame):
+    # Keys that move around the entry or the suggestion list rather than edit the term
+    NAVIGATION_KEYS = ("Return", "KP_Enter", "Up", "Down", "Escape", "Tab", "Left", "Right",
+                       "Home", "End", "Shift_L", "Shift_R", "Control_L", "Control_R")
+    
+    def __init__(self, parent, on_search_callback, on_clear_callback, on_live_search_callback=None,
+                 suggest_callback=None):
+        super().__init__(parent)
+        self.on_search_callback = on_search_callback
+        self.on_clear_callback = on_clear_callback
+        self.on_live_search_callback = on_live_search_callback
+        self.suggest_callback = suggest_callback
+        self.search_entry = None
+        self.suggestion_list = None
+        self._debounce_id = None
+    
+    def create(self):
+        search_frame = tk.Frame(self.parent, bg=self.get_color('white'), pady=10)
+        search_frame.pack(fill="x")
+        
+        tk.Label(search_frame, text="Search (Plate / Driver):", 
+                 bg=self.get_color('white'), fg=self.get_color('dark'), 
+                 font=("Arial", 12)).pack(side="left", padx=10)
+        
+        self.search_entry = tk.Entry(search_frame, bg=self.get_color('light_cyan'), 
+                                     fg=self.get_color('dark'), font=("Arial", 12))
+        self.search_entry.pack(side="left", padx=5, ipadx=30, ipady=3)
+        self.search_entry.bind("<KeyRelease>", self._on_key_release)
+        self.search_entry.bind("<Return>", lambda e: self._submit())
+        self.search_entry.bind("<Down>", self._focus_suggestions)
+        self.search_entry.bind("<Escape>", lambda e: self.hide_suggestions())
+        
+        tk.Button(search_frame, text="Search", bg=self.get_color('light_teal'), 
+                  fg=self.get_color('white'), font=("Arial", 11),
+                  command=self._submit).pack(side="left", padx=5)
+        tk.Button(search_frame, text="Clear", bg=self.get_color('dark'), 
+                  fg=self.get_color('white'), font=("Arial", 11),
+                  command=self.on_clear_callback).pack(side="left", padx=5)
+        
+        # Dropdown of completions, placed over whatever is below the entry while shown
+        self.suggestion_list = tk.Listbox(self.parent, bg=self.get_color('white'),
+                                          fg=self.get_color('dark'), font=("Arial", 11),
+                                          height=self.config.suggestion_limit, activestyle="none")
+        self.suggestion_list.bind("<ButtonRelease-1>", lambda e: self._choose_suggestion())
+        self.suggestion_list.bind("<Return>", lambda e: self._choose_suggestion())
+        self.suggestion_list.bind("<Escape>", lambda e: self._close_suggestions())
+        
+        return search_frame
+    
+    def get_search_term(self):
+        return self.search_entry.get()
+    
+    def clear(self):
+        self._cancel_debounce()
+        self.hide_suggestions()
+        self.search_entry.delete(0, tk.END)
+    
+    def show_suggestions(self, suggestions):
+        if not suggestions:
+            self.hide_suggestions()
+            return
+        self.suggestion_list.delete(0, tk.END)
+        self.suggestion_list.insert(tk.END, *suggestions)
+        self.suggestion_list.config(height=len(suggestions))
+        self.suggestion_list.place(in_=self.search_entry, x=0, rely=1.0, relwidth=1.0)
+        self.suggestion_list.lift()
+    
+    def hide_suggestions(self):
+        self.suggestion_list.place_forget()
+    
+    def _on_key_release(self, event):
+        if event.keysym in self.NAVIGATION_KEYS:
+            return
+        term = self.search_entry.get()
+        if self.suggest_callback:
+            self.show_suggestions(self.suggest_callback(term))
+        if self.on_live_search_callback:
+            # Debounce: only the last keystroke in a burst starts a query
+            self._cancel_debounce()
+            self._debounce_id = self.search_entry.after(
+                self.config.search_debounce_ms, lambda: self._fire_live_search(term))
+    
+    def _fire_live_search(self, term):
+        self._debounce_id = None
+        self.on_live_search_callback(term.strip())
+    
+    def _cancel_debounce(self):
+        if self._debounce_id is not None:
+            self.search_entry.after_cancel(self._debounce_id)
+            self._debounce_id = None
+    
+    def _submit(self):
+        self._cancel_debounce()
+        self.hide_suggestions()
+        self.on_search_callback()
+    
+    def _focus_suggestions(self, event):
+        if self.suggestion_list.winfo_ismapped():
+            self.suggestion_list.focus_set()
+            self.suggestion_list.selection_set(0)
+            self.suggestion_list.activate(0)
+    
+    def _choose_suggestion(self):
+        selection = self.suggestion_list.curselection()
+        if not selection:
+            return
+        value = self.suggestion_list.get(selection[0])
+        self.search_entry.delete(0, tk.END)
+        self.search_entry.insert(0, value)
+        self.search_entry.focus_set()
+        self._submit()
+    
+    def _close_suggestions(self):
+        self.hide_suggestions()
+        self.search_entry.focus_set()
+
+
+class FilterFrame(BaseFrame):
+    
+    def __init__(self, parent, on_apply_callback, on_clear_callback):
+        super().__init__(parent)
+        self.on_apply_callback = on_apply_callback
+        self.on_clear_callback = on_clear_callback
+        self.entries = {}
+    
+    def create(self):
+        filter_frame = tk.Frame(self.parent, bg=self.get_color('white'))
+        filter_frame.pack(fill="x")
+        
+        tk.Label(filter_frame, text="Filter:", bg=self.get_color('white'), fg=self.get_color('dark'),
+                 font=("Arial", 12)).pack(side="left", padx=10)
+        
+        for label in self.config.filter_columns:
+            tk.Label(filter_frame, text=label, bg=self.get_color('white'), fg=self.get_color('dark'),
+                     font=("Arial", 10)).pack(side="left", padx=(10, 2))
+            entry = tk.Entry(filter_frame, bg=self.get_color('light_cyan'), fg=self.get_color('dark'),
+                             font=("Arial", 11), width=12)
+            entry.pack(side="left", ipady=2)
+            entry.bind("<Return>", lambda e: self.on_apply_callback())
+            self.entries[label] = entry
+        
+        tk.Button(filter_frame, text="Apply", bg=self.get_color('light_teal'),
+                  fg=self.get_color('white'), font=("Arial", 11),
+                  command=self.on_apply_callback).pack(side="left", padx=(15, 5))
+        tk.Button(filter_frame, text="Clear", bg=self.get_color('dark'),
+                  fg=self.get_color('white'), font=("Arial", 11),
+                  command=self.on_clear_callback).pack(side="left", padx=5)
+        
+        return filter_frame
+    
+    def get_filters(self):
+        return {label: entry.get().strip() for label, entry in self.entries.items()
+                if entry.get().strip()}
+    
+    def clear(self):
+        for entry in self.entries.values():
+            entry.delete(0, tk.END)
+
+
+class TableFrame(BaseFrame):
+    TASK_KEY = "table"
+    
+    def __init__(self, parent, on_sort_callback=None, on_error_callback=None):
+        super().__init__(parent)
+        self.on_sort_callback = on_sort_callback
+        self.on_error_callback = on_error_callback
+        self.tree = None
+        self.y_scroll = None
+        
+        # Tree items are keyed by record id; _rows mirrors their values for diffing
+        self._rows = {}
+        
+        # Virtual mode state: only a window of keyset pages is kept in the tree
+        self.page_loader = None
+        self.task_runner = None
+        # The first and last loaded rows are the keyset cursors for the next page either way
+        self._first_row = None
+        self._last_row = None
+        self._has_more_before = False
+        self._has_more_after = False
+        self._paging = False
+    
+    def create(self):
+        frame_table = tk.Frame(self.parent)
+        frame_table.pack(fill="both", expand=True, padx=10, pady=10)
+        
+        x_scroll = tk.Scrollbar(frame_table, orient="horizontal")
+        x_scroll.pack(side="bottom", fill="x")
+        self.y_scroll = tk.Scrollbar(frame_table, orient="vertical")
+        self.y_scroll.pack(side="right", fill="y")
+        
+        self.tree = ttk.Treeview(frame_table, columns=self.config.grid_columns, show="headings",
+                                 selectmode="extended", xscrollcommand=x_scroll.set,
+                                 yscrollcommand=self._on_yscroll)
+        
+        for col in self.config.grid_columns:
+            self.tree.heading(col, text=col)
+            if self.on_sort_callback:
+                self.tree.heading(col, command=lambda c=col: self.on_sort_callback(c))
+            self.tree.column(col, width=150, anchor="center")
+        
+        self.tree.pack(fill="both", expand=True)
+        
+        x_scroll.config(command=self.tree.xview)
+        self.y_scroll.config(command=self.tree.yview)
+        
+        return frame_table
+    
+    def load_data(self, records):
+        self.stop_paging()
+        self.apply_records(records)
+    
+    def load_virtual(self, page_loader, task_runner=None, reset=False):
+        # page_loader(after=row, before=row, start=row, limit=...) returns records in grid
+        # order, relative to an already loaded row (start includes that row itself).
+        # reset starts over from the first page, e.g. when the sort order changed.
+        refresh_window = (not reset and page_loader == self.page_loader
+                          and self._first_row is not None)
+        self.page_loader = page_loader
+        self.task_runner = task_runner
+        self._paging = True
+        if refresh_window:
+            # Re-read the rows currently loaded rather than jumping back to the first page
+            limit = max(len(self._rows), self.config.page_size)
+            self._request_page(lambda records: self._apply_window(records, limit),
+                               start=self._first_row, limit=limit)
+        else:
+            self._request_page(self._apply_first_page, limit=self.config.page_size)
+    
+    def apply_records(self, records):
+        # Diff against what is on screen: unchanged rows are left alone, so selection,
+        # focus and scroll position survive a refresh
+        top_iid = self._top_visible_item()
+        wanted = [str(record[0]) for record in records]
+        wanted_set = set(wanted)
+        self._delete_items([iid for iid in self._rows if iid not in wanted_set])
+        
+        for iid, record in zip(wanted, records):
+            record = tuple(record)
+            if iid not in self._rows:
+                self._insert_item("end", record)
+            elif self._rows[iid] != record:
+                self.tree.item(iid, values=record)
+                self._rows[iid] = record
+        
+        if list(self.tree.get_children()) != wanted:
+            self.tree.set_children("", *wanted)
+        if top_iid in self._rows:
+            self.tree.yview_moveto(self.tree.index(top_iid) / len(self._rows))
+    
+    def upsert_record(self, record, select=True):
+        if len(record) != len(self.config.grid_columns):
+            # Full rows (e.g. read back after a save) are narrowed to the grid's columns
+            record = project(record, self.config.grid_columns)
+        record = tuple(record)
+        iid = str(record[0])
+        if iid in self._rows:
+            self.tree.item(iid, values=record)
+            self._rows[iid] = record
+        elif self.page_loader is None or not self._has_more_after:
+            # A row beyond the loaded window shows up when the user pages to it
+            self._insert_item("end", record)
+            if self.page_loader is not None:
+                self._last_row = record
+            self.tree.see(iid)
+        if select and iid in self._rows:
+            self.tree.selection_set(iid)
+            self.tree.focus(iid)
+    
+    def remove_record(self, record_id):
+        self._delete_items([str(record_id)])
+    
+    def remove_records(self, record_ids):
+        self._delete_items([str(record_id) for record_id in record_ids])
+    
+    def apply_changes(self, records, deleted_ids, include_new=True):
+        self._delete_items([str(record_id) for record_id in deleted_ids])
+        for record in records:
+            if include_new or str(record[0]) in self._rows:
+                self.upsert_record(record, select=False)
+    
+    def set_sort_indicator(self, sort_label, descending):
+        for col in self.config.grid_columns:
+            arrow = (" \u25bc" if descending else " \u25b2") if col == sort_label else ""
+            self.tree.heading(col, text=col + arrow)
+    
+    def sort_loaded(self, sort_label, descending):
+        # Reorders the rows already shown (search results are a capped, fully loaded list)
+        index = self.config.grid_columns.index(sort_label)
+        ordered = sorted(self._rows, reverse=descending,
+                         key=lambda iid: (self._rows[iid][index] is not None, self._rows[iid][index]))
+        self.tree.set_children("", *ordered)
+    
+    def stop_paging(self):
+        self.page_loader = None
+        self._paging = False
+    
+    def clear_data(self):
+        self.tree.delete(*self.tree.get_children())
+        self._rows.clear()
+    
+    def _insert_item(self, index, record):
+        iid = str(record[0])
+        self.tree.insert("", index, iid=iid, values=record)
+        self._rows[iid] = record
+    
+    def _delete_items(self, iids):
+        iids = [iid for iid in iids if iid in self._rows]
+        if iids:
+            self.tree.delete(*iids)
+            for iid in iids:
+                del self._rows[iid]
+    
+    def _top_visible_item(self):
+        children = self.tree.get_children()
+        if not children:
+            return None
+        return children[min(int(self.tree.yview()[0] * len(children)), len(children) - 1)]
+    
+    def _request_page(self, apply, **kwargs):
+        loader = self.page_loader
+        
+        def on_success(records):
+            if self.page_loader is not loader:
+                return
+            try:
+                apply(records)
+            finally:
+                self._paging = False
+        
+        def on_error(error):
+            self._paging = False
+            if self.on_error_callback:
+                self.on_error_callback(error)
+            else:
+                messagebox.showerror("Error", f"Failed to load data:\n{error}")
+        
+        if self.task_runner is None:
+            try:
+                records = loader(**kwargs)
+            except Exception as e:
+                on_error(e)
+                return
+            on_success(records)
+        else:
+            self.task_runner.submit(loader, key=self.TASK_KEY, on_success=on_success,
+                                    on_error=on_error, **kwargs)
+    
+    def _on_yscroll(self, first, last):
+        self.y_scroll.set(first, last)
+        if self.page_loader is None or self._paging:
+            return
+        
+        count = len(self.tree.get_children())
+        if not count:
+            return
+        margin = self.config.virtual_prefetch_rows
+        if self._has_more_after and count - float(last) * count <= margin:
+            self._paging = True
+            self._request_page(self._apply_page_after, after=self._last_row,
+                               limit=self.config.page_size)
+        elif self._has_more_before and float(first) * count <= margin:
+            self._paging = True
+            self._request_page(self._apply_page_before, before=self._first_row,
+                               limit=self.config.page_size)
+    
+    def _apply_first_page(self, records):
+        self.apply_records(records)
+        self._first_row = tuple(records[0]) if records else None
+        self._last_row = tuple(records[-1]) if records else None
+        self._has_more_before = False
+        self._has_more_after = len(records) >= self.config.page_size
+    
+    def _apply_window(self, records, limit):
+        self.apply_records(records)
+        if records:
+            self._first_row = tuple(records[0])
+            self._last_row = tuple(records[-1])
+        self._has_more_after = len(records) >= limit
+    
+    def _apply_page_after(self, records):
+        self._has_more_after = len(records) >= self.config.page_size
+        if not records:
+            return
+        for record in records:
+            if str(record[0]) not in self._rows:
+                self._insert_item("end", tuple(record))
+        self._last_row = tuple(records[-1])
+        
+        children = self.tree.get_children()
+        overflow = len(children) - self.config.virtual_max_rows
+        if overflow > 0:
+            top = self.tree.yview()[0] * len(children)
+            self._first_row = self._rows[children[overflow]]
+            self._delete_items(children[:overflow])
+            self._has_more_before = True
+            self.tree.yview_moveto(max(top - overflow, 0) / (len(children) - overflow))
+    
+    def _apply_page_before(self, records):
+        self._has_more_before = len(records) >= self.config.page_size
+        records = [record for record in records if str(record[0]) not in self._rows]
+        if not records:
+            return
+        top = self.tree.yview()[0] * len(self.tree.get_children())
+        for index, record in enumerate(records):
+            self._insert_item(index, tuple(record))
+        self._first_row = tuple(records[0])
+        
+        children = self.tree.get_children()
+        overflow = len(children) - self.config.virtual_max_rows
+        if overflow > 0:
+            self._last_row = self._rows[children[-overflow - 1]]
+            self._delete_items(children[-overflow:])
+            self._has_more_after = True
+        self.tree.yview_moveto((top + len(records)) / len(self.tree.get_children()))
+    
+    def get_selected_record(self):
+        selected = self.tree.focus()
+        if not selected:
+            return None
+        return self.tree.item(selected, "values")
+    
+    def get_selected_ids(self):
+        return [int(iid) for iid in self.tree.selection()]
+
+
+class ActionButtonsFrame(BaseFrame):
+    
+    def __init__(self, parent, callbacks):
+        super().__init__(parent)
+        self.callbacks = callbacks
+    
+    def create(self):
+        btn_frame = tk.Frame(self.parent, bg=self.get_color('white'), pady=10)
+        btn_frame.pack(fill="x")
+        
+        buttons = [
+            ("Add", 'light_teal', self.callbacks['add']),
+            ("Edit", 'light_teal', self.callbacks['edit']),
+            ("Delete", 'light_teal', self.callbacks['delete']),
+            ("Refresh", 'light_teal', self.callbacks['refresh']),
+            ("Export", 'light_teal', self.callbacks['export']),
+            ("Statistics", 'light_teal', self.callbacks['statistics']),
+            ("Duplicates", 'light_teal', self.callbacks['duplicates']),
+            ("Diagnostics", 'light_teal', self.callbacks['diagnostics'])
+        ]
+        
+        for text, color, command in buttons:
+            tk.Button(btn_frame, text=text, bg=self.get_color(color), 
+                     fg=self.get_color('white'), font=("Arial", 12), width=10,
+                     command=command).pack(side="left", padx=10)
+        
+        tk.Button(btn_frame, text="Logout", bg=self.get_color('dark'), 
+                 fg=self.get_color('white'), font=("Arial", 12), width=10,
+                 command=self.callbacks['logout']).pack(side="right", padx=10)
+        
+        return btn_frame
+
+
+class ManagementPage(BaseWindow):
+    DEFAULT_SORT = ("ID", False)
+    
+    def __init__(self):
+        super().__init__()
+        self.service = TrafficViolationService()
+        
+        self.header_frame = None
+        self.notifications = None
+        self.search_frame = None
+        self.filter_frame = None
+        self.table_frame = None
+        self.buttons_frame = None
+        self.current_search = None
+        self.sort = self.DEFAULT_SORT
+        self.filters = {}
+        self.change_version = None
+        self._change_poll_id = None
+        self._write_behind_poll_id = None
+        
+        self.window = tk.Tk()
+        self.window.title("Traffic Violations Management")
+        self.window.state("zoomed")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self.task_runner = BackgroundTaskRunner(self.window, on_busy_change=self.set_busy)
+        
+        self.setup_ui()
+        # Autocomplete stays empty until this finishes; it is built once per process
+        self.task_runner.submit(self.service.build_suggestion_index)
+        if self.config.auto_refresh:
+            # Take the change-log baseline before the first load so no write falls between them
+            self.task_runner.submit(self.service.get_change_version,
+                                    on_success=self._start_change_polling,
+                                    on_error=lambda e: self.load_data())
+        else:
+            self.load_data()
+        if self.service.write_behind is not None:
+            self._poll_write_behind()
+        StartupProfiler().mark("management page built")
+        self.window.after_idle(lambda: StartupProfiler().finish("management page shown"))
+    
+    @classmethod
+    def prewarm(cls):
+        # Runs on a worker thread while the login window is up. Widgets can only be built on
+        # the Tk thread, so this warms what the page waits on when it opens instead: pool
+        # connections, the autocomplete index and the first page of the default listing,
+        # which is left in the shared result cache.
+        config = AppConfig()
+        profiler = StartupProfiler()
+        service = TrafficViolationService()
+        ConnectionPool().prewarm(config.worker_threads)
+        profiler.mark("database connected")
+        if config.cache_enabled:
+            if config.virtual_table:
+                cls.fetch_page(service, cls.DEFAULT_SORT, {}, limit=config.page_size)
+            else:
+                service.get_all_violations(config.grid_columns, cls.DEFAULT_SORT, {})
+            profiler.mark("first page loaded")
+        service.build_suggestion_index()
+        profiler.mark("autocomplete index built")
+    
+    def setup_ui(self):
+        self.header_frame = HeaderFrame(self.window)
+        self.header_frame.create()
+        
+        # Packed before the table so the bar keeps its line when the window shrinks
+        self.notifications = NotificationBar(self.window)
+        self.notifications.create()
+        
+        self.search_frame = SearchFrame(
+            self.window, self.handle_search, self.handle_clear_search,
+            on_live_search_callback=self.handle_live_search if self.config.live_search else None,
+            suggest_callback=self.service.suggest)
+        self.search_frame.create()
+        
+        self.filter_frame = FilterFrame(self.window, self.handle_filter, self.handle_clear_filter)
+        self.filter_frame.create()
+        
+        self.table_frame = TableFrame(self.window, on_sort_callback=self.handle_sort,
+                                      on_error_callback=self.report_load_error)
+        self.table_frame.create()
+        self.table_frame.set_sort_indicator(*self.sort)
+        
+        callbacks = {
+            'add': self.handle_add,
+            'edit': self.handle_edit,
+            'delete': self.handle_delete,
+            'refresh': self.load_data,
+            'export': self.handle_export,
+            'statistics': self.handle_statistics,
+            'duplicates': self.handle_duplicates,
+            'diagnostics': self.handle_diagnostics,
+            'logout': self.handle_logout
+        }
+        self.buttons_frame = ActionButtonsFrame(self.window, callbacks)
+        self.buttons_frame.create()
+    
+    def set_busy(self, busy):
+        self.header_frame.set_busy(busy)
+        self.window.config(cursor="watch" if busy else "")
+    
+    def load_data(self, reset=False):
+        try:
+            self.current_search = None
+            if self.config.virtual_table:
+                self.table_frame.load_virtual(self.load_page, self.task_runner, reset=reset)
+            else:
+                self.table_frame.stop_paging()
+                self.task_runner.submit(self.service.get_all_violations, self.config.grid_columns,
+                                        self.sort, self.filters, key=TableFrame.TASK_KEY,
+                                        on_success=self.table_frame.load_data,
+                                        on_error=self.report_load_error)
+        except Exception as e:
+            self.report_load_error(e)
+    
+    def report_load_error(self, error):
+        self.notifications.error(error, "Failed to load data")
+    
+    def load_page(self, after=None, before=None, start=None, limit=None):
+        return self.fetch_page(self.service, self.sort, self.filters, after=after, before=before,
+                               start=start, limit=limit)
+    
+    @staticmethod
+    def fetch_page(service, sort, filters, after=None, before=None, start=None, limit=None):
+        # Only the grid's columns are fetched; RecordDialog loads the full record itself
+        columns = AppConfig().grid_columns
+        query = ViolationQuery(columns, sort, filters)
+        return service.get_violations_page(
+            after=query.cursor_for(start if start is not None else after),
+            before=query.cursor_for(before), inclusive=start is not None, limit=limit,
+            columns=columns, sort=sort, filters=filters)
+    
+    def is_default_listing(self):
+        # Rows appended at the end belong there only in the unfiltered listing by id
+        return self.current_search is None and not self.filters and self.sort == self.DEFAULT_SORT
+    
+    def handle_sort(self, label):
+        sort_label, descending = self.sort
+        self.sort = (label, not descending if label == sort_label else False)
+        self.table_frame.set_sort_indicator(*self.sort)
+        if self.current_search is not None:
+            self.table_frame.sort_loaded(*self.sort)
+        else:
+            self.load_data(reset=True)
+    
+    def handle_filter(self):
+        filters = self.filter_frame.get_filters()
+        try:
+            ViolationQuery(self.config.grid_columns, self.sort, filters).filter_clauses()
+        except ValueError as e:
+            self.notifications.error(FilterError(str(e)))
+            return
+        self.filters = filters
+        self.search_frame.clear()
+        self.load_data(reset=True)
+    
+    def handle_clear_filter(self):
+        self.filter_frame.clear()
+        self.filters = {}
+        self.load_data(reset=True)
+    
+    def handle_search(self):
+        self.run_search(self.search_frame.get_search_term())
+    
+    def run_search(self, search_term):
+        try:
+            self.current_search = search_term
+            # Shares the table key, so a newer search or refresh drops this one's results
+            self.table_frame.stop_paging()
+            self.task_runner.submit(self.service.search_violations, search_term,
+                                    self.config.grid_columns, key=TableFrame.TASK_KEY,
+                                    on_success=self._on_search_loaded,
+                                    on_error=lambda e: self.notifications.error(e, "Search failed"))
+        except Exception as e:
+            self.notifications.error(e, "Search failed")
+    
+    def handle_live_search(self, search_term):
+        # Runs under the table task key like any search, so a newer keystroke's query
+        # supersedes one still queued or in flight
+        if search_term == (self.current_search or ""):
+            return
+        if not search_term:
+            self.load_data()
+        elif len(search_term) >= self.config.live_search_min_chars:
+            self.run_search(search_term)
+    
+    def _on_search_loaded(self, records):
+        # Results come ranked by relevance unless the user picked a column to sort by
+        self.table_frame.load_data(records)
+        if self.sort != self.DEFAULT_SORT:
+            self.table_frame.sort_loaded(*self.sort)
+    
+    def handle_clear_search(self):
+        try:
+            self.search_frame.clear()
+            self.load_data()
+        except Exception as e:
+            self.notifications.error(e, "Failed to clear search")
+    
+    def handle_add(self):
+        try:
+            from ui_dialog import RecordDialog
+            RecordDialog(self, mode="add")
+        except Exception as e:
+            self.notifications.error(e, "Failed to open add window")
+    
+    def handle_edit(self):
+        try:
+            record_ids = self.table_frame.get_selected_ids()
+            if len(record_ids) > 1:
+                from ui_dialog import BatchEditDialog
+                BatchEditDialog(self, record_ids)
+                return
+            record = self.table_frame.get_selected_record()
+            if not record:
+                self.notifications.notify("Select a record to edit")
+                return
+            from ui_dialog import RecordDialog
+            RecordDialog(self, mode="edit", record_values=record)
+        except Exception as e:
+            self.notifications.error(e, "Failed to open edit window")
+    
+    def handle_delete(self):
+        try:
+            record_ids = self.table_frame.get_selected_ids()
+            if len(record_ids) > 1:
+                self.delete_records(record_ids)
+                return
+            record = self.table_frame.get_selected_record()
+            if not record:
+                self.notifications.notify("Select a record to delete")
+                return
+            
+            confirm = messagebox.askyesno("Confirm", "Delete this record?")
+            if confirm:
+                record_id = record[0]
+                self.task_runner.submit(self.service.delete_violation, record_id,
+                                        on_success=lambda deleted: self._on_deleted(record_id, deleted),
+                                        on_error=lambda e: self.notifications.error(
+                                            e, "Failed to delete record"))
+        except Exception as e:
+            self.notifications.error(e, "Failed to delete record")
+    
+    def _on_deleted(self, record_id, deleted):
+        if isinstance(deleted, PendingWrite):
+            self.table_frame.remove_record(record_id)
+            self.notifications.notify("Record deleted. The change will be saved in the background.",
+                                      "success")
+        elif deleted:
+            self.table_frame.remove_record(record_id)
+            self.notifications.notify("Record deleted successfully!", "success")
+    
+    def delete_records(self, record_ids):
+        if not messagebox.askyesno("Confirm", f"Delete the {len(record_ids)} selected records?"):
+            return
+        # One transaction for the whole selection
+        self.task_runner.submit(self.service.delete_violations, record_ids,
+                                on_success=self._on_batch_deleted,
+                                on_error=lambda e: self.notifications.error(
+                                    e, "Failed to delete records, none were deleted"))
+    
+    def _on_batch_deleted(self, result):
+        self.table_frame.remove_records(result.succeeded + list(result.failed))
+        self.notifications.notify(result.summary("deleted"), "info" if result.failed else "success",
+                                  "Delete Complete")
+    
+    def on_records_saved(self, records):
+        if self.current_search is not None:
+            self.run_search(self.current_search)
+        elif self.is_default_listing():
+            self.table_frame.apply_changes(records, [], include_new=False)
+        else:
+            self.load_data()
+    
+    def on_record_saved(self, record):
+        # Patch the one row instead of reloading; a search is re-run and a sorted or filtered
+        # listing is refreshed since the row may have moved or stopped matching (the diff keeps
+        # the view in place)
+        if self.current_search is not None:
+            self.run_search(self.current_search)
+        elif self.is_default_listing():
+            self.table_frame.upsert_record(record)
+        else:
+            self.load_data()
+    
+    def _start_change_polling(self, version):
+        self.change_version = version
+        self.load_data()
+        self._schedule_change_poll()
+    
+    def _schedule_change_poll(self):
+        self._change_poll_id = self.window.after(self.config.change_poll_interval_ms,
+                                                 self._poll_changes)
+    
+    def _poll_changes(self):
+        self._change_poll_id = None
+        self.task_runner.submit(self.service.get_changes_since, self.change_version,
+                                self.config.grid_columns, key="changes", on_success=self._apply_changes,
+                                on_error=self._on_change_poll_failed)
+    
+    def _apply_changes(self, changes):
+        self.change_version = changes.version
+        if changes.expired:
+            # Missed more than the change log keeps, so the view is reloaded instead
+            if self.current_search is not None:
+                self.run_search(self.current_search)
+            else:
+                self.load_data()
+        elif changes:
+            # Rows new to a search or filtered view may not match it, so only patch what is shown
+            self.table_frame.apply_changes(changes.rows, changes.deleted_ids,
+                                           include_new=self.is_default_listing())
+        if changes.has_more:
+            self._poll_changes()
+        else:
+            self._schedule_change_poll()
+    
+    def _on_change_poll_failed(self, error):
+        # Transient failures just wait for the next tick; a missing change log
+        # (migration not applied) turns polling off
+        if getattr(error, "errno", None) != 1146:
+            self._schedule_change_poll()
+    
+    def _poll_write_behind(self):
+        # Shows the queue's pending count and patches the grid with what the flusher wrote;
+        # the queue itself runs on its own thread, so this only reads its state
+        queue = self.service.write_behind
+        self.header_frame.set_pending(queue.status())
+        rows, deleted_ids = [], []
+        for kind, write, result in queue.take_events():
+            if kind == "failed":
+                self.notifications.error(result, f"Could not save the queued {write.describe()}")
+            elif write.operation == "delete":
+                deleted_ids.append(result)
+            else:
+                rows.append(result)
+        if rows or deleted_ids:
+            self.table_frame.apply_changes(rows, deleted_ids, include_new=self.is_default_listing())
+        self._write_behind_poll_id = self.window.after(self.config.write_behind_poll_ms,
+                                                       self._poll_write_behind)
+    
+    def handle_export(self):
+        try:
+            path = filedialog.asksaveasfilename(
+                parent=self.window, title="Export Violations", defaultextension=".csv",
+                filetypes=[("CSV file", "*.csv"), ("Parquet file", "*.parquet")])
+            if not path:
+                return
+            # What the grid shows: the submitted search (not what is typed in the box), or the
+            # filtered listing, in the grid's order
+            sort = None if self.sort == self.DEFAULT_SORT else self.sort
+            from exporter import ViolationExporter
+            self.task_runner.submit(ViolationExporter().export, path, search_term=self.current_search,
+                                    sort=sort, filters=self.filters,
+                                    on_success=lambda report: self.notifications.notify(
+                                        report.summary(), "success", "Export Complete"),
+                                    on_error=lambda e: self.notifications.error(e, "Export failed"))
+        except Exception as e:
+            self.notifications.error(e, "Failed to export records")
+    
+    def handle_statistics(self):
+        try:
+            from ui_dashboard import DashboardWindow
+            DashboardWindow(self)
+        except Exception as e:
+            self.notifications.error(e, "Failed to open statistics")
+    
+    def handle_duplicates(self):
+        try:
+            from ui_duplicates import DuplicatesWindow
+            DuplicatesWindow(self)
+        except Exception as e:
+            self.notifications.error(e, "Failed to open duplicates")
+    
+    def handle_diagnostics(self):
+        try:
+            from ui_diagnostics import DiagnosticsWindow
+            DiagnosticsWindow(self)
+        except Exception as e:
+            self.notifications.error(e, "Failed to open diagnostics")
+    
+    def handle_logout(self):
+        self.close()
+        login_page = __import__("ui_login").ui_login.LoginPage()
+        login_page.run()
+    
+    def close(self):
+        if self._change_poll_id is not None:
+            self.window.after_cancel(self._change_poll_id)
+            self._change_poll_id = None
+        if self._write_behind_poll_id is not None:
+            self.window.after_cancel(self._write_behind_poll_id)
+            self._write_behind_poll_id = None
+        self.task_runner.shutdown()
+        super().close()
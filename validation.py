@@ -0,0 +1,126 @@
+import re
+from functools import lru_cache
+from config import AppConfig
+from models import FIELDS_BY_LABEL
+
+
+INTEGER = re.compile(r"[+-]?\d+")
+NUMBER = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+
+
+class FieldRule:
+    # Every check for one column, compiled once: required, type, then the domain rules
+    # from AppConfig.validation_rules. Works a column at a time so a batch pays the
+    # lookups and branches once per column instead of once per value.
+    __slots__ = ("label", "kind", "pattern", "choices", "choices_text", "min_value", "max_value")
+    
+    def __init__(self, label, kind=str, pattern=None, choices=None, min=None, max=None):
+        self.label = label
+        self.kind = kind
+        self.pattern = re.compile(pattern, re.IGNORECASE) if pattern else None
+        self.choices = frozenset(choice.casefold() for choice in choices) if choices else None
+        self.choices_text = ", ".join(choices) if choices else None
+        self.min_value = min
+        self.max_value = max
+    
+    def failures(self, values):
+        # values: stripped strings. Yields (index, message) for each bad one.
+        label = self.label
+        if self.kind is int:
+            parsed = self._parse(values, INTEGER, int, f"{label} must be a valid integer number")
+        elif self.kind is float:
+            parsed = self._parse(values, NUMBER, float, f"{label} must be a valid number")
+        else:
+            parsed = None
+        
+        for index, value in enumerate(values):
+            if not value:
+                yield index, f"{label} is empty"
+            elif parsed is not None and isinstance(parsed[index], str):
+                yield index, parsed[index]
+            else:
+                message = self._check_domain(value, parsed[index] if parsed is not None else None)
+                if message:
+                    yield index, message
+    
+    def _parse(self, values, pattern, kind, message):
+        # The regex screens out what int()/float() would reject (and "nan", "inf", "1_0"),
+        # so no exception is raised per bad value
+        match = pattern.fullmatch
+        return [kind(value) if value and match(value) else message for value in values]
+    
+    def _check_domain(self, value, number):
+        if self.pattern is not None and not self.pattern.fullmatch(value):
+            return f"{self.label} has an invalid format"
+        if self.choices is not None and value.casefold() not in self.choices:
+            return f"{self.label} must be one of: {self.choices_text}"
+        if number is not None:
+            if self.min_value is not None and number < self.min_value:
+                return self._range_message()
+            if self.max_value is not None and number > self.max_value:
+                return self._range_message()
+        return None
+    
+    def _range_message(self):
+        if self.max_value is None:
+            return f"{self.label} must be at least {self.min_value}"
+        if self.min_value is None:
+            return f"{self.label} must be at most {self.max_value}"
+        return f"{self.label} must be between {self.min_value} and {self.max_value}"
+
+
+class RecordSchema:
+    # Validates records given as tuples in `labels` order or as {label: value} dicts,
+    # one at a time or as a whole batch, and reports every problem per record
+    
+    def __init__(self, labels):
+        config = AppConfig()
+        self.labels = tuple(labels)
+        self.rules = []
+        for label in self.labels:
+            if label not in FIELDS_BY_LABEL:
+                raise ValueError(f"Unknown column: {label}")
+            self.rules.append(FieldRule(label, FIELDS_BY_LABEL[label].kind,
+                                        **config.validation_rules.get(label, {})))
+    
+    def validate(self, record):
+        return [message for _, message in self.problems(record)]
+    
+    def problems(self, record):
+        # [(label, message)] for one record, so a form can point at the bad fields
+        return self._check([record])[0]
+    
+    def validate_batch(self, records):
+        # One list of messages per record, empty when the record is valid
+        return [[message for _, message in problems] for problems in self._check(records)]
+    
+    def _check(self, records):
+        rows = [self._as_tuple(record) for record in records]
+        problems = [[] for _ in rows]
+        width = len(self.labels)
+        wrong_width = [(index, len(row)) for index, row in enumerate(rows) if len(row) != width]
+        for index, _ in wrong_width:
+            rows[index] = (rows[index] + ("",) * width)[:width]
+        
+        # Column-wise: each rule runs over all the batch's values for its column
+        for rule, column in zip(self.rules, zip(*rows)):
+            values = ["" if value is None else str(value).strip() for value in column]
+            for index, message in rule.failures(values):
+                problems[index].append((rule.label, message))
+        for index, count in wrong_width:
+            # Columns the record didn't have are covered by the count message
+            present = set(self.labels[:count])
+            problems[index] = [problem for problem in problems[index] if problem[0] in present]
+            problems[index].append((None, f"Expected {width} fields, got {count}"))
+        return problems
+    
+    def _as_tuple(self, record):
+        if isinstance(record, dict):
+            return tuple(record.get(label) for label in self.labels)
+        return tuple(record)
+
+
+@lru_cache(maxsize=64)
+def record_schema(labels=None):
+    # Built once per label list; defaults to every editable column (AppConfig.columns[1:])
+    return RecordSchema(labels if labels is not None else AppConfig().columns[1:])